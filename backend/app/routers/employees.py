@@ -1,5 +1,5 @@
 from fastapi import APIRouter, HTTPException, Query, Depends
-from backend.app.services.prediction_service import load_data
+from backend.app.services.prediction_service import load_data, resolve_data_path, get_employee_row
 from backend.app.auth.dependencies import UserInfo, get_mode_user
 import numpy as np
 
@@ -43,14 +43,13 @@ def get_employee_detail(
     employee_id: str,
     current_user: UserInfo = Depends(get_mode_user)
 ):
-    df = load_data()
-    if df is None:
+    if resolve_data_path() is None:
         raise HTTPException(status_code=404, detail="Data not available")
     
-    row = df[df['id'] == employee_id]
-    if row.empty:
+    row = get_employee_row(employee_id)
+    if row is None:
         raise HTTPException(status_code=404, detail="Employee not found")
     
     # Replace NaNs with None/null for JSON
-    record = row.iloc[0].replace({np.nan: None}).to_dict()
+    record = row.replace({np.nan: None}).to_dict()
     return record
@@ -1,11 +1,15 @@
-from fastapi import APIRouter, HTTPException, Depends
-import threading
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+import io
+from pydantic import BaseModel, Field
+from typing import Literal
 from backend.app.services.prediction_service import (
-    load_data, enrich_features, predict_individual, 
-    predict_aggregate, get_dashboard_metrics
+    load_data, resolve_data_path, get_employee_features, get_individual_scores,
+    get_cohort_frame, predict_cohort, get_dashboard_metrics
 )
-from backend.ml import one_year_model, five_year_model, data_generator
+from backend.app.services.dataset_cache import dataset_cache
+from backend.app.services.population_scores import population_scores
+from backend.app.services.cohort_cube import cohort_cube
+from backend.ml import one_year_model, five_year_model
 import pandas as pd
 import numpy as np
 from backend.app.auth.dependencies import UserInfo, get_mode_user
@@ -17,6 +21,10 @@ class TrainResponse(BaseModel):
     message: str
     status: str
 
+class TrainRequest(BaseModel):
+    search: Literal["random", "halving"] = "random"  # Hyperparameter search mode
+    bayesian: Literal["nuts", "svi"] | None = None  # Also train the Bayesian model
+
 class IndividualInput(BaseModel):
     employee_id: str
 
@@ -27,11 +35,30 @@ class IndividualPrediction(BaseModel):
     grouped_contributions: list = []
     risk_level: str
 
+class BatchIndividualInput(BaseModel):
+    employee_ids: list[str] | Literal["all"] = "all"
+    top_k: int = Field(default=10, ge=0)
+
+class BatchIndividualPrediction(BaseModel):
+    employee_id: str
+    turnover_probability: float
+    contributions: list = []
+    grouped_contributions: list = []
+    risk_level: str
+
+class BatchIndividualResponse(BaseModel):
+    predictions: list[BatchIndividualPrediction]
+    not_found: list[str] = []
+
 class AggregateFilters(BaseModel):
     education_level: str | None = None
     gender: str | None = None
     age_group: str | None = None # lt_25, 25_to_35...
     tenure_group: str | None = None # lt_1yr, 1_to_3yr...
+    # Multi-value filters (any of)
+    sector: list[str] | None = None
+    headquarters: list[str] | None = None
+    cargo: list[str] | None = None
 
 class AggregatePrediction(BaseModel):
     predicted_turnover_count: float
@@ -43,12 +70,17 @@ class AggregatePrediction(BaseModel):
 
 
 from backend.app.services.training_manager import training_manager
+from backend.app.services.training_runner import TrainingRunner
+from backend.app.services import training_jobs
+
+training_runner = TrainingRunner(training_manager)
 
 class TrainStatusResponse(BaseModel):
     is_training: bool
     progress: int
     message: str
     status: str
+    stages: dict = {}
 
 class MetricsResponse(BaseModel):
     one_year: dict | None
@@ -66,22 +98,17 @@ def get_model_metrics():
     
     # Load One Year Metrics
     try:
-        if one_year_model.load_one_year_model():
-             artifact = one_year_model.load_one_year_model()
-             if artifact and 'metrics' in artifact:
-                 metrics['one_year'] = artifact['metrics']
+        artifact = one_year_model.load_one_year_model()
+        if artifact and 'metrics' in artifact:
+            metrics['one_year'] = artifact['metrics']
     except Exception as e:
         print(f"Error loading one year metrics: {e}")
 
     # Load Five Year Metrics
     try:
-        # Load directly as there isn't a helper like load_one_year_model exposed easily or consistent
-        import os
-        import joblib
-        if os.path.exists(five_year_model.MODEL_PATH):
-             artifact = joblib.load(five_year_model.MODEL_PATH)
-             if artifact and 'metrics' in artifact:
-                 metrics['five_year'] = artifact['metrics']
+        artifact = five_year_model.load_five_year_model()
+        if artifact and 'metrics' in artifact:
+            metrics['five_year'] = artifact['metrics']
     except Exception as e:
         print(f"Error loading five year metrics: {e}")
         
@@ -93,181 +120,109 @@ def get_training_status():
         "is_training": training_manager.is_training,
         "progress": training_manager.progress,
         "message": training_manager.message,
-        "status": training_manager.status
+        "status": training_manager.status,
+        "stages": training_manager.stages
     }
 
 @router.post("/train", response_model=TrainResponse)
-def trigger_training(current_user: UserInfo = Depends(get_mode_user)):
+def trigger_training(request: TrainRequest = TrainRequest(), current_user: UserInfo = Depends(get_mode_user)):
     """
-    Triggers the training process for both models.
+    Triggers the training process for both models (and the Bayesian model
+    if requested). The models are trained concurrently in a separate
+    training process and published together when all of them are done.
     """
-    if training_manager.is_training:
+    if training_manager.is_training or training_runner.running:
          raise HTTPException(status_code=400, detail="Training already in progress.")
+    if request.bayesian and bayesian_training_manager.is_training:
+         raise HTTPException(status_code=400, detail="Bayesian training already in progress.")
 
-    def train_job():
-        try:
-            training_manager.start_training()
-            
-            training_manager.update_progress(5, "Generating synthetic data...")
-            # data_generator.generate_synthetic_data writes to CSV.
-            # We need to make sure it writes to the correct place or update it.
-            # Assuming it writes to CWD which is root.
-            df = data_generator.generate_synthetic_data(n_employees=1500)
-            df.to_csv("synthetic_turnover_data.csv", index=False)
-            
-            # Train models
-            training_manager.update_progress(20, "Training one year model...")
-            
-            def one_year_callback(p, msg):
-                # Scale 20-60%
-                scaled = 20 + int(p * 0.4)
-                training_manager.update_progress(scaled, f"One Year: {msg}")
-                
-            one_year_model.train_one_year_model(save_model=True, progress_callback=one_year_callback)
-            
-            training_manager.update_progress(60, "Training five year model...")
-            
-            def five_year_callback(p, msg):
-                # Scale 60-100%
-                scaled = 60 + int(p * 0.4)
-                training_manager.update_progress(scaled, f"Five Year: {msg}")
+    stages = training_jobs.model_stages(request.search, request.bayesian)
 
-            five_year_model.train_five_year_model(save_model=True, progress_callback=five_year_callback)
-            
-            training_manager.complete_training()
-        except Exception as e:
-            training_manager.fail_training(str(e))
+    def refresh_serving_caches():
+        # New data and models: reload the score table and cube the job persisted
+        dataset_cache.invalidate()
+        population_scores.get(resolve_data_path())
+        cohort_cube.get(resolve_data_path())
 
-    # Run in a separate thread
-    threading.Thread(target=train_job).start()
+    training_manager.start_training(stages)
+    training_runner.start(training_jobs.train_models, {"stages": stages}, on_success=refresh_serving_caches)
     return {"message": "Training started in background.", "status": "success"}
 
+@router.post("/train/cancel", response_model=TrainResponse)
+def cancel_training(current_user: UserInfo = Depends(get_mode_user)):
+    """Stops the running training job; nothing it trained is published."""
+    if not training_runner.cancel():
+        raise HTTPException(status_code=400, detail="No training in progress.")
+    return {"message": "Training cancelled.", "status": "success"}
+
 @router.post("/predict/individual", response_model=IndividualPrediction)
 def predict_individual_endpoint(input_data: IndividualInput, current_user: UserInfo = Depends(get_mode_user)):
     try:
-        df = load_data()
-        if df is None:
+        if resolve_data_path() is None:
             raise HTTPException(status_code=400, detail="Data not available")
             
-        # Find employee
-        employee_row = df[df['id'] == input_data.employee_id]
-        if employee_row.empty:
+        # Read the precomputed score of the employee
+        scores, not_found = get_individual_scores([input_data.employee_id], top_k=10)
+        if scores is None:
+            raise HTTPException(status_code=400, detail="Data not available")
+        if not_found:
             raise HTTPException(status_code=404, detail="Employee not found")
-
-        data_dict = employee_row.iloc[0].to_dict()
-        data_dict = enrich_features(data_dict)
-        data_dict = {k: (v if pd.notna(v) else 0) for k, v in data_dict.items()} # sanitize
-        
-        result = predict_individual(data_dict)
         
-        # Transform SHAP dict to list
-        shap_list = [{"feature": k, "value": v, "base_value": 0.0} for k, v in result['shap_values'].items()]
-        shap_list.sort(key=lambda x: abs(x['value']), reverse=True)
+        result = scores[0]
         
         return {
             "turnover_probability": result['turnover_probability'],
-            "shap_values": shap_list[:10], # Top 10 legacy
-            "contributions": shap_list[:10], # New standard
-            "grouped_contributions": result.get('grouped_shap', []),
-            "risk_level": "High" if result['turnover_probability'] > 0.5 else "Low"
+            "shap_values": result['contributions'], # Top 10 legacy
+            "contributions": result['contributions'], # New standard
+            "grouped_contributions": result['grouped_contributions'],
+            "risk_level": result['risk_level']
         }
 
+    except HTTPException:
+        raise
     except FileNotFoundError:
         raise HTTPException(status_code=400, detail="Model not trained. Please call /train first.")
     except Exception as e:
         print(f"Prediction Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/predict/individual/batch", response_model=BatchIndividualResponse)
+def predict_individual_batch_endpoint(input_data: BatchIndividualInput, current_user: UserInfo = Depends(get_mode_user)):
+    """
+    Returns probability and top-k contributions for a list of employees
+    (or "all"), read from the precomputed population score table.
+    """
+    try:
+        employee_ids = None if input_data.employee_ids == "all" else input_data.employee_ids
+        predictions, not_found = get_individual_scores(employee_ids, top_k=input_data.top_k)
+        if predictions is None:
+            raise HTTPException(status_code=400, detail="Data not available")
+        
+        return {
+            "predictions": predictions,
+            "not_found": not_found
+        }
+
+    except HTTPException:
+        raise
+    except FileNotFoundError:
+        raise HTTPException(status_code=400, detail="Model not trained. Please call /train first.")
+    except Exception as e:
+        print(f"Batch Prediction Error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/predict/aggregate", response_model=AggregatePrediction)
 def predict_aggregate_endpoint(filters: AggregateFilters, current_user: UserInfo = Depends(get_mode_user)):
     try:
-        df = load_data()
-        if df is None:
+        # Cube lookup for the standard filters, on-demand otherwise
+        result = predict_cohort(filters.model_dump())
+        if result is None:
              raise HTTPException(status_code=400, detail="Data not available")
-             
-        # Apply Filters
-        filtered_df = df.copy()
-        
-        if filters.education_level and filters.education_level != "All":
-            filtered_df = filtered_df[filtered_df['a6_education_level'] == filters.education_level]
-        if filters.gender and filters.gender != "All":
-            filtered_df = filtered_df[filtered_df['a1_gender'] == filters.gender]
-            
-        # Helper for Age Group
-        if filters.age_group:
-            if filters.age_group == 'lt_25':
-                filtered_df = filtered_df[filtered_df['a2_age'] < 25]
-            elif filters.age_group == '25_to_35':
-                 filtered_df = filtered_df[(filtered_df['a2_age'] >= 25) & (filtered_df['a2_age'] < 35)]
-            elif filters.age_group == '35_to_45':
-                 filtered_df = filtered_df[(filtered_df['a2_age'] >= 35) & (filtered_df['a2_age'] < 45)]
-            elif filters.age_group == '45_to_55':
-                 filtered_df = filtered_df[(filtered_df['a2_age'] >= 45) & (filtered_df['a2_age'] < 55)]
-            elif filters.age_group == 'plus_55':
-                 filtered_df = filtered_df[filtered_df['a2_age'] >= 55]
-
-        # Helper for Tenure Group
-        if filters.tenure_group:
-             if filters.tenure_group == 'lt_1yr':
-                 filtered_df = filtered_df[filtered_df['B10_Tenure_in_month'] < 12]
-             elif filters.tenure_group == '1_to_3yr':
-                 filtered_df = filtered_df[(filtered_df['B10_Tenure_in_month'] >= 12) & (filtered_df['B10_Tenure_in_month'] < 36)]
-             elif filters.tenure_group == '3_to_5yr':
-                 filtered_df = filtered_df[(filtered_df['B10_Tenure_in_month'] >= 36) & (filtered_df['B10_Tenure_in_month'] < 60)]
-             elif filters.tenure_group == '5_to_10yr':
-                 filtered_df = filtered_df[(filtered_df['B10_Tenure_in_month'] >= 60) & (filtered_df['B10_Tenure_in_month'] < 120)]
-             elif filters.tenure_group == 'plus_10yr':
-                 filtered_df = filtered_df[filtered_df['B10_Tenure_in_month'] >= 120]
-
-        if filtered_df.empty:
-             return {
-                 "predicted_turnover_count": 0.0,
-                 "total_in_cohort": 0,
-                 "cohort_risk_rate": 0.0
-             }
-
-        agg_data = {
-            "TotalEmployees": len(filtered_df),
-            "B11_salary_today_brl": filtered_df['B11_salary_today_brl'].mean(),
-            "c1_overall_employee_satisfaction": filtered_df['c1_overall_employee_satisfaction'].mean(),
-            "B5_Degree_of_employment": filtered_df['B5_Degree_of_employment'].mean(),
-            "M_eNPS": filtered_df['M_eNPS'].mean(),
-            
-            "a6_education_level": filters.education_level if filters.education_level and filters.education_level != "All" else filtered_df['a6_education_level'].mode()[0],
-            "a1_gender": filters.gender if filters.gender and filters.gender != "All" else filtered_df['a1_gender'].mode()[0],
-            "B2_Public_service_status_ger": filtered_df['B2_Public_service_status_ger'].mode()[0] if 'B2_Public_service_status_ger' in filtered_df else 'No', 
-            
-            "AgeGroup": filters.age_group if filters.age_group else "25_to_35", 
-            "TenureGroup": filters.tenure_group if filters.tenure_group else "1_to_3yr",
-            "b1_PDI_rate": filtered_df['b1_PDI_rate'].mean() if 'b1_PDI_rate' in filtered_df.columns else 0.0
-        }
-        
-        onb_scores = []
-        for _, row in filtered_df.iterrows():
-            d = row.to_dict()
-            d = enrich_features(d)
-            onb_scores.append(d.get('M_Onboarding_Final_Score', 0))
-            
-        agg_data['M_Onboarding_Final_Score'] = sum(onb_scores) / len(onb_scores) if onb_scores else 0
-        
-        result = predict_aggregate(agg_data)
-        count = result.get('prediction', 0.0)
-        shap_dict = result.get('shap_values', {})
         
-        # Format SHAP for frontend (list of {name, value})
-        shap_list = [{"feature": k, "value": v, "base_value": 0.0} for k, v in shap_dict.items()]
-        shap_list.sort(key=lambda x: abs(x['value']), reverse=True)
-        # Take top 5 for aggregate view? or all? Let's send top 10
-        shap_list = shap_list[:10]
-        
-        return {
-            "predicted_turnover_count": count,
-            "total_in_cohort": len(filtered_df),
-            "cohort_risk_rate": (count / len(filtered_df)) * 100 if len(filtered_df) > 0 else 0,
-            "shap_values": shap_list,
-            "contributions": shap_list
-        }
+        return result
 
+    except HTTPException:
+        raise
     except FileNotFoundError:
         raise HTTPException(status_code=400, detail="Model not trained. Please call /train first.")
     except Exception as e:
@@ -383,11 +338,13 @@ class BayesianAggregatePrediction(BaseModel):
     total_in_cohort: int
     cohort_risk_rate: float
     uncertainty: BayesianUncertainty
+    count_uncertainty: BayesianUncertainty | None = None
     computation_time: float | None = None
     method: str | None = None
 
 class BayesianTrainRequest(BaseModel):
-    pass  # No parameters needed - always uses NUTS
+    method: Literal["nuts", "svi"] = "nuts"  # "svi": fast approximate posterior
+    warm_start: bool = False  # NUTS only: short warmup from the saved posterior
 
 
 # --- Bayesian Training Manager ---
@@ -422,6 +379,7 @@ class BayesianTrainingManager:
         self.status = "error"
 
 bayesian_training_manager = BayesianTrainingManager()
+bayesian_training_runner = TrainingRunner(bayesian_training_manager)
 
 
 # --- Bayesian Endpoints ---
@@ -440,41 +398,36 @@ def get_bayesian_training_status():
 @router.post("/train/bayesian", response_model=TrainResponse)
 def trigger_bayesian_training(request: BayesianTrainRequest = BayesianTrainRequest(), current_user: UserInfo = Depends(get_mode_user)):
     """
-    Train the Bayesian turnover model using NUTS (full MCMC).
+    Train the Bayesian turnover model using NUTS (full MCMC) or SVI.
     
     NUTS provides accurate posterior estimates for uncertainty quantification.
     Training takes approximately 5-15 minutes depending on hardware.
+    SVI fits an approximate posterior in seconds, for frequent retrains.
     """
-    if bayesian_training_manager.is_training:
+    if bayesian_training_manager.is_training or bayesian_training_runner.running:
         raise HTTPException(status_code=400, detail="Bayesian training already in progress.")
+    if training_manager.is_training and "bayesian" in training_manager.stages:
+        raise HTTPException(status_code=400, detail="Bayesian model is training as part of /train.")
     
-    from backend.ml import bayesian_turnover_model
-    
-    def train_job():
-        try:
-            bayesian_training_manager.start_training()
-            
-            def progress_callback(p, msg):
-                bayesian_training_manager.update_progress(p, msg)
-            
-            bayesian_turnover_model.train_bayesian_model(
-                progress_callback=progress_callback
-            )
-            
-            bayesian_training_manager.complete_training()
-        except Exception as e:
-            bayesian_training_manager.fail_training(str(e))
-            print(f"Bayesian training error: {e}")
-            import traceback
-            traceback.print_exc()
-    
-    threading.Thread(target=train_job).start()
+    bayesian_training_manager.start_training()
+    bayesian_training_runner.start(
+        training_jobs.train_bayesian,
+        {"method": request.method, "warm_start": request.warm_start}
+    )
     return {
-        "message": "Bayesian training started with NUTS inference",
+        "message": f"Bayesian training started with {request.method.upper()} inference",
         "status": "success"
     }
 
 
+@router.post("/train/bayesian/cancel", response_model=TrainResponse)
+def cancel_bayesian_training(current_user: UserInfo = Depends(get_mode_user)):
+    """Stops the running Bayesian training job."""
+    if not bayesian_training_runner.cancel():
+        raise HTTPException(status_code=400, detail="No Bayesian training in progress.")
+    return {"message": "Bayesian training cancelled.", "status": "success"}
+
+
 @router.post("/predict/individual/bayesian", response_model=BayesianIndividualPrediction)
 def predict_individual_bayesian(input_data: IndividualInput, current_user: UserInfo = Depends(get_mode_user)):
     """
@@ -485,19 +438,14 @@ def predict_individual_bayesian(input_data: IndividualInput, current_user: UserI
     try:
         from backend.ml import bayesian_turnover_model
         
-        df = load_data()
-        if df is None:
+        if resolve_data_path() is None:
             raise HTTPException(status_code=400, detail="Data not available")
         
-        # Find employee
-        employee_row = df[df['id'] == input_data.employee_id]
-        if employee_row.empty:
+        # Find employee (enriched + sanitized features, indexed by id)
+        data_dict = get_employee_features(input_data.employee_id)
+        if data_dict is None:
             raise HTTPException(status_code=404, detail="Employee not found")
         
-        data_dict = employee_row.iloc[0].to_dict()
-        data_dict = enrich_features(data_dict)
-        data_dict = {k: (v if pd.notna(v) else 0) for k, v in data_dict.items()}
-        
         result = bayesian_turnover_model.predict_bayesian_individual(data_dict)
         
         if result is None:
@@ -505,6 +453,8 @@ def predict_individual_bayesian(input_data: IndividualInput, current_user: UserI
         
         return result
         
+    except HTTPException:
+        raise
     except FileNotFoundError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -524,42 +474,12 @@ def predict_aggregate_bayesian(filters: AggregateFilters, current_user: UserInfo
     try:
         from backend.ml import bayesian_turnover_model
         
-        df = load_data()
-        if df is None:
+        # Apply Filters (same cohort engine as the XGBoost endpoint);
+        # enriched rows already carry derived features with gaps as 0
+        filtered_df = get_cohort_frame(filters.model_dump(), enriched=True)
+        if filtered_df is None:
             raise HTTPException(status_code=400, detail="Data not available")
         
-        # Apply Filters (same logic as XGBoost endpoint)
-        filtered_df = df.copy()
-        
-        if filters.education_level and filters.education_level != "All":
-            filtered_df = filtered_df[filtered_df['a6_education_level'] == filters.education_level]
-        if filters.gender and filters.gender != "All":
-            filtered_df = filtered_df[filtered_df['a1_gender'] == filters.gender]
-        
-        if filters.age_group:
-            if filters.age_group == 'lt_25':
-                filtered_df = filtered_df[filtered_df['a2_age'] < 25]
-            elif filters.age_group == '25_to_35':
-                filtered_df = filtered_df[(filtered_df['a2_age'] >= 25) & (filtered_df['a2_age'] < 35)]
-            elif filters.age_group == '35_to_45':
-                filtered_df = filtered_df[(filtered_df['a2_age'] >= 35) & (filtered_df['a2_age'] < 45)]
-            elif filters.age_group == '45_to_55':
-                filtered_df = filtered_df[(filtered_df['a2_age'] >= 45) & (filtered_df['a2_age'] < 55)]
-            elif filters.age_group == 'plus_55':
-                filtered_df = filtered_df[filtered_df['a2_age'] >= 55]
-        
-        if filters.tenure_group:
-            if filters.tenure_group == 'lt_1yr':
-                filtered_df = filtered_df[filtered_df['B10_Tenure_in_month'] < 12]
-            elif filters.tenure_group == '1_to_3yr':
-                filtered_df = filtered_df[(filtered_df['B10_Tenure_in_month'] >= 12) & (filtered_df['B10_Tenure_in_month'] < 36)]
-            elif filters.tenure_group == '3_to_5yr':
-                filtered_df = filtered_df[(filtered_df['B10_Tenure_in_month'] >= 36) & (filtered_df['B10_Tenure_in_month'] < 60)]
-            elif filters.tenure_group == '5_to_10yr':
-                filtered_df = filtered_df[(filtered_df['B10_Tenure_in_month'] >= 60) & (filtered_df['B10_Tenure_in_month'] < 120)]
-            elif filters.tenure_group == 'plus_10yr':
-                filtered_df = filtered_df[filtered_df['B10_Tenure_in_month'] >= 120]
-        
         if filtered_df.empty:
             return {
                 "predicted_turnover_count": 0.0,
@@ -574,18 +494,12 @@ def predict_aggregate_bayesian(filters: AggregateFilters, current_user: UserInfo
                 }
             }
         
-        # Prepare cohort data
-        cohort_data = []
-        for _, row in filtered_df.iterrows():
-            data_dict = row.to_dict()
-            data_dict = enrich_features(data_dict)
-            data_dict = {k: (v if pd.notna(v) else 0) for k, v in data_dict.items()}
-            cohort_data.append(data_dict)
-        
-        result = bayesian_turnover_model.predict_bayesian_aggregate(cohort_data)
+        result = bayesian_turnover_model.predict_bayesian_aggregate(filtered_df)
         
         return result
         
+    except HTTPException:
+        raise
     except FileNotFoundError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -625,35 +539,61 @@ def get_parameter_beliefs():
 
 
 @router.post("/bayesian/posterior-predictive")
-def generate_posterior_predictive(n_samples: int = 100):
+def generate_posterior_predictive(
+    n_samples: int = 100,
+    output: Literal["summary", "replicates", "npz"] = "summary",
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=200)
+):
     """
     Generate simulated data from the posterior predictive distribution.
     
     Shows what outcomes the model would predict, accounting for both
     parameter uncertainty AND data variability.
+    
+    - output=summary (default): per-observation statistics only
+    - output=replicates: y_rep/p_rep rows [offset, offset + limit) as JSON
+    - output=npz: the full y_rep (int8) and p_rep (float32) matrices as a
+      NumPy .npz download
     """
     try:
         from backend.ml.bayesian_interpretability import get_bayesian_interpretability
-        import os
-        import joblib
+        from backend.ml.bayesian_turnover_model import load_bayesian_preprocessor
         
         interpreter = get_bayesian_interpretability()
         
         # Load test data
-        preprocessor_path = os.path.join(os.path.dirname(__file__), 
-                                          "../../ml/bayesian_preprocessor.pkl")
-        if not os.path.exists(preprocessor_path):
+        artifact = load_bayesian_preprocessor()
+        if artifact is None:
             raise FileNotFoundError("Model not trained. Please train Bayesian model first.")
         
-        artifact = joblib.load(preprocessor_path)
         X_test = artifact.get("X_test")
         
         if X_test is None:
             raise HTTPException(status_code=400, 
                               detail="Test data not available. Please retrain model.")
         
+        if output == "replicates":
+            # Only the requested page of replicates is simulated
+            window = interpreter.replicate_window(X_test, n_samples=n_samples, offset=offset, limit=limit)
+            return {**window, "y_rep": window["y_rep"].tolist(), "p_rep": window["p_rep"].tolist()}
+        
         result = interpreter.generate_posterior_predictive(X_test, n_samples=n_samples)
-        return result
+        sizes = {
+            "n_replications": result["n_replications"],
+            "n_observations": result["n_observations"]
+        }
+        
+        if output == "npz":
+            buffer = io.BytesIO()
+            np.savez(buffer, y_rep=result["y_rep"], p_rep=result["p_rep"])
+            return Response(
+                content=buffer.getvalue(),
+                media_type="application/octet-stream",
+                headers={"Content-Disposition": 'attachment; filename="posterior_predictive.npz"'}
+            )
+        
+        return {"summary": result["summary"], **sizes}
         
     except FileNotFoundError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -665,34 +605,38 @@ def generate_posterior_predictive(n_samples: int = 100):
 
 
 @router.post("/bayesian/uncertainty-decomposition")
-def compute_uncertainty_decomposition():
+def compute_uncertainty_decomposition(output: Literal["records", "arrays", "aggregate"] = "records"):
     """
     Decompose prediction uncertainty into epistemic and aleatoric components.
     
     - Epistemic: uncertainty about model parameters (reducible with more data)
     - Aleatoric: inherent randomness in outcomes (irreducible)
+    
+    output=records (default) lists one object per observation, output=arrays
+    returns one list per metric, output=aggregate only the aggregate.
     """
     try:
         from backend.ml.bayesian_interpretability import get_bayesian_interpretability
-        import os
-        import joblib
+        from backend.ml.bayesian_turnover_model import load_bayesian_preprocessor
         
         interpreter = get_bayesian_interpretability()
         
         # Load test data
-        preprocessor_path = os.path.join(os.path.dirname(__file__), 
-                                          "../../ml/bayesian_preprocessor.pkl")
-        if not os.path.exists(preprocessor_path):
+        artifact = load_bayesian_preprocessor()
+        if artifact is None:
             raise FileNotFoundError("Model not trained. Please train Bayesian model first.")
         
-        artifact = joblib.load(preprocessor_path)
         X_test = artifact.get("X_test")
         
         if X_test is None:
             raise HTTPException(status_code=400, 
                               detail="Test data not available. Please retrain model.")
         
-        result = interpreter.compute_uncertainty_decomposition(X_test)
+        result = interpreter.compute_uncertainty_decomposition(X_test, output=output)
+        if output == "arrays":
+            result["observations"] = {
+                name: values.tolist() for name, values in result["observations"].items()
+            }
         return result
         
     except FileNotFoundError as e:
@@ -716,18 +660,15 @@ def run_posterior_predictive_check(n_replications: int = 500):
     """
     try:
         from backend.ml.bayesian_interpretability import get_bayesian_interpretability
-        import os
-        import joblib
+        from backend.ml.bayesian_turnover_model import load_bayesian_preprocessor
         
         interpreter = get_bayesian_interpretability()
         
         # Load test data
-        preprocessor_path = os.path.join(os.path.dirname(__file__), 
-                                          "../../ml/bayesian_preprocessor.pkl")
-        if not os.path.exists(preprocessor_path):
+        artifact = load_bayesian_preprocessor()
+        if artifact is None:
             raise FileNotFoundError("Model not trained. Please train Bayesian model first.")
         
-        artifact = joblib.load(preprocessor_path)
         X_test = artifact.get("X_test")
         y_test = artifact.get("y_test")
         
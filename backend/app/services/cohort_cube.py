@@ -0,0 +1,269 @@
+import os
+import itertools
+import threading
+import logging
+import joblib
+import numpy as np
+import pandas as pd
+
+from backend.ml import five_year_model
+from backend.ml.model_registry import model_registry
+from backend.ml.preprocessing import feature_engineering
+from backend.app.services.dataset_cache import dataset_cache
+from backend.app.services.cohort_engine import DEFAULT_AGE_GROUP, DEFAULT_TENURE_GROUP
+
+logger = logging.getLogger(__name__)
+
+# Filters the cube is materialized over (the five-year model's grouping)
+CUBE_DIMENSIONS = ['education_level', 'gender', 'age_group', 'tenure_group']
+# Cohort features averaged into the five-year model input
+MEAN_COLUMNS = [
+    'B11_salary_today_brl', 'c1_overall_employee_satisfaction',
+    'B5_Degree_of_employment', 'M_eNPS', 'b1_PDI_rate', 'M_Onboarding_Final_Score'
+]
+# Cohort features taken as the most frequent value
+MODE_COLUMNS = ['a6_education_level', 'a1_gender', 'B2_Public_service_status_ger']
+
+
+class CubeTable:
+    """
+    Five-year predictions for every cell of education x gender x age group x
+    tenure group, each dimension also rolled up as "All" (None). Read-only.
+    """
+
+    def __init__(self, keys, totals, predictions, contributions, base_values,
+                 feature_names, model_signature, data_signature):
+        self.cells = {key: i for i, key in enumerate(keys)}
+        self.totals = totals
+        self.predictions = predictions
+        self.contributions = contributions
+        self.base_values = base_values
+        self.feature_names = list(feature_names)
+        self.model_signature = model_signature
+        self.data_signature = data_signature
+
+    def __len__(self):
+        return len(self.cells)
+
+    def cell(self, key):
+        """Returns (cohort size, prediction, contributions, base value), or None."""
+        i = self.cells.get(key)
+        if i is None:
+            return None
+        return int(self.totals[i]), float(self.predictions[i]), self.contributions[i], float(self.base_values[i])
+
+
+class CohortCube:
+    """
+    Process-wide materialized cube of five-year cohort predictions.
+
+    Built once per (five-year model file, data file) pair: employees are
+    counted and summed per finest cell in one pass, every "All" roll-up is
+    derived from those partial aggregates, and all cells go through the
+    five-year model and TreeSHAP in a single batch. Aggregate requests on
+    the cube's dimensions are then a dict lookup. The cube is written to
+    CUBE_PATH, so the training job builds it and the API only reads it.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(CohortCube, cls).__new__(cls)
+            cls._instance._lock = threading.Lock()
+            cls._instance._table = None
+            cls._instance.path = five_year_model.CUBE_PATH
+        return cls._instance
+
+    def get(self, data_path: str):
+        """Returns the CubeTable for the current model and data, or None."""
+        model_signature, data_signature = self._signatures(data_path)
+        if model_signature is None or data_signature is None:
+            return None
+
+        table = self._table
+        if self._is_current(table, model_signature, data_signature):
+            return table
+
+        with self._lock:
+            if not self._is_current(self._table, model_signature, data_signature):
+                table = self._read(model_signature, data_signature)
+                if table is None:
+                    table = self._build(data_path, model_signature, data_signature)
+                    self._write(table)
+                self._table = table
+            return self._table
+
+    def refresh(self, data_path: str):
+        """Rebuilds the cube now (called by the training job)."""
+        model_signature, data_signature = self._signatures(data_path)
+        if model_signature is None or data_signature is None:
+            return None
+
+        with self._lock:
+            table = self._build(data_path, model_signature, data_signature)
+            self._write(table)
+            self._table = table
+            return table
+
+    def invalidate(self):
+        """Drops the resident cube; the next `get` re-reads or rebuilds it."""
+        with self._lock:
+            self._table = None
+
+    @staticmethod
+    def key(filters: dict):
+        """
+        Cube key for `filters`, or None when the query is outside the cube
+        (multi-value or non-cube filters, or an explicit "All" age/tenure).
+        """
+        for name, value in filters.items():
+            if name not in CUBE_DIMENSIONS and value not in (None, "All", [], ()):
+                return None
+
+        key = []
+        for name in CUBE_DIMENSIONS:
+            value = filters.get(name)
+            if value is None or (value == "All" and name in ('education_level', 'gender')):
+                key.append(None)
+            elif isinstance(value, str) and value != "All":
+                key.append(value)
+            else:
+                return None
+        return tuple(key)
+
+    @staticmethod
+    def _signatures(data_path: str):
+        if data_path is None:
+            return None, None
+        return model_registry.signature("five_year"), dataset_cache.signature(data_path)
+
+    @staticmethod
+    def _is_current(table, model_signature, data_signature) -> bool:
+        return (
+            table is not None
+            and table.model_signature == model_signature
+            and table.data_signature == data_signature
+        )
+
+    @staticmethod
+    def _build(data_path: str, model_signature, data_signature) -> CubeTable:
+        df, index = dataset_cache.get_cohort_index(data_path)
+        if df is None:
+            raise FileNotFoundError(f"Data not found at {data_path}")
+        df = feature_engineering(df)
+
+        # Finest cell of every employee; code 0 holds rows outside every bin
+        labels = [index.categories[name] for name in CUBE_DIMENSIONS]
+        shape = tuple(len(l) + 1 for l in labels)
+        finest = np.ravel_multi_index([index.codes[name] + 1 for name in CUBE_DIMENSIONS], shape)
+        n_finest = int(np.prod(shape))
+
+        # Selector per dimension: row 0 rolls up everything ("All"),
+        # row i + 1 keeps label i only
+        selectors = [np.vstack([np.ones(s), np.eye(s)[1:]]) for s in shape]
+
+        def roll_up(per_cell: np.ndarray) -> np.ndarray:
+            # per_cell: (n_finest, ...) -> (n_cube_cells, ...)
+            grid = per_cell.reshape(shape + per_cell.shape[1:])
+            cube = np.einsum('ai,bj,ck,dl,ijkl...->abcd...', *selectors, grid)
+            return cube.reshape((-1,) + per_cell.shape[1:])
+
+        totals = np.rint(roll_up(np.bincount(finest, minlength=n_finest).astype(float))).astype(int)
+
+        means = {}
+        for col in MEAN_COLUMNS:
+            if col not in df.columns:
+                means[col] = np.zeros(len(totals))
+                continue
+            values = df[col].to_numpy(dtype=float)
+            valid = ~np.isnan(values)
+            sums = roll_up(np.bincount(finest, weights=np.where(valid, values, 0.0), minlength=n_finest))
+            counts = roll_up(np.bincount(finest, weights=valid.astype(float), minlength=n_finest))
+            with np.errstate(invalid='ignore', divide='ignore'):
+                means[col] = sums / counts
+
+        modes = {}
+        for col in MODE_COLUMNS:
+            if col not in df.columns:
+                continue
+            categorical = pd.Categorical(df[col])
+            codes = np.asarray(categorical.codes)
+            n_cat = len(categorical.categories)
+            keep = codes >= 0
+            counts = np.bincount(finest[keep] * n_cat + codes[keep], minlength=n_finest * n_cat)
+            # Ties resolve to the first category, as pandas mode()[0]
+            modes[col] = categorical.categories[roll_up(counts.reshape(n_finest, n_cat).astype(float)).argmax(axis=1)]
+
+        keys = list(itertools.product(*[[None] + l for l in labels]))
+        records, cells = [], []
+        for i, (education, gender, age_group, tenure_group) in enumerate(keys):
+            if totals[i] == 0:
+                continue
+            cells.append(i)
+            records.append({
+                "TotalEmployees": int(totals[i]),
+                "B11_salary_today_brl": means['B11_salary_today_brl'][i],
+                "c1_overall_employee_satisfaction": means['c1_overall_employee_satisfaction'][i],
+                "B5_Degree_of_employment": means['B5_Degree_of_employment'][i],
+                "M_eNPS": means['M_eNPS'][i],
+                "a6_education_level": education or modes['a6_education_level'][i],
+                "a1_gender": gender or modes['a1_gender'][i],
+                "B2_Public_service_status_ger": modes['B2_Public_service_status_ger'][i] if 'B2_Public_service_status_ger' in modes else 'No',
+                "AgeGroup": age_group or DEFAULT_AGE_GROUP,
+                "TenureGroup": tenure_group or DEFAULT_TENURE_GROUP,
+                "b1_PDI_rate": means['b1_PDI_rate'][i],
+                "M_Onboarding_Final_Score": means['M_Onboarding_Final_Score'][i]
+            })
+
+        predictions = np.zeros(len(keys))
+        base_values = np.zeros(len(keys))
+        if records:
+            res = five_year_model.predict_aggregate_batch(pd.DataFrame(records))
+            feature_names = res["feature_names"]
+            contributions = np.zeros((len(keys), len(feature_names)))
+            predictions[cells] = res["predictions"]
+            contributions[cells] = res["contributions"]
+            base_values[cells] = res["base_values"]
+        else:
+            feature_names, contributions = [], np.zeros((len(keys), 0))
+
+        logger.info(f"Built five-year cohort cube: {len(keys)} cells, {len(cells)} non-empty")
+        return CubeTable(keys, totals, predictions, contributions, base_values,
+                         feature_names, model_signature, data_signature)
+
+
+    def _read(self, model_signature, data_signature):
+        # Reuse the persisted cube if it was built from the same files
+        if not os.path.exists(self.path):
+            return None
+        try:
+            stored = joblib.load(self.path)
+            table = CubeTable(**stored)
+            if not self._is_current(table, model_signature, data_signature):
+                return None
+            return table
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cohort cube at {self.path}: {e}")
+            return None
+
+    def _write(self, table: CubeTable):
+        stored = {
+            "keys": list(table.cells),
+            "totals": table.totals,
+            "predictions": table.predictions,
+            "contributions": table.contributions,
+            "base_values": table.base_values,
+            "feature_names": table.feature_names,
+            "model_signature": table.model_signature,
+            "data_signature": table.data_signature,
+        }
+        try:
+            tmp_path = f"{self.path}.tmp"
+            joblib.dump(stored, tmp_path)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            # The in-memory cube still serves this process
+            logger.warning(f"Could not persist cohort cube to {self.path}: {e}")
+
+
+cohort_cube = CohortCube()
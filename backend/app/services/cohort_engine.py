@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+from backend.ml.preprocessing import AGE_BINS, AGE_LABELS, TENURE_BINS, TENURE_LABELS
+
+# Filter name -> dataset column. AgeGroup/TenureGroup are derived bins.
+COHORT_DIMENSIONS = {
+    'education_level': 'a6_education_level',
+    'gender': 'a1_gender',
+    'age_group': 'AgeGroup',
+    'tenure_group': 'TenureGroup',
+    'sector': 'B15_Sector',
+    'headquarters': 'B16_Headquarters',
+    'cargo': 'B14_Cargo',
+}
+
+# Five-year model input when the age/tenure dimension is left unfiltered
+DEFAULT_AGE_GROUP = "25_to_35"
+DEFAULT_TENURE_GROUP = "1_to_3yr"
+
+
+class CohortIndex:
+    """
+    Precomputed cohort filters over one version of the employee dataset.
+
+    Every dimension in COHORT_DIMENSIONS is stored as categorical codes
+    (age and tenure binned with the five-year model's bins) and every
+    (dimension, value) pair gets a boolean row mask up front. A cohort
+    query is then an OR of masks within a dimension and an AND across
+    dimensions; the frame itself is never copied or filtered.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.n_rows = len(df)
+        self.codes = {}
+        self.categories = {}
+        self._masks = {}
+
+        for name, column in COHORT_DIMENSIONS.items():
+            values = self._dimension_values(df, column)
+            if values is None:
+                continue
+            categorical = pd.Categorical(values)
+            codes = np.asarray(categorical.codes)
+            self.codes[name] = codes
+            self.categories[name] = [str(c) for c in categorical.categories]
+            self._masks[name] = {
+                label: codes == code for code, label in enumerate(self.categories[name])
+            }
+
+    def mask(self, filters: dict) -> np.ndarray:
+        """
+        Boolean row mask for `filters` ({dimension: value}). A value may be
+        a single label or a list of labels (any of); None, "All" and empty
+        lists leave the dimension unfiltered. Unknown labels match nothing.
+        """
+        mask = np.ones(self.n_rows, dtype=bool)
+        for name, value in filters.items():
+            labels = self._labels(value)
+            if labels is None:
+                continue
+            masks = self._masks.get(name)
+            if masks is None:
+                raise ValueError(f"Unknown cohort dimension: {name}")
+            selected = np.zeros(self.n_rows, dtype=bool)
+            for label in labels:
+                dim_mask = masks.get(str(label))
+                if dim_mask is not None:
+                    selected |= dim_mask
+            mask &= selected
+        return mask
+
+    def positions(self, filters: dict) -> np.ndarray:
+        """Row positions of the employees matching `filters`."""
+        return np.flatnonzero(self.mask(filters))
+
+    @staticmethod
+    def _labels(value):
+        if value is None:
+            return None
+        if isinstance(value, (list, tuple, set)):
+            labels = [v for v in value if v is not None and v != "All"]
+            return labels or None
+        if value == "All":
+            return None
+        return [value]
+
+    @staticmethod
+    def _dimension_values(df: pd.DataFrame, column: str):
+        # include_lowest keeps age/tenure 0 in the first bin
+        if column == 'AgeGroup' and 'a2_age' in df.columns:
+            return pd.cut(df['a2_age'], bins=AGE_BINS, labels=AGE_LABELS, include_lowest=True)
+        if column == 'TenureGroup' and 'B10_Tenure_in_month' in df.columns:
+            return pd.cut(df['B10_Tenure_in_month'], bins=TENURE_BINS, labels=TENURE_LABELS, include_lowest=True)
+        if column in df.columns:
+            return df[column].astype(str).where(df[column].notna())
+        return None
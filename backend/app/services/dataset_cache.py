@@ -0,0 +1,234 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+from backend.ml.preprocessing import feature_engineering
+from backend.app.services.cohort_engine import CohortIndex
+
+# Columns stored as pandas categoricals once the CSV has been parsed.
+# Low-cardinality strings repeated across every employee row.
+CATEGORICAL_COLUMNS = [
+    'a1_gender', 'a6_education_level', 'B14_Cargo',
+    'B15_Sector', 'B16_Headquarters', 'E_Exit_Reason'
+]
+
+
+class DatasetCache:
+    """
+    Process-wide cache for the employee dataset.
+
+    The CSV is parsed once and kept as a typed DataFrame. Every call to
+    `get_frame` stats the file and reloads it only when its mtime or size
+    changed (or after an explicit `invalidate`). Callers receive shallow
+    copies, so adding, dropping or reassigning columns never reaches the
+    cached frame, and the cached buffers are read-only, so in-place writes
+    (`.loc[...] = x`, `.values[:] = x`) raise instead of corrupting it.
+
+    Alongside the frame it keeps an id -> row position index and, built on
+    first use, the enriched feature frame (and per-employee feature dicts)
+    and the cohort filter index, so point, batch and cohort lookups never
+    scan or copy the full frame.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(DatasetCache, cls).__new__(cls)
+            cls._instance._lock = threading.Lock()
+            cls._instance._df = None
+            cls._instance._path = None
+            cls._instance._signature = None
+            cls._instance._id_index = None
+            cls._instance._enriched = None
+            cls._instance._features = None
+            cls._instance._cohorts = None
+            cls._instance.version = 0
+        return cls._instance
+
+    def get_frame(self, data_path: str):
+        """
+        Returns a shallow copy of the dataset at `data_path` over read-only
+        buffers, reloading it if the file changed since the last parse.
+        """
+        with self._lock:
+            if not self._ensure_loaded(data_path):
+                return None
+            df = self._df
+
+        return df.copy(deep=False)
+
+    def get_row(self, data_path: str, employee_id: str):
+        """Returns the raw row of `employee_id` as a Series, or None."""
+        with self._lock:
+            if not self._ensure_loaded(data_path):
+                return None
+            pos = self._id_index.get(employee_id)
+            df = self._df
+
+        if pos is None:
+            return None
+        return df.iloc[pos]
+
+    def get_features(self, data_path: str, employee_id: str):
+        """
+        Returns the enriched feature dict of `employee_id` (derived
+        features added, missing values as 0), or None.
+        """
+        with self._lock:
+            if not self._ensure_loaded(data_path):
+                return None
+            pos = self._id_index.get(employee_id)
+            if pos is None:
+                return None
+            if self._features is None:
+                self._features = self._build_features(self._enriched_frame())
+            record = self._features[pos]
+
+        return dict(record)
+
+    def get_feature_frame(self, data_path: str, employee_ids=None):
+        """
+        Returns (enriched frame, missing ids) for `employee_ids`, in request
+        order, or for every employee when `employee_ids` is None.
+        Returns (None, []) if the data is missing.
+        """
+        with self._lock:
+            if not self._ensure_loaded(data_path):
+                return None, []
+            enriched = self._enriched_frame()
+            if employee_ids is None:
+                return enriched.copy(deep=False), []
+            positions, missing = [], []
+            for emp_id in employee_ids:
+                pos = self._id_index.get(emp_id)
+                if pos is None:
+                    missing.append(emp_id)
+                else:
+                    positions.append(pos)
+
+        return enriched.iloc[positions], missing
+
+    def get_cohort_frame(self, data_path: str, filters: dict, enriched: bool = False):
+        """
+        Returns the rows of the employees matching `filters` (see
+        CohortIndex.mask), raw or from the enriched feature frame, or None
+        if the data is missing.
+        """
+        with self._lock:
+            if not self._ensure_loaded(data_path):
+                return None
+            if self._cohorts is None:
+                self._cohorts = CohortIndex(self._df)
+            positions = self._cohorts.positions(filters)
+            df = self._enriched_frame() if enriched else self._df
+
+        return df.iloc[positions]
+
+    def get_cohort_index(self, data_path: str):
+        """
+        Returns (raw frame, CohortIndex) for the same dataset version,
+        or (None, None) if the data is missing.
+        """
+        with self._lock:
+            if not self._ensure_loaded(data_path):
+                return None, None
+            if self._cohorts is None:
+                self._cohorts = CohortIndex(self._df)
+            return self._df.copy(deep=False), self._cohorts
+
+    def signature(self, data_path: str):
+        """(mtime_ns, size) of the CSV on disk, or None if missing."""
+        return self._file_signature(data_path)
+
+    def invalidate(self):
+        """Drops the cached frame so the next access re-reads the CSV."""
+        with self._lock:
+            self._df = None
+            self._signature = None
+            self._id_index = None
+            self._enriched = None
+            self._features = None
+            self._cohorts = None
+
+    def _ensure_loaded(self, data_path: str) -> bool:
+        # Caller must hold self._lock
+        signature = self._file_signature(data_path)
+        if signature is None:
+            return False
+
+        if self._df is None or self._path != data_path or self._signature != signature:
+            self._df = self._freeze(self._read(data_path))
+            self._id_index = self._build_index(self._df)
+            self._enriched = None
+            self._features = None
+            self._cohorts = None
+            self._path = data_path
+            self._signature = signature
+            self.version += 1
+        return True
+
+    def _enriched_frame(self) -> pd.DataFrame:
+        # Caller must hold self._lock
+        if self._enriched is None:
+            self._enriched = self._freeze(self._build_enriched(self._df))
+        return self._enriched
+
+    @staticmethod
+    def _file_signature(data_path: str):
+        try:
+            stat = os.stat(data_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def _freeze(df: pd.DataFrame) -> pd.DataFrame:
+        # Copy-on-Write is off by default before pandas 3, so shallow copies
+        # share writable blocks; lock the numpy buffers behind every column
+        # (categoricals through their codes)
+        for values in df._mgr.arrays:
+            values = getattr(values, "_ndarray", values)
+            if isinstance(values, np.ndarray):
+                values.flags.writeable = False
+        return df
+
+    @staticmethod
+    def _read(data_path: str) -> pd.DataFrame:
+        df = pd.read_csv(data_path)
+
+        # Ensure ID column
+        if 'id' not in df.columns:
+            # Create stable IDs based on index
+            df['id'] = [f"EMP{i:05d}" for i in range(len(df))]
+
+        for col in CATEGORICAL_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].astype('category')
+
+        return df
+
+    @staticmethod
+    def _build_index(df: pd.DataFrame) -> dict:
+        index = {}
+        for pos, emp_id in enumerate(df['id'].tolist()):
+            # Keep the first occurrence, matching df[df['id'] == x].iloc[0]
+            index.setdefault(emp_id, pos)
+        return index
+
+    @staticmethod
+    def _build_enriched(df: pd.DataFrame) -> pd.DataFrame:
+        # Derived features added, numeric gaps as 0 (same as the
+        # per-request sanitizing the prediction endpoints used to do)
+        enriched = feature_engineering(df)
+        numeric_cols = enriched.select_dtypes(include='number').columns
+        enriched[numeric_cols] = enriched[numeric_cols].fillna(0)
+        return enriched
+
+    @staticmethod
+    def _build_features(enriched: pd.DataFrame) -> list:
+        records = enriched.astype(object)
+        records = records.where(records.notna(), 0)
+        return records.to_dict(orient='records')
+
+
+dataset_cache = DatasetCache()
@@ -0,0 +1,197 @@
+import os
+import json
+import threading
+import logging
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from backend.ml import one_year_model
+from backend.ml.model_registry import model_registry
+from backend.app.services.dataset_cache import dataset_cache
+
+logger = logging.getLogger(__name__)
+
+# Key of the JSON blob stored in the parquet schema metadata
+_METADATA_KEY = b"turnover_scores"
+
+
+class ScoreTable:
+    """
+    One-year scores for every employee: probability, predicted class,
+    base value and per-feature SHAP contributions (business names), in
+    dataset order. Treat as read-only; it is shared across requests.
+    """
+
+    def __init__(self, frame: pd.DataFrame, feature_names: list, model_signature, data_signature):
+        self.frame = frame
+        self.feature_names = list(feature_names)
+        self.model_signature = tuple(model_signature)
+        self.data_signature = tuple(data_signature)
+
+        self.ids = frame['id'].to_numpy()
+        self.probabilities = frame['turnover_probability'].to_numpy(dtype=float)
+        self.predicted_classes = frame['predicted_class'].to_numpy()
+        self.base_values = frame['base_value'].to_numpy(dtype=float)
+        self.contributions = frame[self.feature_names].to_numpy(dtype=float)
+        # Global drivers: full-population mean |SHAP|, fixed for this model and data
+        self.mean_abs_contributions = (
+            np.abs(self.contributions).mean(axis=0) if len(frame) else np.zeros(len(self.feature_names))
+        )
+
+        self._index = {}
+        for pos, emp_id in enumerate(self.ids.tolist()):
+            # First occurrence wins, same as the dataset id index
+            self._index.setdefault(emp_id, pos)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def positions(self, employee_ids=None):
+        """
+        Returns (row positions, missing ids) for `employee_ids` in request
+        order, or every row when `employee_ids` is None.
+        """
+        if employee_ids is None:
+            return np.arange(len(self.ids)), []
+        positions, missing = [], []
+        for emp_id in employee_ids:
+            pos = self._index.get(emp_id)
+            if pos is None:
+                missing.append(emp_id)
+            else:
+                positions.append(pos)
+        return np.array(positions, dtype=int), missing
+
+
+class PopulationScores:
+    """
+    Process-wide one-year score table for the whole employee population.
+
+    Scoring (feature engineering, preprocessing, selection, predict and
+    TreeSHAP) runs once per (model file, data file) pair and the result is
+    written to SCORES_PATH as parquet, so dashboards and per-employee
+    lookups are reads. The table is rebuilt after training, or lazily on
+    the next `get` when either file changed on disk.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(PopulationScores, cls).__new__(cls)
+            cls._instance._lock = threading.Lock()
+            cls._instance._table = None
+            cls._instance.path = one_year_model.SCORES_PATH
+        return cls._instance
+
+    def get(self, data_path: str):
+        """
+        Returns the ScoreTable for the current model and data, or None if
+        either is missing.
+        """
+        model_signature, data_signature = self._signatures(data_path)
+        if model_signature is None or data_signature is None:
+            return None
+
+        table = self._table
+        if self._is_current(table, model_signature, data_signature):
+            return table
+
+        with self._lock:
+            # Another thread may have rebuilt it while we waited
+            if not self._is_current(self._table, model_signature, data_signature):
+                table = self._read(model_signature, data_signature)
+                if table is None:
+                    table = self._score(data_path, model_signature, data_signature)
+                    self._write(table)
+                self._table = table
+            return self._table
+
+    def refresh(self, data_path: str):
+        """Rescores the population now (called after training)."""
+        model_signature, data_signature = self._signatures(data_path)
+        if model_signature is None or data_signature is None:
+            return None
+
+        with self._lock:
+            table = self._score(data_path, model_signature, data_signature)
+            self._write(table)
+            self._table = table
+            return table
+
+    def invalidate(self):
+        """Drops the resident table; the next `get` re-reads or rescores."""
+        with self._lock:
+            self._table = None
+
+    @staticmethod
+    def _signatures(data_path: str):
+        if data_path is None:
+            return None, None
+        return model_registry.signature("one_year"), dataset_cache.signature(data_path)
+
+    @staticmethod
+    def _is_current(table, model_signature, data_signature) -> bool:
+        return (
+            table is not None
+            and table.model_signature == tuple(model_signature)
+            and table.data_signature == tuple(data_signature)
+        )
+
+    @staticmethod
+    def _score(data_path: str, model_signature, data_signature) -> ScoreTable:
+        enriched, _ = dataset_cache.get_feature_frame(data_path)
+        if enriched is None:
+            raise FileNotFoundError(f"Data not found at {data_path}")
+
+        res = one_year_model.predict_batch_risk(enriched)
+        contributions = res["contributions"]
+
+        frame = pd.DataFrame({
+            'id': enriched['id'].astype(str).to_numpy(),
+            'turnover_probability': res["probabilities"],
+            'predicted_class': np.asarray(res["predicted_classes"]).astype(int),
+            'base_value': res["base_values"],
+        })
+        frame = pd.concat([frame, contributions.reset_index(drop=True)], axis=1)
+
+        logger.info(f"Scored {len(frame)} employees for the population risk table")
+        return ScoreTable(frame, list(contributions.columns), model_signature, data_signature)
+
+    def _read(self, model_signature, data_signature):
+        # Reuse the persisted table if it was built from the same files
+        if not os.path.exists(self.path):
+            return None
+        try:
+            parquet = pq.read_table(self.path)
+            meta = json.loads((parquet.schema.metadata or {}).get(_METADATA_KEY, b"{}"))
+            if (tuple(meta.get("model_signature", ())) != tuple(model_signature)
+                    or tuple(meta.get("data_signature", ())) != tuple(data_signature)):
+                return None
+            return ScoreTable(parquet.to_pandas(), meta["feature_names"], model_signature, data_signature)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable score table at {self.path}: {e}")
+            return None
+
+    def _write(self, table: ScoreTable):
+        meta = {
+            "model_signature": list(table.model_signature),
+            "data_signature": list(table.data_signature),
+            "feature_names": table.feature_names,
+        }
+        try:
+            parquet = pa.Table.from_pandas(table.frame, preserve_index=False)
+            parquet = parquet.replace_schema_metadata({
+                **(parquet.schema.metadata or {}),
+                _METADATA_KEY: json.dumps(meta).encode()
+            })
+            tmp_path = f"{self.path}.tmp"
+            pq.write_table(parquet, tmp_path)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            # The in-memory table still serves this process
+            logger.warning(f"Could not persist score table to {self.path}: {e}")
+
+
+population_scores = PopulationScores()
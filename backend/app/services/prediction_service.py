@@ -2,6 +2,7 @@ import pandas as pd
 import numpy as np
 import os
 import sys
+from functools import lru_cache
 from backend.app.feature_config import FEATURE_GROUPS, ENGAGEMENT_PREFIXES
 
 # Append project root to sys.path to allow imports of backend modules
@@ -18,19 +19,18 @@ root_dir = os.path.dirname(backend_dir)
 # Import models from backend.ml
 from backend.ml import one_year_model
 from backend.ml import five_year_model
+from backend.ml import shapash_config
+from backend.ml.preprocessing import feature_engineering
 
-# Global cache
-cached_df = None
+from backend.app.services.dataset_cache import dataset_cache
+from backend.app.services.population_scores import population_scores
+from backend.app.services.cohort_engine import DEFAULT_AGE_GROUP, DEFAULT_TENURE_GROUP
+from backend.app.services.cohort_cube import CohortCube, cohort_cube
 
-def load_data():
+def resolve_data_path():
     """
-    Loads data and ensures IDs exist.
+    Locates synthetic_turnover_data.csv (cwd first, then project root).
     """
-    global cached_df
-    # Path to data: root/synthetic_turnover_data.csv
-    # backend_dir is root/backend. root is dirname(backend_dir)
-    root_dir = os.path.dirname(backend_dir)
-    
     # Try cwd
     data_path = os.path.join(os.getcwd(), "synthetic_turnover_data.csv")
     
@@ -40,78 +40,174 @@ def load_data():
         
     if not os.path.exists(data_path):
          return None
-    
-    df = pd.read_csv(data_path)
-    
-    # Ensure ID column
-    if 'id' not in df.columns:
-        # Create stable IDs based on index
-        df['id'] = [f"EMP{i:05d}" for i in range(len(df))]
-        
-    return df
+    return data_path
 
-def enrich_features(data: dict) -> dict:
+def load_data():
     """
-    Calculates derived features like M_Onboarding_Final_Score.
+    Loads data and ensures IDs exist.
+    Served from the process-wide dataset cache; the CSV is only re-parsed
+    when the file changes on disk. Treat the returned frame as read-only.
     """
-    # 1. Calculate Onboarding Score
-    # Formula: (5 * 3d + 25 * Avg(15d) + 70 * Avg(30d)) / 100
-    
-    onb_3d = data.get('M_Onb_3d_Integration', 0)
-    
-    # 15d columns
-    cols_15d = [
-        'M_Onb_15d_Credibility', 'M_Onb_15d_Respect', 'M_Onb_15d_Impartiality', 
-        'M_Onb_15d_Pride', 'M_Onb_15d_Camaraderie'
-    ]
-    vals_15d = [data.get(c, 0) for c in cols_15d]
-    avg_15d = sum(vals_15d) / len(vals_15d) if vals_15d else 0
+    data_path = resolve_data_path()
+    if data_path is None:
+        return None
+    return dataset_cache.get_frame(data_path)
+
+def get_employee_row(employee_id: str):
+    """
+    O(1) lookup of an employee's raw row via the cached id index.
+    Returns a Series, or None if the data or employee is missing.
+    """
+    data_path = resolve_data_path()
+    if data_path is None:
+        return None
+    return dataset_cache.get_row(data_path, employee_id)
+
+def get_employee_features(employee_id: str):
+    """
+    O(1) lookup of an employee's enriched, NaN-free feature dict
+    (the input expected by the individual predictors).
+    Returns None if the data or employee is missing.
+    """
+    data_path = resolve_data_path()
+    if data_path is None:
+        return None
+    return dataset_cache.get_features(data_path, employee_id)
+
+def get_employee_feature_frame(employee_ids=None):
+    """
+    Enriched feature rows for `employee_ids` (all employees if None),
+    gathered through the id index. Returns (DataFrame or None, missing ids).
+    """
+    data_path = resolve_data_path()
+    if data_path is None:
+        return None, []
+    return dataset_cache.get_feature_frame(data_path, employee_ids)
+
+def get_cohort_frame(filters: dict, enriched: bool = False):
+    """
+    Rows of the cohort described by `filters` ({dimension: value or list
+    of values}, see cohort_engine.COHORT_DIMENSIONS), selected with the
+    precomputed cohort masks. With `enriched`, rows come from the cached
+    feature frame (derived features added, numeric gaps as 0).
+    Returns None if the data is missing.
+    """
+    data_path = resolve_data_path()
+    if data_path is None:
+        return None
+    return dataset_cache.get_cohort_frame(data_path, filters, enriched=enriched)
+
+def summarize_cohort(cohort_df: pd.DataFrame, filters: dict) -> dict:
+    """
+    Five-year model input for a cohort: size, feature means and modes,
+    computed column-wise over the cohort rows.
+    """
+    df = feature_engineering(cohort_df)
     
-    # 30d columns
-    cols_30d = [
-        'M_Onb_30d_Credibility', 'M_Onb_30d_Respect', 'M_Onb_30d_Impartiality', 
-        'M_Onb_30d_Pride', 'M_Onb_30d_Camaraderie'
-    ]
-    vals_30d = [data.get(c, 0) for c in cols_30d]
-    avg_30d = sum(vals_30d) / len(vals_30d) if vals_30d else 0
+    def mean_of(col):
+        return float(df[col].mean()) if col in df.columns else 0.0
     
-    data['M_Onboarding_Final_Score'] = (5 * onb_3d + 25 * avg_15d + 70 * avg_30d) / 100
+    def selected_or_mode(filter_name, col):
+        value = filters.get(filter_name)
+        if value and value != "All":
+            return value
+        return df[col].mode()[0]
     
-    return data
+    return {
+        "TotalEmployees": len(df),
+        "B11_salary_today_brl": mean_of('B11_salary_today_brl'),
+        "c1_overall_employee_satisfaction": mean_of('c1_overall_employee_satisfaction'),
+        "B5_Degree_of_employment": mean_of('B5_Degree_of_employment'),
+        "M_eNPS": mean_of('M_eNPS'),
+        
+        "a6_education_level": selected_or_mode('education_level', 'a6_education_level'),
+        "a1_gender": selected_or_mode('gender', 'a1_gender'),
+        "B2_Public_service_status_ger": df['B2_Public_service_status_ger'].mode()[0] if 'B2_Public_service_status_ger' in df else 'No',
+        
+        "AgeGroup": filters.get('age_group') or DEFAULT_AGE_GROUP,
+        "TenureGroup": filters.get('tenure_group') or DEFAULT_TENURE_GROUP,
+        "b1_PDI_rate": mean_of('b1_PDI_rate'),
+        "M_Onboarding_Final_Score": mean_of('M_Onboarding_Final_Score')
+    }
+
+# Business name (shapash_config.FEATURES_DICT value) -> technical column
+TECHNICAL_NAMES = {v: k for k, v in shapash_config.FEATURES_DICT.items()}
+
+def feature_group(feat: str) -> str:
+    """
+    Maps a model feature (technical or business name) to its FEATURE_GROUPS bucket.
+    """
+    feat = TECHNICAL_NAMES.get(feat, feat)
+    for group, members in FEATURE_GROUPS.items():
+        if feat in members:
+            return group
+    if any(feat.startswith(p) for p in ENGAGEMENT_PREFIXES):
+        return "Performance & Engagement"
+    elif feat.startswith('a'):
+        return "Demographic"
+    return "Professional"
+
+def get_population_scores():
+    """
+    The precomputed one-year score table for the current model and data
+    (see population_scores), or None if the data is missing or the model
+    is not trained.
+    """
+    data_path = resolve_data_path()
+    if data_path is None:
+        return None
+    return population_scores.get(data_path)
 
-def predict_individual(data_dict: dict):
+def get_individual_scores(employee_ids=None, top_k: int = 10):
     """
-    Wrapper for one_year_model individual prediction
-    Enriches with grouped SHAP values.
+    Reads the scores of `employee_ids` (all employees if None) from the
+    population table: one dict per employee with probability, top-k
+    contributions and grouped contributions.
+    Returns (list or None if data is missing, missing ids).
     """
-    res = one_year_model.predict_individual_risk(data_dict)
+    if resolve_data_path() is None:
+        return None, []
+    table = get_population_scores()
+    if table is None:
+        raise FileNotFoundError("One year model not found. Please train first.")
     
-    # SHAP Grouping
-    shap_raw = res.get("shap_values", {})
-    if shap_raw:
-        grouped_shap = {group: 0.0 for group in FEATURE_GROUPS.keys()}
-        for feat, val in shap_raw.items():
-            val_abs = abs(val)
-            
-            # Match group
-            found = False
-            for group, members in FEATURE_GROUPS.items():
-                if feat in members:
-                    grouped_shap[group] += val_abs
-                    found = True
-                    break
-            
-            if not found:
-                 if any(feat.startswith(p) for p in ENGAGEMENT_PREFIXES):
-                    grouped_shap["Performance & Engagement"] += val_abs
-                 elif feat.startswith('a'):
-                    grouped_shap["Demographic"] += val_abs
-                 else:
-                    grouped_shap["Professional"] += val_abs
-        
-        res["grouped_shap"] = [{"group": k, "value": float(v)} for k, v in grouped_shap.items()]
-        
-    return res
+    positions, missing = table.positions(employee_ids)
+    results = _format_scores(
+        table.ids[positions].tolist(), table.probabilities[positions],
+        table.contributions[positions], table.base_values[positions],
+        table.feature_names, top_k
+    )
+    return results, missing
+
+def _format_scores(ids, probs, values, base_values, features, top_k) -> list:
+    # Per-employee response dicts from aligned score arrays
+    if len(ids) == 0:
+        return []
+    features = np.array(features)
+    abs_values = np.abs(values)
+    # Top-k columns per row by absolute contribution
+    k = min(top_k, values.shape[1])
+    top_idx = np.argsort(-abs_values, axis=1, kind='stable')[:, :k]
+    
+    # Grouped |SHAP|: one column sum per group, for all rows at once
+    groups = np.array([feature_group(f) for f in features])
+    grouped = {g: abs_values[:, groups == g].sum(axis=1) for g in FEATURE_GROUPS.keys()}
+    
+    results = []
+    for i, emp_id in enumerate(ids):
+        contribs = [
+            {"feature": features[j], "value": float(values[i, j]), "base_value": float(base_values[i])}
+            for j in top_idx[i]
+        ]
+        prob = float(probs[i])
+        results.append({
+            "employee_id": emp_id,
+            "turnover_probability": prob,
+            "contributions": contribs,
+            "grouped_contributions": [{"group": g, "value": float(v[i])} for g, v in grouped.items()],
+            "risk_level": "High" if prob > 0.5 else "Low"
+        })
+    return results
 
 def predict_aggregate(agg_data: dict):
     """
@@ -120,9 +216,104 @@ def predict_aggregate(agg_data: dict):
     """
     return five_year_model.predict_aggregate_turnover(agg_data)
 
+def predict_cohort(filters: dict):
+    """
+    Five-year prediction for the cohort described by `filters`, shaped for
+    the aggregate endpoint. Queries on the cube's dimensions are read from
+    the precomputed cohort cube; anything else (multi-value filters) is
+    summarized and predicted on demand.
+    Returns None if the data is missing.
+    """
+    data_path = resolve_data_path()
+    if data_path is None:
+        return None
+    
+    key = CohortCube.key(filters)
+    if key is not None:
+        cube = cohort_cube.get(data_path)
+        if cube is None:
+            raise FileNotFoundError("Five year model not found. Please train first.")
+        cell = cube.cell(key)
+        if cell is not None:
+            total, count, contributions, base_value = cell
+            shap_dict = dict(zip(cube.feature_names, contributions.tolist()))
+            return _format_aggregate(count, total, shap_dict, base_value)
+    
+    cohort_df = get_cohort_frame(filters)
+    if cohort_df is None:
+        return None
+    if cohort_df.empty:
+        return _format_aggregate(0.0, 0, {}, 0.0)
+    
+    # Cohort means/modes, derived features computed column-wise
+    result = predict_aggregate(summarize_cohort(cohort_df, filters))
+    return _format_aggregate(
+        result.get('prediction', 0.0), len(cohort_df),
+        result.get('shap_values', {}), result.get('base_value', 0.0)
+    )
+
+def _format_aggregate(count: float, total: int, shap_dict: dict, base_value: float) -> dict:
+    if total == 0:
+        return {
+            "predicted_turnover_count": 0.0,
+            "total_in_cohort": 0,
+            "cohort_risk_rate": 0.0
+        }
+    
+    # Format SHAP for frontend (list of {name, value}), top 10
+    shap_list = [{"feature": k, "value": v, "base_value": base_value} for k, v in shap_dict.items()]
+    shap_list.sort(key=lambda x: abs(x['value']), reverse=True)
+    shap_list = shap_list[:10]
+    
+    return {
+        "predicted_turnover_count": count,
+        "total_in_cohort": total,
+        "cohort_risk_rate": (count / total) * 100,
+        "shap_values": shap_list,
+        "contributions": shap_list
+    }
+
+@lru_cache(maxsize=1)
+def _global_risk_drivers(table):
+    """
+    "Global Risk Drivers" for the dashboard: top-5 features and business
+    groups by full-population mean |SHAP|. Computed once per score table
+    (i.e. per published model and dataset) and then served from memory.
+    """
+    mean_abs_contributions = dict(zip(table.feature_names, table.mean_abs_contributions.tolist()))
+    
+    shap_summary = []
+    for name, val in mean_abs_contributions.items():
+        shap_summary.append({"feature": name, "value": float(val), "base_value": 0.0})
+    
+    shap_summary.sort(key=lambda x: abs(x['value']), reverse=True)
+    shap_values_top = shap_summary[:5]
+    
+    # Grouped SHAP (Using business groups from config)
+    grouped_shap = {group: 0.0 for group in shapash_config.FEATURES_GROUPS.keys()}
+    
+    for feat_business, val in mean_abs_contributions.items():
+        found = False
+        for g_name, g_cols in shapash_config.FEATURES_GROUPS.items():
+             # Since contributions uses BUSINESS names, we check against FEATURES_DICT
+             technical_name = TECHNICAL_NAMES.get(feat_business, feat_business)
+             if technical_name in g_cols:
+                 grouped_shap[g_name] += val
+                 found = True
+                 break
+        
+        if not found:
+            # Fallback to general categories
+            if "Demographic" in grouped_shap: grouped_shap["Demographic"] += val
+            else: grouped_shap["Job Details"] = grouped_shap.get("Job Details", 0) + val
+    
+    grouped_shap_list = [{"group": k, "value": float(v)} for k, v in grouped_shap.items()]
+    return shap_values_top, grouped_shap_list
+
 def get_dashboard_metrics(df):
     """
-    Calculates dashboard metrics using one_year_model
+    Calculates dashboard metrics from the precomputed one-year score table
+    (no model pass per request).
     """
     # Try to load model
     artifact = one_year_model.load_one_year_model()
@@ -131,128 +322,33 @@ def get_dashboard_metrics(df):
         return None
 
     model = artifact['model']
-    preprocessor = artifact['preprocessor']
-    selector = artifact.get('selector')
     feature_names = artifact['feature_names']
     
-    # --- PROPER SHAPASH PREDICTOR USAGE ---
-    # Load predictor for global feature importance/SHAP
-    predictor_path = os.path.join(backend_dir, "ml", "one_year_predictor.pkl")
-    shap_values_top = []
-    grouped_shap_list = []
-    
-    from shapash.utils.load_smartpredictor import load_smartpredictor
-    from backend.ml import shapash_config
-    from backend.ml.preprocessing import feature_engineering
-    
-    # Predict
-    df_engineered = feature_engineering(df)
-    X_processed = preprocessor.transform(df_engineered)
-    if selector:
-        X_final = selector.transform(X_processed)
-    else:
-        X_final = X_processed
+    table = get_population_scores()
+    if table is None or len(table) == 0:
+        return None
     
-    probs = model.predict_proba(X_final)[:, 1]
-    y_pred = model.predict(X_final)
+    probs = table.probabilities
+    y_pred = table.predicted_classes
     high_risk_count = int(y_pred.sum())
     turnover_rate = float(y_pred.mean() * 100)
     
-    try:
-        if os.path.exists(predictor_path):
-            predictor = load_smartpredictor(predictor_path)
-            
-            # PredictProba for global drivers (Summary of Top Factors)
-            sample_size = min(100, len(df))
-            indices = np.random.choice(len(df), sample_size, replace=False)
-            df_sample = df.iloc[indices]
-            
-            X_sample = X_final[indices]
-            X_sample_df = pd.DataFrame(X_sample, columns=feature_names)
-            
-            # Align columns if necessary
-            if hasattr(predictor, 'features_types'):
-                req = list(predictor.features_types.keys())
-            elif hasattr(predictor, 'model_fnames'):
-                req = list(predictor.model_fnames)
-            else:
-                req = feature_names
-
-            # Ensure all required columns are present
-            for c in req:
-                if c not in X_sample_df.columns:
-                    X_sample_df[c] = 0.0
-            
-            # Reorder to match predictor exactly
-            X_sample_df = X_sample_df[req].copy()
-                
-            # Force types
-            predictor.features_types = {k: 'float64' for k in predictor.features_types.keys()}
-            for c in X_sample_df.columns:
-                X_sample_df[c] = X_sample_df[c].astype(float)
-
-            try:
-                print(f"DEBUG: Dashboard X_sample_df columns order: {list(X_sample_df.columns)}")
-                print(f"DEBUG: Dashboard Predictor mandatory order: {list(predictor.model_fnames) if hasattr(predictor, 'model_fnames') else 'No model_fnames'}")
-                predictor.add_input(x=X_sample_df)
-            except Exception as e_add:
-                print(f"DEBUG: SmartPredictor.add_input failed. Error: {e_add}")
-                raise e_add
-
-            # detail_contributions returns (n_samples, n_features)
-            contributions = predictor.detail_contributions()
-            
-            # Ensure all columns are numeric
-            for col in contributions.columns:
-                contributions[col] = pd.to_numeric(contributions[col], errors='coerce').fillna(0)
-            
-            # Average absolute contributions for "Global Risk Drivers"
-            mean_abs_contributions = contributions.abs().mean().to_dict()
-            
-            shap_summary = []
-            for name, val in mean_abs_contributions.items():
-                shap_summary.append({"feature": name, "value": float(val), "base_value": 0.0})
-            
-            shap_summary.sort(key=lambda x: abs(x['value']), reverse=True)
-            shap_values_top = shap_summary[:5]
-            
-            # Grouped SHAP (Using business groups from config)
-            grouped_shap = {group: 0.0 for group in shapash_config.FEATURES_GROUPS.keys()}
-            
-            for feat_business, val in mean_abs_contributions.items():
-                found = False
-                for g_name, g_cols in shapash_config.FEATURES_GROUPS.items():
-                     # Since contributions uses BUSINESS names, we check against FEATURES_DICT
-                     technical_name = next((k for k, v in shapash_config.FEATURES_DICT.items() if v == feat_business), feat_business)
-                     if technical_name in g_cols:
-                         grouped_shap[g_name] += val
-                         found = True
-                         break
-                
-                if not found:
-                    # Fallback to general categories
-                    if "Demographic" in grouped_shap: grouped_shap["Demographic"] += val
-                    else: grouped_shap["Job Details"] = grouped_shap.get("Job Details", 0) + val
-            
-            grouped_shap_list = [{"group": k, "value": float(v)} for k, v in grouped_shap.items()]
-        else:
-            print(f"WARNING: Dashboard predictor not found at {predictor_path}")
-            
-    except Exception as e:
-        print(f"Shapash Dashboard Error: {e}")
-        import traceback
-        traceback.print_exc()
-
+    shap_values_top, grouped_shap_list = _global_risk_drivers(table)
     
     # Top Predictions
-
-    results_df = df.copy()
-    results_df['risk'] = probs
-    if 'name' not in results_df.columns:
-         results_df['name'] = [f"Employee {val}" for val in results_df['id']]
-    
-    top_risk_df = results_df.sort_values(by='risk', ascending=False).head(5)
-    predictions_list = top_risk_df[['id', 'risk', 'name']].to_dict(orient='records')
+    top_idx = np.argsort(-probs, kind='stable')[:5]
+    top_ids = table.ids[top_idx].tolist()
+    names = {}
+    if 'name' in df.columns and 'id' in df.columns:
+        # Join on the employee id; the CSV row order need not match the table
+        ids = df['id'].astype(str)
+        matched = pd.DataFrame({'id': ids, 'name': df['name']})[ids.isin(top_ids)]
+        matched = matched.drop_duplicates('id')
+        names = dict(zip(matched['id'], matched['name']))
+    predictions_list = [
+        {"id": emp_id, "risk": float(risk), "name": names.get(emp_id, f"Employee {emp_id}")}
+        for emp_id, risk in zip(top_ids, probs[top_idx])
+    ]
     
     # Feature Importance
     importances = []
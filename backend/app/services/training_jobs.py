@@ -0,0 +1,76 @@
+"""
+Training jobs run by TrainingRunner in a separate process.
+
+Each job receives a `manager` that forwards update_progress/update_stage
+calls to the API's training manager. Jobs must be module-level functions,
+since the runner starts them in a freshly spawned interpreter.
+"""
+
+import os
+
+from backend.ml import data_generator, training_pipeline
+from backend.ml.model_registry import STAGED_SUFFIX
+
+STAGE_LABELS = {"one_year": "One Year", "five_year": "Five Year", "bayesian": "Bayesian"}
+# Training data the API serves from (relative to the working directory, see resolve_data_path)
+DATA_PATH = "synthetic_turnover_data.csv"
+
+
+def model_stages(search: str = "random", bayesian: str = None) -> dict:
+    """Pipeline stages of a /train request: stage -> training kwargs."""
+    stages = {
+        "one_year": {"save_model": True, "search": search},
+        "five_year": {"save_model": True, "search": search},
+    }
+    if bayesian:
+        stages["bayesian"] = {"method": bayesian}
+    return stages
+
+
+def train_models(manager, stages: dict):
+    """Regenerates the data, trains `stages` concurrently and rescores the population and cohorts."""
+    from backend.app.services.cohort_cube import cohort_cube
+    from backend.app.services.population_scores import population_scores
+    from backend.app.services.prediction_service import resolve_data_path
+
+    manager.update_progress(5, "Generating synthetic data...")
+    # Staged like the model artifacts: the API keeps serving the old data
+    # until the models trained on the new data are published with it
+    staged_data = DATA_PATH + STAGED_SUFFIX
+    df = data_generator.generate_synthetic_data(n_employees=1500)
+    df.to_csv(staged_data, index=False)
+
+    # Train models
+    manager.update_progress(10, "Training models...")
+    stage_progress = dict.fromkeys(stages, 0)
+
+    def stage_callback(stage, p, msg):
+        # Scale 10-95% by the mean progress of the stages
+        stage_progress[stage] = p
+        manager.update_stage(stage, p, msg)
+        scaled = 10 + int(sum(stage_progress.values()) / len(stage_progress) * 0.85)
+        manager.update_progress(scaled, f"{STAGE_LABELS[stage]}: {msg}")
+
+    try:
+        training_pipeline.run_pipeline(stages, data_path=staged_data, progress_callback=stage_callback,
+                                       publish_with=[DATA_PATH])
+    finally:
+        # Already moved into place on success; a failed run drops it
+        if os.path.exists(staged_data):
+            os.remove(staged_data)
+
+    # Both tables are persisted, so the API reads them instead of rescoring
+    manager.update_progress(99, "Scoring employees and cohorts...")
+    population_scores.refresh(resolve_data_path())
+    cohort_cube.refresh(resolve_data_path())
+
+
+def train_bayesian(manager, method: str = "nuts", warm_start: bool = False):
+    """Trains the Bayesian model."""
+    from backend.ml import bayesian_turnover_model
+
+    bayesian_turnover_model.train_bayesian_model(
+        progress_callback=manager.update_progress,
+        method=method,
+        warm_start=warm_start
+    )
@@ -9,13 +9,18 @@ class TrainingManager:
             cls._instance.progress = 0
             cls._instance.message = "Idle"
             cls._instance.status = "idle" # idle, running, success, error
+            cls._instance.stages = {} # stage -> {"progress", "message"}
         return cls._instance
 
-    def start_training(self):
+    def start_training(self, stages=()):
         self.is_training = True
         self.progress = 0
         self.message = "Starting..."
         self.status = "running"
+        self.stages = {stage: {"progress": 0, "message": "Waiting..."} for stage in stages}
+
+    def update_stage(self, stage: str, progress: int, message: str):
+        self.stages[stage] = {"progress": progress, "message": message}
 
     def update_progress(self, progress: int, message: str):
         self.progress = progress
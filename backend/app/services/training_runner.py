@@ -0,0 +1,130 @@
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+
+from backend.ml.training_executor import isolate_process
+
+logger = logging.getLogger(__name__)
+
+# Manager methods a job may call through its proxy
+_RELAYED = ("update_progress", "update_stage")
+# Seconds between liveness checks of the job process
+POLL_INTERVAL = 1.0
+
+
+class TrainingRunner:
+    """
+    Runs one training job at a time in a separate process.
+
+    The job process is pinned and deprioritized (see isolate_process), so
+    XGBoost fits, scoring and MCMC never compete with request
+    handling for the API's GIL, and a crash in native code only loses the
+    job. Progress calls made by the job are streamed back over a queue and
+    applied to `manager` by a relay thread, which also reports completion
+    or failure. `cancel` stops the job together with any workers it started.
+    """
+
+    def __init__(self, manager):
+        self.manager = manager
+        self._lock = threading.Lock()
+        self._process = None
+        self._cancelled = False
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def start(self, job, kwargs: dict = None, on_success=None):
+        """
+        Starts `job(manager, **kwargs)` in a new process. `job` must be a
+        module-level function; `on_success` runs in this process after the
+        job finished and before the manager is marked complete.
+
+        Raises:
+            RuntimeError: If a job is already running
+        """
+        with self._lock:
+            if self.running:
+                raise RuntimeError("Training already in progress.")
+            ctx = multiprocessing.get_context("spawn")
+            events = ctx.Queue()
+            process = ctx.Process(target=_run_job, args=(job, kwargs or {}, events),
+                                  name=f"training-{job.__name__}")
+            process.start()
+            self._process = process
+            self._cancelled = False
+
+        threading.Thread(target=self._relay, args=(process, events, on_success), daemon=True).start()
+
+    def cancel(self) -> bool:
+        """Stops the running job. Returns False if there was none."""
+        with self._lock:
+            if not self.running:
+                return False
+            self._cancelled = True
+            try:
+                # The job leads its own process group (see _run_job)
+                os.killpg(self._process.pid, signal.SIGTERM)
+            except (AttributeError, OSError):
+                self._process.terminate()
+            return True
+
+    def _relay(self, process, events, on_success):
+        outcome = None
+        while outcome is None:
+            try:
+                method, args = events.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                # A clean exit flushes its last event first; only a kill loses it
+                if process.exitcode not in (None, 0):
+                    error = "Cancelled" if self._cancelled else f"Training process exited with code {process.exitcode}"
+                    outcome = ("error", error)
+                continue
+
+            if method in _RELAYED:
+                getattr(self.manager, method)(*args)
+            else:
+                outcome = (method, args)
+
+        process.join()
+        kind, detail = outcome
+        if kind == "done" and on_success:
+            try:
+                on_success()
+            except Exception as e:
+                logger.error("Post-training refresh failed", exc_info=True)
+                kind, detail = "error", str(e)
+
+        if kind == "done":
+            self.manager.complete_training()
+        else:
+            self.manager.fail_training(detail)
+
+
+class _ManagerProxy:
+    """Job-side stand-in for the training manager."""
+
+    def __init__(self, events):
+        self._events = events
+
+    def update_progress(self, progress: int, message: str):
+        self._events.put(("update_progress", (progress, message)))
+
+    def update_stage(self, stage: str, progress: int, message: str):
+        self._events.put(("update_stage", (stage, progress, message)))
+
+
+def _run_job(job, kwargs: dict, events):
+    """Job process entry point."""
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()
+    isolate_process()
+    try:
+        job(_ManagerProxy(events), **kwargs)
+        events.put(("done", None))
+    except Exception as e:
+        logger.error(f"Training job {job.__name__} failed", exc_info=True)
+        events.put(("error", str(e)))
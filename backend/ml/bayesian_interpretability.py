@@ -24,6 +24,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Seed of the PCG64 stream the simulated outcomes are drawn from, in row order
+REPLICATE_SEED = 42
+
 
 class BayesianInterpreter:
     """
@@ -141,67 +144,98 @@ class BayesianInterpreter:
         
         Returns:
             Dictionary with:
-            - y_rep: replicated binary outcomes (n_samples, n_obs)
-            - p_rep: predicted probabilities (n_samples, n_obs)
+            - y_rep: replicated binary outcomes, int8 array (n_samples, n_obs)
+            - p_rep: predicted probabilities, float32 array (n_samples, n_obs)
             - summary: statistics per observation
         """
-        posterior = self.model.posterior_samples
-        X_jax = jnp.array(X, dtype=jnp.float32)
-        
-        # Get posterior samples
-        intercept = posterior["intercept"]  # (n_posterior,)
-        coeffs = posterior["coeffs"]        # (n_posterior, n_features)
-        
-        n_posterior = len(intercept)
         n_obs = X.shape[0]
+        y_rep, p_rep = self._replicate(X, n_samples)  # (n_use, n_obs)
+        n_use = len(y_rep)
         
-        # Sample from posterior (use first n_samples posterior draws)
-        n_use = min(n_samples, n_posterior)
-        
-        y_rep = []
-        p_rep = []
-        
-        # Use numpy random for simulation (avoid JAX version issues)
-        rng = np.random.RandomState(42)
-        
-        for i in range(n_use):
-            # Compute probabilities for this posterior draw  
-            logits = np.asarray(intercept[i]) + np.dot(np.asarray(X_jax), np.asarray(coeffs[i]))
-            # Manual sigmoid: 1 / (1 + exp(-x))
-            probs = 1.0 / (1.0 + np.exp(-logits))
-            
-            # Generate binary outcomes using numpy
-            y_sim = rng.binomial(1, probs)
-            
-            p_rep.append(probs)
-            y_rep.append(y_sim)
-        
-        y_rep = np.array(y_rep)  # (n_samples, n_obs)
-        p_rep = np.array(p_rep)  # (n_samples, n_obs)
-        
-        # Summary per observation
-        summary = []
-        for j in range(n_obs):
-            summary.append({
+        # Summary per observation, one column-wise reduction per statistic
+        summary = [
+            {
                 "obs_index": j,
-                "prob_mean": float(np.mean(p_rep[:, j])),
-                "prob_std": float(np.std(p_rep[:, j])),
-                "expected_turnover_rate": float(np.mean(y_rep[:, j]))
-            })
-        
+                "prob_mean": prob_mean,
+                "prob_std": prob_std,
+                "expected_turnover_rate": rate
+            }
+            for j, (prob_mean, prob_std, rate) in enumerate(zip(
+                p_rep.mean(axis=0).tolist(),
+                p_rep.std(axis=0).tolist(),
+                y_rep.mean(axis=0).tolist()
+            ))
+        ]
+        
+        # Raw replicates stay arrays; callers choose how to serialize them
         return {
-            "y_rep": y_rep.tolist(),
-            "p_rep": p_rep.tolist(),
+            "y_rep": y_rep.astype(np.int8),
+            "p_rep": p_rep.astype(np.float32),
             "summary": summary,
             "n_replications": n_use,
             "n_observations": n_obs
         }
     
+    def replicate_window(self,
+                         X: np.ndarray,
+                         n_samples: int = 100,
+                         offset: int = 0,
+                         limit: int = 20) -> Dict:
+        """
+        Replicates [offset, offset + limit) of generate_posterior_predictive,
+        simulated for those posterior draws only. The window reads the seeded
+        stream from the position of its first row, so a page holds the same
+        rows as the full matrix.
+        
+        Returns:
+            Dictionary with y_rep (int8) and p_rep (float32) for the window,
+            the sizes of the full output and next_offset (None on the last page)
+        """
+        n_use = min(n_samples, len(self.model.posterior_samples["intercept"]))
+        end = min(offset + limit, n_use)
+        y_rep, p_rep = self._replicate(X, end, start=min(offset, end))
+        
+        return {
+            "y_rep": y_rep.astype(np.int8),
+            "p_rep": p_rep.astype(np.float32),
+            "n_replications": n_use,
+            "n_observations": X.shape[0],
+            "offset": offset,
+            "next_offset": end if end < n_use else None
+        }
+    
+    def _replicate(self, X: np.ndarray, n_samples: int, start: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Replicated outcomes and probabilities (n_use - start, n_obs) for
+        posterior draws [start, n_use), n_use = min(n_samples, n_posterior),
+        as one matrix product and one (n_use - start, n_obs) uniform draw.
+        """
+        posterior = self.model.posterior_samples
+        n_use = min(n_samples, len(posterior["intercept"]))
+        
+        intercept = np.asarray(posterior["intercept"][start:n_use], dtype=np.float64)
+        coeffs = np.asarray(posterior["coeffs"][start:n_use], dtype=np.float64)
+        X = np.asarray(X, dtype=np.float64)
+        
+        logits = intercept[:, None] + coeffs @ X.T
+        # Manual sigmoid: 1 / (1 + exp(-x))
+        p_rep = 1.0 / (1.0 + np.exp(-logits))
+        
+        # Use numpy random for simulation (avoid JAX version issues). Each
+        # double consumes one PCG64 output, so skipping start * n_obs outputs
+        # lands on the first uniform of row `start`
+        bit_generator = np.random.PCG64(REPLICATE_SEED)
+        bit_generator.advance(start * X.shape[0])
+        uniforms = np.random.Generator(bit_generator).random(p_rep.shape)
+        y_rep = (uniforms < p_rep).astype(int)
+        
+        return y_rep, p_rep
+    
     # =========================================================================
     # (c) UNCERTAINTY QUANTIFICATION - How certain is the model?
     # =========================================================================
     
-    def compute_uncertainty_decomposition(self, X: np.ndarray) -> Dict:
+    def compute_uncertainty_decomposition(self, X: np.ndarray, output: str = "records") -> Dict:
         """
         Decompose prediction uncertainty into components.
         
@@ -216,69 +250,73 @@ class BayesianInterpreter:
         
         Args:
             X: Feature matrix (n_obs, n_features)
+            output: "records" (one dict per observation), "arrays" (one
+                (n_obs,) array per metric) or "aggregate" (aggregate only)
         
         Returns:
             Dictionary with uncertainty metrics per observation
         """
+        if output not in ("records", "arrays", "aggregate"):
+            raise ValueError(f"Unknown output: {output}")
+        
         posterior = self.model.posterior_samples
         X_jax = jnp.array(X, dtype=jnp.float32)
         
         intercept = posterior["intercept"]
         coeffs = posterior["coeffs"]
         
-        n_obs = X.shape[0]
-        
         # Compute predictions for all posterior samples
         logits = intercept[:, None] + jnp.einsum('pf,of->po', coeffs, X_jax)
         probs = jax.nn.sigmoid(logits)  # (n_posterior, n_obs)
         
-        probs_np = np.array(probs)
-        
-        results = []
-        for j in range(n_obs):
-            p = probs_np[:, j]
-            
-            # Total uncertainty: variance in predicted probability
-            total_var = float(np.var(p))
-            
-            # Mean probability
-            p_mean = float(np.mean(p))
-            
-            # Aleatoric: expected Bernoulli variance under posterior
-            # E[p*(1-p)] where expectation is over posterior
-            aleatoric = float(np.mean(p * (1 - p)))
-            
-            # Epistemic: variance of expected value
-            # Var[E[Y|θ]] = Var[p]
-            epistemic = total_var
-            
-            # Entropy of predictive distribution
-            # For each posterior sample, entropy of Bernoulli(p)
-            eps = 1e-10
-            entropy = float(-np.mean(p * np.log(p + eps) + (1 - p) * np.log(1 - p + eps)))
-            
-            # Confidence score (inverse of entropy, scaled)
-            confidence = float(1.0 - entropy / np.log(2))  # Normalized 0-1
-            
-            results.append({
-                "obs_index": j,
-                "mean_probability": p_mean,
-                "total_uncertainty": total_var + aleatoric,
-                "epistemic_uncertainty": epistemic,
-                "aleatoric_uncertainty": aleatoric,
-                "entropy": entropy,
-                "confidence": confidence,
-                "uncertainty_ratio": epistemic / (aleatoric + eps)  # How much is reducible?
-            })
+        # Every metric is a reduction over the posterior axis, for all
+        # observations at once
+        p = np.asarray(probs)
+        eps = 1e-10
+        
+        # Total uncertainty: variance in predicted probability
+        # Epistemic: variance of expected value, Var[E[Y|θ]] = Var[p]
+        epistemic = p.var(axis=0)
+        
+        # Aleatoric: expected Bernoulli variance under posterior
+        # E[p*(1-p)] where expectation is over posterior
+        aleatoric = (p * (1 - p)).mean(axis=0)
+        
+        # Entropy of predictive distribution
+        # For each posterior sample, entropy of Bernoulli(p)
+        entropy = -(p * np.log(p + eps) + (1 - p) * np.log(1 - p + eps)).mean(axis=0)
+        
+        # Confidence score (inverse of entropy, scaled)
+        confidence = 1.0 - entropy / np.log(2)  # Normalized 0-1
+        
+        metrics = {
+            "mean_probability": p.mean(axis=0),
+            "total_uncertainty": epistemic + aleatoric,
+            "epistemic_uncertainty": epistemic,
+            "aleatoric_uncertainty": aleatoric,
+            "entropy": entropy,
+            "confidence": confidence,
+            "uncertainty_ratio": epistemic / (aleatoric + eps)  # How much is reducible?
+        }
         
-        return {
-            "observations": results,
+        result = {
             "aggregate": {
-                "mean_epistemic": float(np.mean([r["epistemic_uncertainty"] for r in results])),
-                "mean_aleatoric": float(np.mean([r["aleatoric_uncertainty"] for r in results])),
-                "mean_confidence": float(np.mean([r["confidence"] for r in results]))
+                "mean_epistemic": float(epistemic.mean()),
+                "mean_aleatoric": float(aleatoric.mean()),
+                "mean_confidence": float(confidence.mean())
             }
         }
+        
+        if output == "arrays":
+            result["observations"] = metrics
+        elif output == "records":
+            columns = {name: values.tolist() for name, values in metrics.items()}
+            result["observations"] = [
+                {"obs_index": j, **{name: values[j] for name, values in columns.items()}}
+                for j in range(p.shape[1])
+            ]
+        
+        return result
     
     # =========================================================================
     # POSTERIOR PREDICTIVE CHECKING (PPC) - Model Validation
@@ -310,38 +348,29 @@ class BayesianInterpreter:
         logger.info(f"Running PPC with {n_replications} replications...")
         
         # Generate replicated data
-        pp_result = self.generate_posterior_predictive(X, n_samples=n_replications)
-        y_rep = np.array(pp_result["y_rep"])  # (n_rep, n_obs)
-        
-        # Compute test statistics for observed data
-        observed_stats = self._compute_discrepancy_measures(y_observed)
+        y_rep, _ = self._replicate(X, n_replications)  # (n_rep, n_obs)
         
-        # Compute test statistics for each replication
-        replicated_stats = []
-        for i in range(n_replications):
-            rep_stats = self._compute_discrepancy_measures(y_rep[i])
-            replicated_stats.append(rep_stats)
+        # Test statistics for the observed data and every replication at once
+        observed_stats = self._compute_discrepancy_measures(np.ravel(y_observed)[None, :])
+        replicated_stats = self._compute_discrepancy_measures(y_rep)
         
         # Compute posterior predictive p-values
         ppc_p_values = {}
         discrepancy_results = {}
         
-        for stat_name in observed_stats.keys():
-            observed_value = observed_stats[stat_name]
-            replicated_values = [rs[stat_name] for rs in replicated_stats]
+        for stat_name, replicated_values in replicated_stats.items():
+            observed_value = observed_stats[stat_name][0]
             
             # p_ppc = P(T(y_rep) >= T(y_obs))
-            p_value = np.mean([rv >= observed_value for rv in replicated_values])
+            p_value = np.mean(replicated_values >= observed_value)
+            lower, upper = np.percentile(replicated_values, [2.5, 97.5])
             
             ppc_p_values[stat_name] = float(p_value)
             discrepancy_results[stat_name] = {
                 "observed": float(observed_value),
                 "replicated_mean": float(np.mean(replicated_values)),
                 "replicated_std": float(np.std(replicated_values)),
-                "replicated_ci_95": [
-                    float(np.percentile(replicated_values, 2.5)),
-                    float(np.percentile(replicated_values, 97.5))
-                ],
+                "replicated_ci_95": [float(lower), float(upper)],
                 "p_value": float(p_value)
             }
         
@@ -352,7 +381,7 @@ class BayesianInterpreter:
             "discrepancy_measures": discrepancy_results,
             "ppc_p_values": ppc_p_values,
             "model_check_summary": model_check,
-            "n_replications": n_replications,
+            "n_replications": len(y_rep),
             "n_observations": len(y_observed)
         }
     
@@ -364,39 +393,28 @@ class BayesianInterpreter:
         - Mean: overall turnover rate
         - Max consecutive: clustering of turnovers
         - Proportion extremes: tail behavior
-        """
-        y = np.array(y).flatten()
-        n = len(y)
         
-        # T1: Mean (turnover rate)
-        t_mean = np.mean(y)
-        
-        # T2: Variance
-        t_var = np.var(y)
-        
-        # T3: Sum (total turnovers)
-        t_sum = np.sum(y)
+        Args:
+            y: Binary outcomes, one dataset per row (n_datasets, n_obs)
         
-        # T4: Proportion of zeros (retention rate)
-        t_zeros = np.mean(y == 0)
+        Returns:
+            Dictionary of (n_datasets,) arrays, one per statistic
+        """
+        y = np.asarray(y)
         
-        # T5: Max run of ones (consecutive turnovers)
-        # Useful for detecting clustering
-        t_max_run = 0
-        current_run = 0
-        for val in y:
-            if val == 1:
-                current_run += 1
-                t_max_run = max(t_max_run, current_run)
-            else:
-                current_run = 0
+        # T5: Max run of ones (consecutive turnovers), useful for detecting
+        # clustering. Run length at j = ones so far minus ones up to the
+        # last zero at or before j.
+        ones_so_far = np.cumsum(y, axis=1)
+        ones_at_last_zero = np.maximum.accumulate(np.where(y == 0, ones_so_far, 0), axis=1)
+        run_length = ones_so_far - ones_at_last_zero
         
         return {
-            "mean": t_mean,
-            "variance": t_var,
-            "sum": t_sum,
-            "retention_rate": t_zeros,
-            "max_consecutive_turnovers": t_max_run
+            "mean": np.mean(y, axis=1),                    # T1: turnover rate
+            "variance": np.var(y, axis=1),                 # T2: variance
+            "sum": np.sum(y, axis=1),                      # T3: total turnovers
+            "retention_rate": np.mean(y == 0, axis=1),     # T4: proportion of zeros
+            "max_consecutive_turnovers": run_length.max(axis=1, initial=0)
         }
     
     def _interpret_ppc_results(self, p_values: Dict) -> Dict:
@@ -466,9 +484,6 @@ def run_model_diagnostics(data_path: str = None) -> Dict:
     Returns comprehensive interpretability report.
     """
     from .bayesian_turnover_model import load_bayesian_model
-    from .preprocessing import load_and_preprocess_one_year
-    import os
-    import joblib
     
     # Load model and interpreter
     model = load_bayesian_model()
@@ -477,14 +492,7 @@ def run_model_diagnostics(data_path: str = None) -> Dict:
     
     interpreter = BayesianInterpreter(model, model.feature_names)
     
-    # Load preprocessor for test data
-    preprocessor_path = os.path.join(os.path.dirname(__file__), "bayesian_preprocessor.pkl")
-    if os.path.exists(preprocessor_path):
-        artifact = joblib.load(preprocessor_path)
-        # Note: We'd need stored test data for full PPC
-        # For now, return interpretability without PPC
-    
-    # Get parameter beliefs
+    # Get parameter beliefs (full PPC would need the stored test data)
     param_beliefs = interpreter.get_parameter_beliefs()
     
     return {
@@ -1,28 +1,65 @@
 """
 Bayesian Turnover Model - Standalone probabilistic prediction system.
 
-Uses NumPyro with NUTS (No-U-Turn Sampler) for full MCMC inference.
+Uses NumPyro with NUTS (No-U-Turn Sampler) for full MCMC inference, or SVI
+for a fast variational approximation.
 This module operates independently from the XGBoost system.
 """
 
 import numpyro
 import numpyro.distributions as dist
-from numpyro.infer import MCMC, NUTS, Predictive
+from numpyro.infer import MCMC, NUTS, SVI, Predictive, Trace_ELBO, init_to_value
+from numpyro.infer.autoguide import AutoLowRankMultivariateNormal
+from numpyro import optim
+from numpyro.diagnostics import effective_sample_size, split_gelman_rubin
 from jax import random
 import jax.numpy as jnp
 import jax
 import polars as pl
+import pandas as pd
 import numpy as np
 import time
 import logging
+from functools import partial
 import os
 import joblib
+from backend.ml.model_registry import model_registry, atomic_dump
+from backend.ml.training_executor import cpu_budget
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 # Model paths
 BAYESIAN_MODEL_PATH = os.path.join(os.path.dirname(__file__), "bayesian_model.pkl")
+BAYESIAN_PREPROCESSOR_PATH = os.path.join(os.path.dirname(__file__), "bayesian_preprocessor.pkl")
+
+# Credible interval -> (lower, upper) posterior quantiles
+CREDIBLE_INTERVALS = {
+    "ci_50": (0.25, 0.75),
+    "ci_80": (0.10, 0.90),
+    "ci_95": (0.025, 0.975),
+}
+# Posterior draws returned per prediction (API size limit)
+N_RETURNED_SAMPLES = 50
+# Observations scored per kernel call; bounds memory at draws x chunk
+PREDICT_CHUNK_SIZE = 2048
+_QUANTILE_LEVELS = tuple(sorted({q for bounds in CREDIBLE_INTERVALS.values() for q in bounds}))
+
+# NUTS chains; run in parallel when the host exposes one XLA device per chain
+NUTS_NUM_CHAINS = int(os.getenv("BAYESIAN_NUM_CHAINS", "4"))
+# Latent sites kept in the posterior and checked for convergence; the per-row
+# "prob" deterministic (draws x training rows) is dropped after fitting
+POSTERIOR_SITES = ("intercept", "tau", "coeffs")
+R_HAT_THRESHOLD = 1.01
+
+# NUTS warmup for refits started from the previous posterior and adaptation
+WARM_START_WARMUP = 100
+
+# SVI (variational) fitting: Adam steps on the ELBO of a low-rank Gaussian guide
+SVI_NUM_STEPS = 3000
+SVI_LEARNING_RATE = 0.02
+# Inference methods accepted by train_bayesian_model
+INFERENCE_METHODS = ("nuts", "svi")
 
 
 def bayesian_logistic_model(X, y=None):
@@ -60,12 +97,97 @@ def bayesian_logistic_model(X, y=None):
         numpyro.sample("y", dist.Bernoulli(logits=logits), obs=y)
 
 
+@jax.jit
+def _posterior_chunk(intercept, coeffs, X_chunk):
+    """
+    Posterior probabilities (draws x chunk) for one chunk of observations,
+    with their per-observation mean and std. Compiled once per chunk shape.
+    Only mean and std are reduced here: the full chunk goes back to the host
+    for the credible-interval quantiles (see predict).
+    """
+    logits = intercept[:, None] + jnp.einsum('pf,df->pd', coeffs, X_chunk)
+    # Manual sigmoid to avoid JAX/NumPy version compatibility issues
+    probs = 1.0 / (1.0 + jnp.exp(-logits))
+    return probs, probs.mean(axis=0), probs.std(axis=0)
+
+
+@partial(jax.jit, static_argnames="with_counts")
+def _aggregate_chunk(intercept, coeffs, X_chunk, valid, key, with_counts):
+    """
+    Per-draw sums over one chunk: expected turnovers (sum of probabilities)
+    and, with `with_counts`, one Bernoulli realization of the turnover count
+    per draw (a Poisson-binomial draw). Padding rows are masked out by `valid`.
+    """
+    logits = intercept[:, None] + jnp.einsum('pf,df->pd', coeffs, X_chunk)
+    probs = valid / (1.0 + jnp.exp(-logits))
+    counts = None
+    if with_counts:
+        counts = (random.uniform(key, probs.shape) < probs).sum(axis=1)
+    return probs.sum(axis=1), counts
+
+
+def _convergence_diagnostics(samples_by_chain: dict, diverging) -> dict:
+    """
+    Split R-hat and effective sample size per parameter, from samples
+    grouped as (chains, draws, ...), plus the number of divergent transitions.
+    """
+    sites = {}
+    for name in POSTERIOR_SITES:
+        value = np.asarray(samples_by_chain[name])
+        sites[name] = {
+            "r_hat": np.asarray(split_gelman_rubin(value)).tolist(),
+            "ess": np.asarray(effective_sample_size(value)).tolist(),
+        }
+    
+    r_hats = np.concatenate([np.ravel(site["r_hat"]) for site in sites.values()])
+    ess = np.concatenate([np.ravel(site["ess"]) for site in sites.values()])
+    max_r_hat = float(np.nanmax(r_hats))
+    return {
+        "max_r_hat": max_r_hat,
+        "min_ess": float(np.nanmin(ess)),
+        "num_divergences": int(np.sum(diverging)),
+        "converged": bool(max_r_hat < R_HAT_THRESHOLD),
+        "sites": sites,
+    }
+
+
+def _adaptation_state(adapt_state) -> dict:
+    """
+    Step size and diagonal inverse mass matrix adapted by NUTS, averaged
+    over chains, as plain arrays that can be persisted with the posterior.
+    """
+    return {
+        "step_size": float(np.mean(np.asarray(adapt_state.step_size))),
+        "inverse_mass_matrix": {
+            sites: np.asarray(matrix).reshape(-1, np.shape(matrix)[-1]).mean(axis=0)
+            for sites, matrix in adapt_state.inverse_mass_matrix.items()
+        },
+    }
+
+
+def _chunk_size(n_obs: int) -> int:
+    # Power-of-two buckets keep the number of compiled shapes small
+    return min(PREDICT_CHUNK_SIZE, 1 << max(n_obs - 1, 0).bit_length())
+
+
+def _iter_chunks(X: np.ndarray):
+    """Yields (chunk, n_valid) over the rows of X, the last chunk zero-padded."""
+    chunk = _chunk_size(X.shape[0])
+    for start in range(0, X.shape[0], chunk):
+        X_chunk = X[start:start + chunk]
+        n_valid = X_chunk.shape[0]
+        if n_valid < chunk:
+            X_chunk = np.pad(X_chunk, ((0, chunk - n_valid), (0, 0)))
+        yield X_chunk, n_valid
+
+
 class BayesianTurnoverModel:
     """
     Standalone Bayesian logistic regression for turnover prediction.
     
-    Inference method:
+    Inference methods:
         - NUTS: Full MCMC sampling with optimized parameters
+        - SVI: Low-rank Gaussian variational approximation (fast retrains)
     
     Output:
         - Posterior probability distribution
@@ -78,10 +200,14 @@ class BayesianTurnoverModel:
         self.n_features = len(self.feature_names)
         self.is_fitted = False
         self.posterior_samples = None
+        self.adaptation = None
         self.fit_info = {}
+        # (intercept, coeffs) -> their JAX copies, see _device_posterior
+        self._device_sites = None
     
     def fit_nuts(self, X: np.ndarray, y: np.ndarray, 
                  n_warmup: int = 500, n_samples: int = 1000,
+                 num_chains: int = None, warm_start: dict = None,
                  progress_callback=None) -> dict:
         """
         Fit model using NUTS (full MCMC).
@@ -89,12 +215,16 @@ class BayesianTurnoverModel:
         Args:
             X: Feature matrix (n_samples, n_features)
             y: Binary target (0/1)
-            n_warmup: Number of warmup samples
-            n_samples: Number of posterior samples
+            n_warmup: Number of warmup samples per chain
+            n_samples: Number of posterior samples, split across chains
+            num_chains: Number of chains (default NUTS_NUM_CHAINS)
+            warm_start: Optional warm_start_state() of a previous fit; chains
+                start at its posterior medians with its adapted step size and
+                mass matrix, so a short n_warmup suffices
             progress_callback: Optional callback(progress, message)
         
         Returns:
-            Dictionary with fitting metadata
+            Dictionary with fitting metadata and convergence diagnostics
         """
         start_time = time.time()
         logger.info("Fitting Bayesian model with NUTS...")
@@ -106,38 +236,71 @@ class BayesianTurnoverModel:
         
         self.n_features = X.shape[1]
         
-        kernel = NUTS(bayesian_logistic_model)
+        # One chain per CPU device when available, else vectorized in one process
+        num_chains = max(1, num_chains or NUTS_NUM_CHAINS)
+        if num_chains == 1:
+            chain_method = "sequential"
+        elif jax.local_device_count() >= num_chains:
+            chain_method = "parallel"
+        else:
+            chain_method = "vectorized"
+        samples_per_chain = -(-n_samples // num_chains)
+        
+        if warm_start is not None:
+            # Keep the previous mass matrix; only re-tune the step size
+            kernel = NUTS(
+                bayesian_logistic_model,
+                init_strategy=init_to_value(values=warm_start["init_values"]),
+                step_size=warm_start["step_size"],
+                inverse_mass_matrix=warm_start["inverse_mass_matrix"],
+                adapt_mass_matrix=False
+            )
+        else:
+            kernel = NUTS(bayesian_logistic_model)
         mcmc = MCMC(
             kernel, 
             num_warmup=n_warmup, 
-            num_samples=n_samples,
+            num_samples=samples_per_chain,
+            num_chains=num_chains,
+            chain_method=chain_method,
             progress_bar=True
         )
         
         rng_key = random.PRNGKey(42)
         
         if progress_callback:
-            progress_callback(30, "Running MCMC sampling...")
+            progress_callback(30, f"Running MCMC sampling ({num_chains} chains, {chain_method})...")
         
-        mcmc.run(rng_key, X_jax, y_jax)
+        mcmc.run(rng_key, X_jax, y_jax, extra_fields=("diverging",))
         
         if progress_callback:
             progress_callback(80, "Extracting posterior samples...")
         
-        self.posterior_samples = mcmc.get_samples()
+        samples = mcmc.get_samples()
+        self.posterior_samples = {name: samples[name] for name in POSTERIOR_SITES}
+        self.adaptation = _adaptation_state(mcmc.last_state.adapt_state)
         self.is_fitted = True
         
         elapsed = time.time() - start_time
         
         # Get diagnostics
-        summary = mcmc.print_summary(prob=0.9)
+        diagnostics = _convergence_diagnostics(
+            mcmc.get_samples(group_by_chain=True),
+            mcmc.get_extra_fields()["diverging"]
+        )
+        if not diagnostics["converged"]:
+            logger.warning(f"NUTS may not have converged: max R-hat {diagnostics['max_r_hat']:.3f}")
         
         self.fit_info = {
             "method": "nuts",
             "time_seconds": elapsed,
-            "n_samples": n_samples,
+            "n_samples": samples_per_chain * num_chains,
             "n_warmup": n_warmup,
-            "n_features": self.n_features
+            "n_features": self.n_features,
+            "num_chains": num_chains,
+            "chain_method": chain_method,
+            "warm_started": warm_start is not None,
+            "diagnostics": diagnostics
         }
         
         logger.info(f"NUTS fitting completed in {elapsed:.2f}s")
@@ -146,6 +309,89 @@ class BayesianTurnoverModel:
         
         return self.fit_info
     
+    def fit_svi(self, X: np.ndarray, y: np.ndarray,
+                num_steps: int = SVI_NUM_STEPS, n_samples: int = 1000,
+                progress_callback=None) -> dict:
+        """
+        Fit model using SVI with a low-rank multivariate normal guide.
+        
+        Much faster than NUTS (seconds instead of minutes) at the cost of an
+        approximate posterior; intended for frequent retrains. Posterior draws
+        are stored in the same layout as fit_nuts.
+        
+        Args:
+            X: Feature matrix (n_samples, n_features)
+            y: Binary target (0/1)
+            num_steps: Number of optimization steps
+            n_samples: Number of posterior samples drawn from the guide
+            progress_callback: Optional callback(progress, message)
+        
+        Returns:
+            Dictionary with fitting metadata
+        """
+        start_time = time.time()
+        logger.info("Fitting Bayesian model with SVI...")
+        if progress_callback:
+            progress_callback(10, "Starting SVI inference...")
+        
+        X_jax = jnp.array(X, dtype=jnp.float32)
+        y_jax = jnp.array(y, dtype=jnp.float32)
+        
+        self.n_features = X.shape[1]
+        
+        guide = AutoLowRankMultivariateNormal(bayesian_logistic_model)
+        svi = SVI(bayesian_logistic_model, guide, optim.Adam(SVI_LEARNING_RATE), Trace_ELBO())
+        
+        rng_key, sample_key = random.split(random.PRNGKey(42))
+        
+        if progress_callback:
+            progress_callback(30, "Optimizing variational posterior...")
+        
+        result = svi.run(rng_key, num_steps, X_jax, y_jax, progress_bar=False)
+        
+        if progress_callback:
+            progress_callback(80, "Drawing posterior samples...")
+        
+        samples = guide.sample_posterior(sample_key, result.params, sample_shape=(n_samples,))
+        self.posterior_samples = {name: samples[name] for name in POSTERIOR_SITES}
+        self.adaptation = None
+        self.is_fitted = True
+        
+        elapsed = time.time() - start_time
+        
+        losses = np.asarray(result.losses)
+        self.fit_info = {
+            "method": "svi",
+            "guide": "low_rank_mvn",
+            "time_seconds": elapsed,
+            "n_samples": n_samples,
+            "num_steps": num_steps,
+            "n_features": self.n_features,
+            "final_loss": float(losses[-min(100, len(losses)):].mean())
+        }
+        
+        logger.info(f"SVI fitting completed in {elapsed:.2f}s")
+        if progress_callback:
+            progress_callback(100, "SVI fitting complete")
+        
+        return self.fit_info
+    
+    def warm_start_state(self) -> dict:
+        """
+        Starting point for a warm-started fit_nuts: posterior medians of the
+        latent sites plus the stored NUTS adaptation. None when the model was
+        not fitted with NUTS (or predates persisted adaptation).
+        """
+        if not self.is_fitted or not self.adaptation:
+            return None
+        return {
+            "init_values": {
+                name: np.median(np.asarray(self.posterior_samples[name]), axis=0)
+                for name in POSTERIOR_SITES
+            },
+            **self.adaptation
+        }
+    
     def predict(self, X: np.ndarray) -> dict:
         """
         Predict turnover probability with uncertainty quantification.
@@ -165,26 +411,77 @@ class BayesianTurnoverModel:
             raise RuntimeError("Model not fitted. Call fit_nuts() first.")
         
         start_time = time.time()
-        X_jax = jnp.array(X, dtype=jnp.float32)
+        X = np.asarray(X, dtype=np.float32)
         
         # Get posterior parameters
-        intercept = self.posterior_samples["intercept"]  # (n_posterior,)
-        coeffs = self.posterior_samples["coeffs"]        # (n_posterior, n_features)
+        intercept, coeffs = self._device_posterior()  # (n_posterior,), (n_posterior, n_features)
+        
+        # Stream the population through the compiled kernel in fixed-size
+        # chunks (the last one zero-padded); only per-observation stats and
+        # the returned draws outlive each chunk
+        parts = []
+        for X_chunk, n_valid in _iter_chunks(X):
+            probs, mean, std = (np.asarray(a)[..., :n_valid] for a in _posterior_chunk(intercept, coeffs, X_chunk))
+            # Quantiles on host: NumPy's partition beats an XLA sort on CPU
+            # (jnp.quantile in the kernel was ~14x slower for 4000 draws)
+            quantiles = np.quantile(probs, _QUANTILE_LEVELS, axis=0)
+            parts.append([mean, std, quantiles, probs[:N_RETURNED_SAMPLES]])
+        
+        if parts:
+            mean, std, quantiles, samples = (np.concatenate(p, axis=-1) for p in zip(*parts))
+        else:
+            n_draws = min(len(intercept), N_RETURNED_SAMPLES)
+            mean, std = np.zeros(0), np.zeros(0)
+            quantiles, samples = np.zeros((len(_QUANTILE_LEVELS), 0)), np.zeros((n_draws, 0))
         
-        # Compute predictions for all posterior samples
-        # Shape: (n_posterior, n_data_points)
-        logits = intercept[:, None] + jnp.einsum('pf,df->pd', coeffs, X_jax)
+        summary = self._summary_from_stats(mean, std, dict(zip(_QUANTILE_LEVELS, quantiles)))
         
-        # Manual sigmoid to avoid JAX/NumPy version compatibility issues
-        # sigmoid(x) = 1 / (1 + exp(-x))
-        probs = 1.0 / (1.0 + jnp.exp(-logits))
+        elapsed = time.time() - start_time
         
-        # Convert to numpy explicitly 
-        probs = np.asarray(probs)
+        return self._format_summary(summary, samples, elapsed)
+    
+    def predict_totals(self, X: np.ndarray, with_counts: bool = True, seed: int = 0) -> dict:
+        """
+        Posterior distribution of the total turnover of a group of observations.
         
-        elapsed = time.time() - start_time
+        Args:
+            X: Feature matrix (n_samples, n_features)
+            with_counts: Also draw the realized turnover count per posterior draw
+            seed: PRNG seed for the count draws
+        
+        Returns:
+            Dictionary with one value per posterior draw:
+            - expected: Expected number of turnovers (sum of probabilities)
+            - counts: Simulated turnover counts, or None without `with_counts`
+        """
+        if not self.is_fitted:
+            raise RuntimeError("Model not fitted. Call fit_nuts() first.")
         
-        return self._format_predictions(probs, elapsed)
+        start_time = time.time()
+        X = np.asarray(X, dtype=np.float32)
+        intercept, coeffs = self._device_posterior()
+        
+        # Accumulate per-draw column sums chunk by chunk; the (draws x n_obs)
+        # probability matrix never exists in full
+        expected = np.zeros(len(intercept))
+        counts = np.zeros(len(intercept), dtype=np.int64) if with_counts else None
+        key = random.PRNGKey(seed)
+        for X_chunk, n_valid in _iter_chunks(X):
+            key, subkey = random.split(key)
+            valid = (np.arange(X_chunk.shape[0]) < n_valid).astype(np.float32)
+            chunk_expected, chunk_counts = _aggregate_chunk(
+                intercept, coeffs, X_chunk, valid, subkey, with_counts
+            )
+            expected += np.asarray(chunk_expected, dtype=np.float64)
+            if with_counts:
+                counts += np.asarray(chunk_counts)
+        
+        return {
+            "expected": expected,
+            "counts": counts,
+            "computation_time": time.time() - start_time,
+            "method": self.fit_info.get("method", "unknown")
+        }
     
     def predict_single(self, X: np.ndarray) -> dict:
         """
@@ -202,14 +499,45 @@ class BayesianTurnoverModel:
         result = self.predict(X)
         return result["predictions"][0] if result["predictions"] else None
     
-    def _format_predictions(self, probs: np.ndarray, elapsed: float) -> dict:
-        """Format posterior predictions into structured output."""
-        n_data_points = probs.shape[1]
-        predictions = []
-        
-        for i in range(n_data_points):
-            sample_probs = probs[:, i]
-            predictions.append(self._compute_uncertainty_metrics(sample_probs))
+    def _device_posterior(self) -> tuple:
+        """
+        intercept and coeffs as JAX arrays. The (memory-mapped) posterior is
+        copied once per fitted or loaded posterior, not on every prediction.
+        """
+        sites = (self.posterior_samples["intercept"], self.posterior_samples["coeffs"])
+        cached = self._device_sites
+        if cached is None or cached[0] is not sites[0] or cached[1] is not sites[1]:
+            cached = (*sites, jnp.asarray(sites[0]), jnp.asarray(sites[1]))
+            self._device_sites = cached
+        return cached[2], cached[3]
+    
+    def _format_summary(self, summary: dict, samples: np.ndarray, elapsed: float) -> dict:
+        """
+        Format per-observation summary arrays (see _summary_from_stats) and
+        the first returned draws (n_returned, n_obs) into structured output.
+        """
+        # One array -> list conversion per statistic, then zip per observation
+        means = summary["mean"].tolist()
+        stds = summary["std"].tolist()
+        bounds = {
+            name: (lower.tolist(), upper.tolist())
+            for name, (lower, upper) in summary["credible_intervals"].items()
+        }
+        risk_bands = summary["risk_band"].tolist()
+        samples = np.asarray(samples).T.tolist()  # Limit for API size
+        
+        predictions = [
+            {
+                "mean": means[i],
+                "std": stds[i],
+                "credible_intervals": {
+                    name: [lower[i], upper[i]] for name, (lower, upper) in bounds.items()
+                },
+                "samples": samples[i],
+                "risk_band": risk_bands[i]
+            }
+            for i in range(len(means))
+        ]
         
         return {
             "predictions": predictions,
@@ -217,76 +545,68 @@ class BayesianTurnoverModel:
             "method": self.fit_info.get("method", "unknown")
         }
     
-    def _compute_uncertainty_metrics(self, sample_probs: np.ndarray) -> dict:
-        """Compute uncertainty metrics from posterior samples."""
-        # Ensure numpy array
-        sample_probs = np.asarray(sample_probs)
-        
-        mean = float(np.mean(sample_probs))
-        std = float(np.std(sample_probs))
-        
-        ci = {
-            "ci_50": [
-                float(np.percentile(sample_probs, 25)),
-                float(np.percentile(sample_probs, 75))
-            ],
-            "ci_80": [
-                float(np.percentile(sample_probs, 10)),
-                float(np.percentile(sample_probs, 90))
-            ],
-            "ci_95": [
-                float(np.percentile(sample_probs, 2.5)),
-                float(np.percentile(sample_probs, 97.5))
-            ]
+    @staticmethod
+    def _summary_from_stats(mean: np.ndarray, std: np.ndarray, quantiles: dict) -> dict:
+        """Builds the summary dict from per-observation mean, std and {level: quantile}."""
+        credible_intervals = {
+            name: (quantiles[lower], quantiles[upper])
+            for name, (lower, upper) in CREDIBLE_INTERVALS.items()
         }
         
-        # Risk band classification
-        ci_width = ci["ci_95"][1] - ci["ci_95"][0]
-        if ci_width > 0.3:
-            risk_band = "Uncertain"
-        elif mean > 0.7:
-            risk_band = "High"
-        elif mean > 0.4:
-            risk_band = "Medium"
-        else:
-            risk_band = "Low"
+        # Risk band classification (first matching rule wins)
+        lower_95, upper_95 = credible_intervals["ci_95"]
+        risk_band = np.select(
+            [upper_95 - lower_95 > 0.3, mean > 0.7, mean > 0.4],
+            ["Uncertain", "High", "Medium"],
+            default="Low"
+        )
         
         return {
             "mean": mean,
             "std": std,
-            "credible_intervals": ci,
-            "samples": sample_probs.tolist()[:50],  # Limit for API size
+            "credible_intervals": credible_intervals,
             "risk_band": risk_band
         }
     
     def save(self, path: str = None):
-        """Save model to disk."""
+        """
+        Save model to disk. Posterior sites are stored as contiguous float32
+        arrays so `load` can memory-map them.
+        """
         path = path or BAYESIAN_MODEL_PATH
         artifact = {
             "feature_names": self.feature_names,
             "n_features": self.n_features,
             "posterior_samples": {
-                k: np.array(v) for k, v in self.posterior_samples.items()
+                k: np.ascontiguousarray(v, dtype=np.float32)
+                for k, v in self.posterior_samples.items() if k in POSTERIOR_SITES
             },
+            "adaptation": self.adaptation,
             "fit_info": self.fit_info,
             "is_fitted": self.is_fitted
         }
-        joblib.dump(artifact, path)
+        atomic_dump(artifact, path)
         logger.info(f"Bayesian model saved to {path}")
     
     @classmethod
     def load(cls, path: str = None) -> "BayesianTurnoverModel":
-        """Load model from disk."""
+        """
+        Load model from disk. Posterior arrays stay memory-mapped (read-only,
+        shared between worker processes); the first prediction copies the
+        sites it uses into JAX once (see _device_posterior).
+        """
         path = path or BAYESIAN_MODEL_PATH
         if not os.path.exists(path):
             return None
         
-        artifact = joblib.load(path)
+        artifact = joblib.load(path, mmap_mode="r")
         model = cls(feature_names=artifact["feature_names"])
         model.n_features = artifact["n_features"]
+        # Older artifacts also carry the "prob" site; it is never read
         model.posterior_samples = {
-            k: jnp.array(v) for k, v in artifact["posterior_samples"].items()
+            k: v for k, v in artifact["posterior_samples"].items() if k in POSTERIOR_SITES
         }
+        model.adaptation = artifact.get("adaptation")
         model.fit_info = artifact["fit_info"]
         model.is_fitted = artifact["is_fitted"]
         
@@ -294,63 +614,108 @@ class BayesianTurnoverModel:
         return model
 
 
+model_registry.register("bayesian", BAYESIAN_MODEL_PATH, BayesianTurnoverModel.load)
+model_registry.register("bayesian_preprocessor", BAYESIAN_PREPROCESSOR_PATH)
+
+
 # === Training and Prediction Functions ===
 
+def _request_chain_devices(num_chains: int):
+    """
+    Exposes one XLA host device per NUTS chain, within the CPU budget, so
+    fit_nuts can run the chains in parallel. Only takes effect before JAX
+    initializes its CPU backend, hence called first thing in NUTS training
+    rather than at import, where it would also apply to the serving process.
+    """
+    numpyro.set_host_device_count(max(1, min(num_chains, cpu_budget())))
+
+
 def train_bayesian_model(data_path: str = "synthetic_turnover_data.csv",
-                         progress_callback=None) -> BayesianTurnoverModel:
+                         progress_callback=None, method: str = "nuts",
+                         warm_start: bool = False) -> BayesianTurnoverModel:
     """
-    Train the Bayesian turnover model using NUTS inference.
+    Train the Bayesian turnover model.
     
     Args:
         data_path: Path to CSV data
         progress_callback: Optional callback(progress, message)
+        method: "nuts" (full MCMC) or "svi" (fast variational approximation)
+        warm_start: Refit NUTS from the saved posterior with a short warmup
+            (falls back to a full fit if there is no compatible NUTS model)
     
     Returns:
         Trained BayesianTurnoverModel
     """
-    from backend.ml.preprocessing import load_and_preprocess_one_year
+    from backend.ml import training_data
+    
+    if method not in INFERENCE_METHODS:
+        raise ValueError(f"Unknown inference method: {method}")
+    if method == "nuts":
+        _request_chain_devices(NUTS_NUM_CHAINS)
     
-    logger.info("Training Bayesian model with NUTS...")
+    logger.info(f"Training Bayesian model with {method.upper()}...")
     if progress_callback:
         progress_callback(5, "Loading and preprocessing data...")
     
-    # Load data with Polars, convert to pandas for sklearn preprocessing
-    df_polars = pl.read_csv(data_path)
-    df = df_polars.to_pandas()  # sklearn preprocessor requires pandas
+    # Same cached split the one-year model trains on
     X_train, X_test, y_train, y_test, feature_names, preprocessor = \
-        load_and_preprocess_one_year(df)
+        training_data.one_year_split(data_path)
     
     # Store test data for PPC
     y_test_np = np.array(y_test)
     
     if progress_callback:
-        progress_callback(15, "Data preprocessed, starting NUTS inference...")
+        progress_callback(15, f"Data preprocessed, starting {method.upper()} inference...")
     
     model = BayesianTurnoverModel(feature_names=feature_names)
     
-    # Use NUTS with optimized parameters for better convergence
-    model.fit_nuts(X_train, y_train, n_warmup=500, n_samples=1000, 
-                   progress_callback=progress_callback)
+    if method == "svi":
+        model.fit_svi(X_train, y_train, progress_callback=progress_callback)
+    else:
+        previous_state = None
+        if warm_start:
+            previous = load_bayesian_model()
+            if previous is not None and list(previous.feature_names) == list(feature_names):
+                previous_state = previous.warm_start_state()
+            if previous_state is None:
+                logger.info("No compatible NUTS posterior to warm start from; running full warmup")
+        
+        # Use NUTS with optimized parameters for better convergence
+        model.fit_nuts(X_train, y_train,
+                       n_warmup=WARM_START_WARMUP if previous_state else 500, n_samples=1000,
+                       warm_start=previous_state, progress_callback=progress_callback)
     
     # Save model
     model.save()
     
     # Save preprocessor and test data separately for prediction pipeline and PPC
-    preprocessor_path = os.path.join(os.path.dirname(__file__), "bayesian_preprocessor.pkl")
-    joblib.dump({
+    atomic_dump({
         "preprocessor": preprocessor,
         "feature_names": feature_names,
         "X_test": X_test,
         "y_test": y_test_np  # For Posterior Predictive Checking
-    }, preprocessor_path)
+    }, BAYESIAN_PREPROCESSOR_PATH)
+    
+    # Publish both artifacts to the resident registry
+    model_registry.reload("bayesian")
+    model_registry.reload("bayesian_preprocessor")
     
     logger.info("Bayesian model and preprocessor saved")
     return model
 
 
 def load_bayesian_model() -> BayesianTurnoverModel:
-    """Load the trained Bayesian model."""
-    return BayesianTurnoverModel.load()
+    """Load the trained Bayesian model (resident after the first call)."""
+    return model_registry.get("bayesian")
+
+
+def load_bayesian_preprocessor() -> dict:
+    """
+    Load the Bayesian preprocessor artifact (resident after the first call).
+    
+    Contains: preprocessor, feature_names, X_test, y_test.
+    """
+    return model_registry.get("bayesian_preprocessor")
 
 
 def predict_bayesian_individual(input_data: dict) -> dict:
@@ -371,11 +736,10 @@ def predict_bayesian_individual(input_data: dict) -> dict:
         raise FileNotFoundError("Bayesian model not trained. Please train first.")
     
     # Load preprocessor
-    preprocessor_path = os.path.join(os.path.dirname(__file__), "bayesian_preprocessor.pkl")
-    if not os.path.exists(preprocessor_path):
+    preprocessor_artifact = load_bayesian_preprocessor()
+    if preprocessor_artifact is None:
         raise FileNotFoundError("Preprocessor not found. Please retrain model.")
     
-    preprocessor_artifact = joblib.load(preprocessor_path)
     preprocessor = preprocessor_artifact["preprocessor"]
     feature_names = preprocessor_artifact["feature_names"]
     
@@ -390,12 +754,28 @@ def predict_bayesian_individual(input_data: dict) -> dict:
     return result
 
 
-def predict_bayesian_aggregate(cohort_data: list) -> dict:
+def _summarize_total(samples: np.ndarray) -> dict:
+    """Mean, std and credible intervals of a cohort total over posterior draws."""
+    samples = np.asarray(samples, dtype=float)
+    quantiles = dict(zip(_QUANTILE_LEVELS, np.quantile(samples, _QUANTILE_LEVELS).tolist()))
+    std = float(samples.std())
+    return {
+        "mean": float(samples.mean()),
+        "std": std,
+        "credible_intervals": {
+            name: [quantiles[lower], quantiles[upper]]
+            for name, (lower, upper) in CREDIBLE_INTERVALS.items()
+        },
+        "risk_band": "Uncertain" if std > 5 else "Normal"
+    }
+
+
+def predict_bayesian_aggregate(cohort_df: pd.DataFrame) -> dict:
     """
     Predict turnover for a cohort using Bayesian model.
     
     Args:
-        cohort_data: List of employee feature dictionaries
+        cohort_df: One row of employee features per cohort member
     
     Returns:
         Aggregate uncertainty metrics
@@ -406,54 +786,28 @@ def predict_bayesian_aggregate(cohort_data: list) -> dict:
     if model is None:
         raise FileNotFoundError("Bayesian model not trained. Please train first.")
     
-    preprocessor_path = os.path.join(os.path.dirname(__file__), "bayesian_preprocessor.pkl")
-    preprocessor_artifact = joblib.load(preprocessor_path)
+    preprocessor_artifact = load_bayesian_preprocessor()
+    if preprocessor_artifact is None:
+        raise FileNotFoundError("Preprocessor not found. Please retrain model.")
     preprocessor = preprocessor_artifact["preprocessor"]
     
-    # Preprocess cohort with Polars
-    df_cohort = pl.DataFrame(cohort_data)
-    df_engineered = feature_engineering(df_cohort.to_pandas())  # sklearn needs pandas
+    # Whole cohort transformed as one matrix
+    df_engineered = feature_engineering(cohort_df)
     X_processed = preprocessor.transform(df_engineered)
     
-    # Predict for all
-    result = model.predict(X_processed)
-    
-    # Aggregate: sum of predicted turnovers
-    predictions = result["predictions"]
-    
-    # Aggregate uncertainty by summing individual predictions
-    all_means = [p["mean"] for p in predictions]
-    predicted_count = sum(all_means)
-    
-    # For aggregate CI, we sum the samples across individuals
-    # This gives us the distribution of total turnover count
-    n_posterior = len(predictions[0]["samples"])
-    aggregate_samples = []
-    
-    for i in range(n_posterior):
-        total = sum(p["samples"][i] if i < len(p["samples"]) else p["mean"] 
-                    for p in predictions)
-        aggregate_samples.append(total)
-    
-    aggregate_samples = np.array(aggregate_samples)
+    # Per-draw cohort totals over all posterior draws
+    result = model.predict_totals(X_processed)
+    expected = result["expected"]
+    predicted_count = float(expected.mean())
     
     return {
         "predicted_turnover_count": predicted_count,
-        "total_in_cohort": len(cohort_data),
-        "cohort_risk_rate": (predicted_count / len(cohort_data)) * 100 if cohort_data else 0,
-        "uncertainty": {
-            "mean": float(np.mean(aggregate_samples)),
-            "std": float(np.std(aggregate_samples)),
-            "credible_intervals": {
-                "ci_50": [float(np.percentile(aggregate_samples, 25)),
-                         float(np.percentile(aggregate_samples, 75))],
-                "ci_80": [float(np.percentile(aggregate_samples, 10)),
-                         float(np.percentile(aggregate_samples, 90))],
-                "ci_95": [float(np.percentile(aggregate_samples, 2.5)),
-                         float(np.percentile(aggregate_samples, 97.5))]
-            },
-            "risk_band": "Uncertain" if np.std(aggregate_samples) > 5 else "Normal"
-        },
+        "total_in_cohort": len(cohort_df),
+        "cohort_risk_rate": (predicted_count / len(cohort_df)) * 100 if len(cohort_df) else 0,
+        "uncertainty": _summarize_total(expected),
+        # Posterior predictive count: adds Bernoulli noise on top of the
+        # uncertainty in the expected total
+        "count_uncertainty": _summarize_total(result["counts"]),
         "computation_time": result["computation_time"],
         "method": result["method"]
     }
@@ -5,7 +5,7 @@ import xgboost as xgb
 import joblib
 import os
 import logging
-from sklearn.model_selection import KFold, RandomizedSearchCV, train_test_split
+from sklearn.model_selection import KFold, train_test_split
 from sklearn.feature_selection import SelectFromModel
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 from sklearn.preprocessing import OneHotEncoder, StandardScaler
@@ -16,10 +16,11 @@ from sklearn.pipeline import Pipeline
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-from backend.ml.preprocessing import aggregate_data_for_5year
-from shapash import SmartExplainer
-from shapash.utils.load_smartpredictor import load_smartpredictor
-from backend.ml import shapash_config
+from backend.ml import training_data
+from backend.ml.model_registry import model_registry, atomic_dump
+from backend.ml.tree_explainer import attach_explainer
+from backend.ml.training_executor import cpu_budget, serving_threads
+from backend.ml.hyperparameter_search import run_search
 
 # Models are in backend/ml
 
@@ -33,9 +34,19 @@ if root_dir not in sys.path:
 
 DATA_PATH = os.path.join(root_dir, "synthetic_turnover_data.csv")
 MODEL_PATH = os.path.join(current_dir, "five_year_model.xgb")
+# Cohort prediction cube, rebuilt after training (see cohort_cube)
+CUBE_PATH = os.path.join(current_dir, "five_year_cube.joblib")
 
 
-def train_five_year_model(data_path="synthetic_turnover_data.csv", save_model=True, progress_callback=None):
+def _load_artifact(path):
+    return attach_explainer(joblib.load(path))
+
+
+model_registry.register("five_year", MODEL_PATH, _load_artifact)
+
+
+def train_five_year_model(data_path="synthetic_turnover_data.csv", save_model=True, progress_callback=None,
+                          search="random"):
     def update(p, msg):
         if progress_callback:
             progress_callback(p, msg)
@@ -44,8 +55,7 @@ def train_five_year_model(data_path="synthetic_turnover_data.csv", save_model=Tr
     update(0, "Starting Aggregated Model...")
 
     # 1. Load and Aggregate
-    df = pd.read_csv(data_path)
-    agg_df = aggregate_data_for_5year(df)
+    agg_df = training_data.five_year_frame(data_path)
     
     # Target: TurnoverCount
     y = agg_df['TurnoverCount']
@@ -99,7 +109,7 @@ def train_five_year_model(data_path="synthetic_turnover_data.csv", save_model=Tr
         n_estimators=100,
         reg_alpha=0.1,
         random_state=42,
-        n_jobs=1
+        n_jobs=cpu_budget()
     )
     selection_model.fit(X_processed, y)
     
@@ -135,22 +145,14 @@ def train_five_year_model(data_path="synthetic_turnover_data.csv", save_model=Tr
     
     cv = KFold(n_splits=5, shuffle=True, random_state=42)
     
-    search = RandomizedSearchCV(
-        estimator=xgb_reg,
-        param_distributions=params,
-        n_iter=20,
-        scoring='neg_mean_absolute_error',
-        cv=cv,
-        verbose=1,
-        random_state=42,
-        n_jobs=1
+    final_model, best_score, best_params = run_search(
+        xgb_reg, params, X_train, y_train, cv,
+        scoring='neg_mean_absolute_error', mode=search, n_iter=20
     )
     
-    search.fit(X_train, y_train)
+    logger.info(f"Best CV MAE: {-best_score:.4f}")
     
-    logger.info(f"Best CV MAE: {-search.best_score_:.4f}")
-    
-    final_model = search.best_estimator_
+    final_model = serving_threads(final_model)
     update(80, "Model optimized")
     
     # 5. Evaluation
@@ -188,130 +190,64 @@ def train_five_year_model(data_path="synthetic_turnover_data.csv", save_model=Tr
                 'r2_score': float(r2_test)
             }
         }
-        joblib.dump(artifact, MODEL_PATH)
+        atomic_dump(artifact, MODEL_PATH)
+        model_registry.reload("five_year")
         logger.info(f"Model saved to {MODEL_PATH}")
-
-        # --- Shapash Integration ---
-        logger.info("Creating Shapash SmartPredictor for 5-Year Model...")
-        try:
-            X_test_df = X_test
-
-            # Filter Postprocessing to only include existing columns
-            valid_postprocessing = {
-                k: v for k, v in shapash_config.POSTPROCESSING.items() 
-                if k in X_test_df.columns
-            }
-            
-            # Filter Features Groups to only include existing columns
-            valid_groups = {}
-            for g_name, g_cols in shapash_config.FEATURES_GROUPS.items():
-                existing_cols = [c for c in g_cols if c in X_test_df.columns]
-                if existing_cols:
-                    valid_groups[g_name] = existing_cols
-
-            # Filter features_dict
-            valid_features_dict = {col: shapash_config.FEATURES_DICT.get(col, col) for col in X_test_df.columns}
-
-            logger.debug(f"Model features: {getattr(final_model, 'n_features_in_', 'N/A')}")
-            logger.debug(f"X_test_df columns: {len(X_test_df.columns)}")
-            logger.debug(f"valid_features_dict items: {len(valid_features_dict)}")
-            
-            xpl = SmartExplainer(
-                model=final_model,
-                features_dict=valid_features_dict,
-                postprocessing=valid_postprocessing,
-                features_groups=valid_groups
-            )
-            # Ensure y_pred matches X_test_df indices
-            y_pred_series = pd.Series(y_pred_test, name='ypred', index=X_test_df.index)
-            
-            # Regressor doesn't need label_dict as much, but we can pass it if relevant
-            # Use explainers that are more robust if possible
-            xpl.compile(x=X_test_df, y_pred=y_pred_series)
-            
-            predictor = xpl.to_smartpredictor()
-            predictor_path = os.path.join(current_dir, "five_year_predictor.pkl")
-            predictor.save(predictor_path)
-            logger.info(f"5-Year SmartPredictor saved successfully to {predictor_path}")
-
-        except Exception as e:
-            logger.error(f"Error creating/saving 5-Year Shapash predictor: {e}", exc_info=True)
     
     update(100, "Five Year Model Complete")
     return final_model
 
+def load_five_year_model():
+    """Returns the resident five-year artifact (loaded once), or None."""
+    return model_registry.get("five_year")
+
+def predict_aggregate_batch(agg_df: pd.DataFrame):
+    """
+    Predicts turnover counts for many cohorts (one row of averaged/mode
+    features each) in a single pass.
+    Returns: {predictions: np.ndarray (n,), contributions: np.ndarray (n, features),
+              base_values: np.ndarray (n,), feature_names: list (business names)}
+    """
+    artifact = load_five_year_model()
+    if artifact is None:
+        raise FileNotFoundError("Five year model not found. Please train first.")
+    
+    X_processed = artifact['preprocessor'].transform(agg_df)
+    X_final = artifact['selector'].transform(X_processed)
+    predictions = np.maximum(0, artifact['model'].predict(X_final))
+    
+    # --- Native TreeSHAP explanation ---
+    contribs, base_values = artifact['explainer'].contributions(X_final)
+    
+    return {
+        "predictions": predictions,
+        "contributions": contribs,
+        "base_values": base_values,
+        "feature_names": artifact['explainer'].display_names
+    }
+
 def predict_aggregate_turnover(agg_data: dict):
     """
     Predicts turnover count for a cohort.
     Input: dict representing averaged/mode features of the cohort.
     """
-    if not os.path.exists(MODEL_PATH):
+    if load_five_year_model() is None:
         raise FileNotFoundError("Five year model not found. Please train first.")
-        
-    artifact = joblib.load(MODEL_PATH)
-    model = artifact['model']
-    preprocessor = artifact['preprocessor']
-    selector = artifact['selector']
-    
-    # Convert dict to DataFrame (single row)
-    # Ensure all expected columns are present
-    # The preprocessor expects specific columns.
     
+    # Single-row frame; the preprocessor handles transforms
     df = pd.DataFrame([agg_data])
     
-    # We need to ensure df has all columns used during fit.
-    # The preprocessor handles transforms.
-    # But if input is missing columns, it might fail.
-    # We should fill missing with defaults or 0.
-    
     try:
-        X_processed = preprocessor.transform(df)
-        X_final = selector.transform(X_processed)
-        prediction = model.predict(X_final)[0]
-        
-        # --- Shapash Prediction & explanation ---
-        predictor_path = os.path.join(current_dir, "five_year_predictor.pkl")
-        shap_dict = {}
-
-        if os.path.exists(predictor_path):
-            predictor = load_smartpredictor(predictor_path)
-            
-            # Align features
-            if hasattr(predictor, 'features_types'):
-                required_cols = list(predictor.features_types.keys())
-                X_final_df = pd.DataFrame(X_final, columns=artifact['feature_names'])
-                for c in required_cols:
-                    if c not in X_final_df.columns:
-                        X_final_df[c] = 0.0
-                X_final_df = X_final_df[required_cols]
-                
-                # Patch types to float64
-                patch_types = {col: 'float64' for col in predictor.features_types.keys()}
-                predictor.features_types = patch_types
-                for col in X_final_df.columns:
-                    X_final_df[col] = X_final_df[col].astype(float)
-
-                predictor.add_input(x=X_final_df)
-                contributions = predictor.detail_contributions()
-                raw_dict = contributions.iloc[0].to_dict()
-
-                # Clean and transform contributions
-                for k, v in raw_dict.items():
-                    try:
-                        if isinstance(v, str):
-                            import re
-                            match = re.search(r"[-+]?\d*\.\d+|\d+", v)
-                            shap_dict[k] = float(match.group()) if match else 0.0
-                        else:
-                            shap_dict[k] = float(v)
-                    except:
-                        shap_dict[k] = 0.0
-        else:
-            logger.warning(f"5-Year Predictor not found at {predictor_path}")
+        result = predict_aggregate_batch(df)
+        shap_dict = {
+            name: float(v)
+            for name, v in zip(result['feature_names'], result['contributions'][0])
+        }
 
         return {
-            "prediction": max(0, float(prediction)),
-            "shap_values": shap_dict
+            "prediction": float(result['predictions'][0]),
+            "shap_values": shap_dict,
+            "base_value": float(result['base_values'][0])
         }
         
     except Exception as e:
@@ -320,4 +256,3 @@ def predict_aggregate_turnover(agg_data: dict):
             "prediction": 0.0,
             "shap_values": {}
         }
-
@@ -0,0 +1,122 @@
+"""
+Hyperparameter Search - random or successive-halving search for the XGBoost trainers.
+
+"random" is the original RandomizedSearchCV: n_iter candidates, each fitted
+with its full n_estimators on every fold. "halving" spends boosting rounds
+where they matter: HalvingRandomSearchCV treats n_estimators as the budget,
+starts many candidates on a few trees and promotes the best third each
+round. The winner's tree count is then chosen by XGBoost early stopping on
+a validation split, and the model is refitted on all training rows. Both
+modes return the same kind of fitted estimator.
+"""
+
+import logging
+from sklearn.base import clone
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import HalvingRandomSearchCV, RandomizedSearchCV, train_test_split
+
+from backend.ml.training_executor import cpu_budget, search_plan
+
+logger = logging.getLogger(__name__)
+
+SEARCH_MODES = ("random", "halving")
+# Candidates kept per halving round: 1 / HALVING_FACTOR
+HALVING_FACTOR = 3
+# Halving rounds between the smallest and the full n_estimators budget
+HALVING_ROUNDS = 3
+EARLY_STOPPING_ROUNDS = 20
+VALIDATION_FRACTION = 0.2
+
+
+def run_search(estimator, param_distributions: dict, X, y, cv, scoring: str,
+               mode: str = "random", n_iter: int = 20, stratify: bool = False):
+    """
+    Tunes `estimator` over `param_distributions` (which must list
+    n_estimators) with cross-validation `cv`.
+
+    Args:
+        mode: "random" or "halving"
+        n_iter: Candidates sampled by the random search
+        stratify: Stratify the early-stopping split on y (classifiers)
+
+    Returns:
+        (fitted best estimator, best CV score, best params)
+    """
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"Unknown search mode: {mode}")
+    if mode == "halving":
+        return _halving_search(estimator, param_distributions, X, y, cv, scoring, stratify)
+
+    # Candidate x fold fits run in a process pool; XGBoost threads are
+    # budgeted per worker so the two levels don't oversubscribe the CPUs
+    workers, threads = search_plan(n_iter * cv.get_n_splits())
+    logger.info(f"Random search: {workers} workers x {threads} XGBoost threads")
+
+    search = RandomizedSearchCV(
+        estimator=clone(estimator).set_params(n_jobs=threads),
+        param_distributions=param_distributions,
+        n_iter=n_iter,
+        scoring=scoring,
+        cv=cv,
+        verbose=1,
+        random_state=42,
+        n_jobs=workers
+    )
+    search.fit(X, y)
+    return search.best_estimator_, search.best_score_, search.best_params_
+
+
+def _halving_search(estimator, param_distributions, X, y, cv, scoring, stratify):
+    max_estimators = max(param_distributions["n_estimators"])
+    min_estimators = max(1, max_estimators // HALVING_FACTOR ** HALVING_ROUNDS)
+    params = {k: v for k, v in param_distributions.items() if k != "n_estimators"}
+
+    workers, threads = search_plan(HALVING_FACTOR ** HALVING_ROUNDS * cv.get_n_splits())
+    logger.info(f"Halving search: {min_estimators}-{max_estimators} trees, "
+                f"{workers} workers x {threads} XGBoost threads")
+
+    search = HalvingRandomSearchCV(
+        estimator=clone(estimator).set_params(n_jobs=threads),
+        param_distributions=params,
+        n_candidates="exhaust",
+        resource="n_estimators",
+        min_resources=min_estimators,
+        max_resources=max_estimators,
+        factor=HALVING_FACTOR,
+        scoring=scoring,
+        cv=cv,
+        refit=False,
+        verbose=1,
+        random_state=42,
+        n_jobs=workers
+    )
+    search.fit(X, y)
+
+    best_params = dict(search.best_params_)
+    best_params["n_estimators"] = early_stopped_n_estimators(
+        clone(estimator).set_params(**best_params), X, y, max_estimators, stratify
+    )
+    logger.info(f"Early stopping kept {best_params['n_estimators']} of {max_estimators} trees")
+
+    best = clone(estimator).set_params(**best_params, n_jobs=cpu_budget())
+    best.fit(X, y)
+    return best, search.best_score_, best_params
+
+
+def early_stopped_n_estimators(estimator, X, y, max_estimators: int, stratify: bool = False) -> int:
+    """
+    Number of trees at which the validation loss of `estimator` stops
+    improving (EARLY_STOPPING_ROUNDS patience), fitted on a held-out split
+    of the training rows, capped at `max_estimators`.
+    """
+    X_fit, X_val, y_fit, y_val = train_test_split(
+        X, y, test_size=VALIDATION_FRACTION, random_state=42,
+        stratify=y if stratify else None
+    )
+    probe = clone(estimator).set_params(
+        n_estimators=max_estimators,
+        early_stopping_rounds=EARLY_STOPPING_ROUNDS,
+        n_jobs=cpu_budget()
+    )
+    probe.fit(X_fit, y_fit, eval_set=[(X_val, y_val)], verbose=False)
+    return int(probe.best_iteration) + 1
@@ -0,0 +1,167 @@
+"""
+Model Registry - Keeps trained artifacts resident in memory.
+
+Each artifact (XGBoost bundles, Bayesian posterior and preprocessor) is
+registered under a name with its path and a loader.
+The first `get` deserializes it; later calls return the same object until
+the file on disk changes (mtime/size) or training publishes a new version,
+at which point the new object replaces the old one in a single reference
+swap. Requests already holding the old artifact finish with it unchanged.
+
+A training worker that calls `stage_artifacts()` writes its artifacts next
+to their live paths (STAGED_SUFFIX) instead; the training pipeline then
+publishes every staged artifact together once all of its stages succeeded.
+"""
+
+import os
+import threading
+import logging
+import joblib
+
+logger = logging.getLogger(__name__)
+
+STAGED_SUFFIX = ".staged"
+# Set in training worker processes (see stage_artifacts)
+_staging = False
+_staged_paths = []
+
+
+class _Entry:
+    def __init__(self, path: str, loader):
+        self.path = path
+        self.loader = loader
+        self.artifact = None
+        self.signature = None
+        self.version = 0
+        self.lock = threading.Lock()
+
+
+class ModelRegistry:
+    """Process-wide cache of loaded model artifacts, keyed by name."""
+
+    def __init__(self):
+        self._entries = {}
+
+    def register(self, name: str, path: str, loader=joblib.load):
+        """Declares an artifact. Loading is deferred to the first `get`."""
+        if name not in self._entries:
+            self._entries[name] = _Entry(path, loader)
+
+    def get(self, name: str):
+        """
+        Returns the resident artifact, loading or reloading it if the file
+        changed. Returns None if the artifact has not been trained yet.
+        """
+        entry = self._entries[name]
+        signature = _file_signature(entry.path)
+        if signature is None:
+            return None
+        if entry.artifact is not None and entry.signature == signature:
+            return entry.artifact
+
+        with entry.lock:
+            # Another thread may have loaded it while we waited
+            signature = _file_signature(entry.path)
+            if signature is None:
+                return None
+            if entry.artifact is None or entry.signature != signature:
+                self._load(name, entry, signature)
+            return entry.artifact
+
+    def reload(self, name: str):
+        """Eagerly loads the artifact currently on disk and swaps it in."""
+        if _staging:
+            # Nothing new is live until the pipeline publishes it
+            return None
+        entry = self._entries[name]
+        with entry.lock:
+            signature = _file_signature(entry.path)
+            if signature is None:
+                entry.artifact = None
+                entry.signature = None
+                return None
+            self._load(name, entry, signature)
+            return entry.artifact
+
+    def signature(self, name: str):
+        """(mtime_ns, size) of the artifact file on disk, or None if missing."""
+        return _file_signature(self._entries[name].path)
+
+    def version(self, name: str) -> int:
+        """Monotonic counter bumped each time `name` is (re)loaded."""
+        return self._entries[name].version
+
+    def invalidate(self, name: str = None):
+        """Drops one (or every) resident artifact."""
+        names = [name] if name else list(self._entries)
+        for n in names:
+            entry = self._entries[n]
+            with entry.lock:
+                entry.artifact = None
+                entry.signature = None
+
+    def publish_staged(self, paths) -> list:
+        """
+        Moves the staged artifacts of `paths` (live paths) into place, then
+        reloads the registered ones. Returns the names reloaded.
+        """
+        for path in paths:
+            os.replace(path + STAGED_SUFFIX, path)
+        names = [name for name, entry in self._entries.items() if entry.path in paths]
+        for name in names:
+            self.reload(name)
+        return names
+
+    @staticmethod
+    def _load(name: str, entry: _Entry, signature):
+        artifact = entry.loader(entry.path)
+        entry.artifact, entry.signature = artifact, signature
+        entry.version += 1
+        logger.info(f"Model registry loaded '{name}' (version {entry.version}) from {entry.path}")
+
+
+def _file_signature(path: str):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def stage_artifacts():
+    """
+    Makes this process write artifacts to `<path>STAGED_SUFFIX` and skip
+    registry reloads. Called by training pipeline workers.
+    """
+    global _staging
+    _staging = True
+
+
+def atomic_dump(obj, path: str):
+    """joblib.dump to a temp file, then rename over `path` (or its staged path)."""
+    tmp_path = f"{path}.tmp"
+    joblib.dump(obj, tmp_path)
+    os.replace(tmp_path, _target(path))
+
+
+def staged_paths() -> list:
+    """Live paths of the artifacts this process has staged."""
+    return list(_staged_paths)
+
+
+def discard_staged(directory: str):
+    """Deletes staged artifacts left in `directory` by a failed or abandoned run."""
+    for name in os.listdir(directory):
+        if name.endswith(STAGED_SUFFIX):
+            os.remove(os.path.join(directory, name))
+
+
+def _target(path: str) -> str:
+    if not _staging:
+        return path
+    if path not in _staged_paths:
+        _staged_paths.append(path)
+    return path + STAGED_SUFFIX
+
+
+model_registry = ModelRegistry()
@@ -6,7 +6,7 @@ import logging
 import matplotlib.pyplot as plt
 import joblib
 import os
-from sklearn.model_selection import StratifiedKFold, RandomizedSearchCV
+from sklearn.model_selection import StratifiedKFold
 from sklearn.feature_selection import SelectFromModel
 from sklearn.metrics import accuracy_score, classification_report, roc_auc_score, f1_score, mean_squared_error
 
@@ -15,16 +15,28 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 logger = logging.getLogger(__name__)
 
 # Lazy load preprocessing to avoid circular dependency issues if any
-from backend.ml.preprocessing import load_and_preprocess_one_year, feature_engineering
+from backend.ml.preprocessing import feature_engineering
+from backend.ml import training_data
 from backend.app.services.frank_wolfe_multiclass import FrankWolfeMulticlass
-from shapash import SmartExplainer
-from shapash.utils.load_smartpredictor import load_smartpredictor
-from backend.ml import shapash_config
+from backend.ml.model_registry import model_registry, atomic_dump
+from backend.ml.tree_explainer import attach_explainer
+from backend.ml.training_executor import cpu_budget, serving_threads
+from backend.ml.hyperparameter_search import run_search
 
 MODEL_PATH = os.path.join(os.path.dirname(__file__), "one_year_model.xgb")
+# Population risk/contribution table, rebuilt after training (see population_scores)
+SCORES_PATH = os.path.join(os.path.dirname(__file__), "one_year_scores.parquet")
 
 
-def train_one_year_model(data_path="synthetic_turnover_data.csv", save_model=True, progress_callback=None):
+def _load_artifact(path):
+    return attach_explainer(joblib.load(path))
+
+
+model_registry.register("one_year", MODEL_PATH, _load_artifact)
+
+
+def train_one_year_model(data_path="synthetic_turnover_data.csv", save_model=True, progress_callback=None,
+                         search="random"):
     def update(p, msg):
         if progress_callback:
             progress_callback(p, msg)
@@ -33,8 +45,7 @@ def train_one_year_model(data_path="synthetic_turnover_data.csv", save_model=Tru
     update(0, "Starting Individual Model...")
     
     # 1. Load and Preprocess
-    df = pd.read_csv(data_path)
-    X_train_raw, X_test_raw, y_train, y_test, feature_names_raw, preprocessor = load_and_preprocess_one_year(df)
+    X_train_raw, X_test_raw, y_train, y_test, feature_names_raw, preprocessor = training_data.one_year_split(data_path)
     
     logger.info(f"Initial Feature Count: {X_train_raw.shape[1]}")
     update(10, "Data loaded and preprocessed")
@@ -48,7 +59,7 @@ def train_one_year_model(data_path="synthetic_turnover_data.csv", save_model=Tru
         n_estimators=100,
         eval_metric='logloss',
         reg_alpha=0.1, # L1 for sparsity
-        n_jobs=1,
+        n_jobs=cpu_budget(),
         base_score=0.5,
         random_state=42
     )
@@ -71,7 +82,7 @@ def train_one_year_model(data_path="synthetic_turnover_data.csv", save_model=Tru
     update(40, "Features selected")
 
     # 3. Hyperparameter Optimization (Civilizing Kit: GridSearch + CV)
-    logger.info("Starting Hyperparameter Optimization (RandomizedSearch)...")
+    logger.info(f"Starting Hyperparameter Optimization ({search} search)...")
     update(50, "Optimizing hyperparameters...")
     
     # Grid including Regularization (L1/L2)
@@ -86,6 +97,9 @@ def train_one_year_model(data_path="synthetic_turnover_data.csv", save_model=Tru
         'reg_lambda': [1, 1.5, 2] # Moderate L2
     }
     
+    # 5-Fold Stratified CV
+    cv_strategy = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
+    
     xgb_clf = xgb.XGBClassifier(
         objective='binary:logistic',
         eval_metric='logloss',
@@ -94,32 +108,22 @@ def train_one_year_model(data_path="synthetic_turnover_data.csv", save_model=Tru
         random_state=42
     )
     
-    # 5-Fold Stratified CV
-    cv_strategy = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
-    
-    search = RandomizedSearchCV(
-        estimator=xgb_clf,
-        param_distributions=params,
-        n_iter=20, # Scientific search
-        scoring='roc_auc',
-        cv=cv_strategy,
-        verbose=1,
-        random_state=42,
-        n_jobs=1
+    model_base, best_score, best_params = run_search(
+        xgb_clf, params, X_train_selected, y_train, cv_strategy,
+        scoring='roc_auc', mode=search, n_iter=20, stratify=True # Scientific search
     )
     
-    search.fit(X_train_selected, y_train)
-    
-    logger.info(f"Best CV ROC-AUC: {search.best_score_:.4f}")
-    logger.info(f"Best Params: {search.best_params_}")
+    logger.info(f"Best CV ROC-AUC: {best_score:.4f}")
+    logger.info(f"Best Params: {best_params}")
     update(80, "Model optimized")
     
-    model_base = search.best_estimator_
+    model_base.set_params(n_jobs=cpu_budget())
     
     logger.info("Applying Frank-Wolfe Consistent Algorithm for Imbalanced Multiclass/Binary...")
     # Wrap for optimal G-Mean (Turnover vs Stay)
     model = FrankWolfeMulticlass(base_estimator=model_base, max_iter=50)
     model.fit(X_train_selected, y_train)
+    serving_threads(model_base)
     
     # 4. Evaluation (Civilizing Kit: Metrics)
     y_pred_test = model.predict(X_test_selected)
@@ -174,97 +178,23 @@ def train_one_year_model(data_path="synthetic_turnover_data.csv", save_model=Tru
                 'rmse': float(rmse_test)
             }
         }
-        joblib.dump(artifact, MODEL_PATH)
+        atomic_dump(artifact, MODEL_PATH)
+        model_registry.reload("one_year")
         logger.info(f"Model and artifacts saved to {MODEL_PATH}")
 
-        # --- Shapash Integration ---
-        logger.info("Creating Shapash SmartPredictor...")
-        try:
-            # Reconstruct DataFrames with selected features for Shapash
-            X_test_df = pd.DataFrame(X_test_selected, columns=feature_names_selected)
-            X_test_df.reset_index(drop=True, inplace=True)
-            
-            # Predict labels and conversion for Shapash
-            y_pred_series = pd.Series(y_pred_test, name='ypred')
-            # One Year model is binary so proba is single column or [neg, pos]
-            # SmartExplainer expects proba to match y_target or be full dataframe
-            # For binary XGBoost, we can pass the probability of class 1
-            
-            # Filter Postprocessing to only include existing columns
-            # This prevents KeyError if a feature was dropped during selection
-            valid_postprocessing = {
-                k: v for k, v in shapash_config.POSTPROCESSING.items() 
-                if k in X_test_df.columns
-            }
-            
-            # Filter Features Groups to only include existing columns
-            valid_groups = {}
-            for g_name, g_cols in shapash_config.FEATURES_GROUPS.items():
-                existing_cols = [c for c in g_cols if c in X_test_df.columns]
-                if existing_cols:
-                    valid_groups[g_name] = existing_cols
-
-            # Filter features_dict to match columns AND ensure exhaustive coverage
-            valid_features_dict = {}
-            for col in X_test_df.columns:
-                valid_features_dict[col] = shapash_config.FEATURES_DICT.get(col, col)
-
-            # Shapash might struggle with the custom wrapper, so use the underlying estimator
-            if hasattr(model, 'base_estimator'):
-                 model_to_explain = model.base_estimator
-            else:
-                 model_to_explain = model
-
-            logger.debug(f"X_test_df shape: {X_test_df.shape}")
-            logger.debug(f"valid_features_dict length: {len(valid_features_dict)}")
-            if hasattr(model_to_explain, 'n_features_in_'):
-                 logger.debug(f"Model n_features_in_: {model_to_explain.n_features_in_}")
-
-            # Define function to run pipeline
-            def run_shapash_pipeline(f_dict, p_processing, f_groups, suffix="full"):
-                logger.info(f"--- Running Shapash Pipeline: {suffix} ---")
-                xpl = SmartExplainer(
-                    model=model_to_explain,
-                    features_dict=f_dict,
-                    label_dict=shapash_config.LABEL_DICT,
-                    postprocessing=p_processing,
-                    features_groups=f_groups
-                )
-                logger.debug(f"X_test_df shape: {X_test_df.shape}")
-                logger.debug(f"y_pred_series shape: {y_pred_series.shape}")
-                xpl.compile(x=X_test_df, y_pred=y_pred_series)
-                predictor = xpl.to_smartpredictor()
-                predictor.save("backend/ml/one_year_predictor.pkl")
-                logger.info(f"SmartPredictor saved successfully ({suffix}).")
-
-            # Try Full Config
-            try:
-                run_shapash_pipeline(valid_features_dict, valid_postprocessing, valid_groups, "full")
-            except Exception as e_full:
-                logger.warning(f"Full Shapash pipeline failed: {e_full}")
-                try:
-                    # Try Minimal Config (No dicts that check lengths)
-                    run_shapash_pipeline(None, None, None, "minimal")
-                except Exception as e_min:
-                    logger.error(f"Minimal Shapash pipeline also failed: {e_min}", exc_info=True)
-
-            
-        except Exception as e:
-            logger.error(f"Error creating/saving Shapash predictor: {e}", exc_info=True)
-
-    
     update(100, "One Year Model Complete")
     return model
 
 def load_one_year_model():
-    if os.path.exists(MODEL_PATH):
-        return joblib.load(MODEL_PATH)
-    return None
+    """Returns the resident one-year artifact (loaded once), or None."""
+    return model_registry.get("one_year")
 
-def predict_individual_risk(input_data: dict):
+def predict_batch_risk(df_input: pd.DataFrame):
     """
-    Predicts turnover probability for a single individual using Shapash SmartPredictor.
-    Returns: {turnover_probability: float, shap_values: dict}
+    Scores many employees in one pass: feature engineering, preprocessing,
+    selection and native TreeSHAP run once over the stacked matrix.
+    Returns: {probabilities: np.ndarray (n,), predicted_classes: np.ndarray (n,),
+              contributions: DataFrame (n, features), base_values: np.ndarray (n,)}
     """
     
     # 0. Load Artifact (Required for Preprocessing)
@@ -274,91 +204,46 @@ def predict_individual_risk(input_data: dict):
         
     preprocessor = artifact['preprocessor']
     selector = artifact['selector']
-    feature_names = artifact['feature_names'] # These match what predictor expects
+    explainer = artifact['explainer']
     
     # 1. Preprocess & Select
-    df_input = pd.DataFrame([input_data])
     try:
         # Apply Feature Engineering (calculate Onboarding Score etc.)
         df_engineered = feature_engineering(df_input)
         
         X_processed = preprocessor.transform(df_engineered)
         X_final = selector.transform(X_processed)
-        # Convert to DataFrame with correct names for SmartPredictor/XGBoost
-        X_final_df = pd.DataFrame(X_final, columns=feature_names)
     except Exception as e:
          raise ValueError(f"Preprocessing/Selection failed: {e}")
 
-    predictor_path = "backend/ml/one_year_predictor.pkl"
+    # 2. Explain: SHAP values straight from the booster (log-odds space)
+    contribs, base_values = explainer.contributions(X_final)
+    margin = contribs.sum(axis=1) + base_values
+    probs = 1.0 / (1.0 + np.exp(-margin))
     
-    # 2. Try using SmartPredictor
-    if os.path.exists(predictor_path):
-        predictor = load_smartpredictor(predictor_path)
-        
-        if hasattr(predictor, 'features_types'):
-            required_cols = list(predictor.features_types.keys())
-            
-            # Add missing columns (fill with 0/default)
-            for c in required_cols:
-                if c not in X_final_df.columns:
-                    X_final_df[c] = 0.0
-            
-            # Reorder and Drop extras
-            X_final_df = X_final_df[required_cols]
-            
-            # Enforce Types
-            # FORCE FIX: Patch predictor expectation to float64 to match XGBoost/Transformed data reality
-            # This handles cases where Shapash incorrectly inferred 'object' types during compile
-            patch_types = {}
-            for col in predictor.features_types.keys():
-                patch_types[col] = 'float64'
-            predictor.features_types = patch_types
-            
-            for col in X_final_df.columns:
-                X_final_df[col] = X_final_df[col].astype(float)
-
-        # Predictor expects DataFrame with correct columns
-        predictor.add_input(x=X_final_df)
-        
-        # Predict Proba
-        # For binary classification, result structure depends on version
-        proba_df = predictor.predict_proba()
-        
-        # In config: 1: 'Turnover'
-        target_col = shapash_config.LABEL_DICT.get(1, 1)
-        if target_col in proba_df.columns:
-             prob = float(proba_df[target_col].iloc[0])
-        else:
-             # Fallback to second column
-             prob = float(proba_df.iloc[0, 1])
-        
-        # Explanation
-        contributions = predictor.detail_contributions() 
-        raw_dict = contributions.iloc[0].to_dict()
-        
-        shap_dict = {}
-        for k, v in raw_dict.items():
-            # Shapash might return formatted strings (e.g. "100 BRL")
-            # We need to extract the float for the chart
-            try:
-                if isinstance(v, str):
-                    # Extract first number found
-                    import re
-                    match = re.search(r"[-+]?\d*\.\d+|\d+", v)
-                    if match:
-                        shap_dict[k] = float(match.group())
-                    else:
-                        shap_dict[k] = 0.0
-                else:
-                    shap_dict[k] = float(v)
-            except:
-                shap_dict[k] = 0.0
-        
-        return {
-            "turnover_probability": prob,
-            "shap_values": shap_dict,
-            "contributions": shap_dict
-        }
+    contributions = pd.DataFrame(contribs, columns=explainer.display_names)
+    
+    # Class decision uses the Frank-Wolfe cost weights, not a 0.5 cut
+    predicted_classes = artifact['model'].predict(X_final)
+    
+    return {
+        "probabilities": probs,
+        "predicted_classes": predicted_classes,
+        "contributions": contributions,
+        "base_values": base_values
+    }
 
-    else:
-        raise FileNotFoundError(f"SmartPredictor not found at {predictor_path}. Please retrain model.")
+def predict_individual_risk(input_data: dict):
+    """
+    Predicts turnover probability for a single individual with native TreeSHAP.
+    Returns: {turnover_probability: float, shap_values: dict, base_value: float}
+    """
+    result = predict_batch_risk(pd.DataFrame([input_data]))
+    shap_dict = {k: float(v) for k, v in result["contributions"].iloc[0].items()}
+    
+    return {
+        "turnover_probability": float(result["probabilities"][0]),
+        "shap_values": shap_dict,
+        "contributions": shap_dict,
+        "base_value": float(result["base_values"][0])
+    }
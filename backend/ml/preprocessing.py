@@ -130,6 +130,12 @@ def load_and_preprocess_one_year(df):
     
     return X_train_processed, X_test_processed, y_train, y_test, preprocessor.get_feature_names(), preprocessor
 
+# Cohort bins used by the five-year model (right-closed, as pd.cut)
+AGE_BINS = [0, 25, 35, 45, 55, 100]
+AGE_LABELS = ['lt_25', '25_to_35', '35_to_45', '45_to_55', 'plus_55']
+TENURE_BINS = [0, 12, 36, 60, 120, 1000]
+TENURE_LABELS = ['lt_1yr', '1_to_3yr', '3_to_5yr', '5_to_10yr', 'plus_10yr']
+
 def aggregate_data_for_5year(df):
     """
     Aggregates data for 5-Year model.
@@ -140,10 +146,10 @@ def aggregate_data_for_5year(df):
     
     # Binning
     if 'a2_age' in df.columns:
-        df['AgeGroup'] = pd.cut(df['a2_age'], bins=[0, 25, 35, 45, 55, 100], labels=['lt_25', '25_to_35', '35_to_45', '45_to_55', 'plus_55'])
+        df['AgeGroup'] = pd.cut(df['a2_age'], bins=AGE_BINS, labels=AGE_LABELS)
     
     if 'B10_Tenure_in_month' in df.columns:
-        df['TenureGroup'] = pd.cut(df['B10_Tenure_in_month'], bins=[0, 12, 36, 60, 120, 1000], labels=['lt_1yr', '1_to_3yr', '3_to_5yr', '5_to_10yr', 'plus_10yr'])
+        df['TenureGroup'] = pd.cut(df['B10_Tenure_in_month'], bins=TENURE_BINS, labels=TENURE_LABELS)
 
     group_cols.extend(['AgeGroup', 'TenureGroup'])
     
@@ -0,0 +1,119 @@
+"""
+Training Data - preprocessed training inputs shared by every trainer.
+
+The one-year split (cleaned, engineered, split and scaled) and the five-year
+cohort aggregate are built once per data version and persisted under
+CACHE_DIR: matrices as .npy, the aggregate as Parquet, the fitted
+preprocessor with joblib. Entries are keyed by a hash of the CSV bytes and
+of the preprocessing code, so editing either one invalidates them. The
+one-year, five-year and Bayesian trainers all read from here; a full
+retrain preprocesses the data once, a retrain on unchanged data not at all.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import threading
+import uuid
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from backend.ml import preprocessing
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.path.join(os.path.dirname(__file__), "training_cache")
+# Entries kept per stage; older data versions are pruned on write
+MAX_ENTRIES = 3
+
+_ONE_YEAR_ARRAYS = ("X_train", "X_test", "y_train", "y_test")
+
+_lock = threading.Lock()
+
+
+def cache_key(data_path: str) -> str:
+    """Hash of the data file contents and of the preprocessing code."""
+    digest = hashlib.sha256()
+    with open(data_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    with open(preprocessing.__file__, "rb") as f:
+        digest.update(f.read())
+    return digest.hexdigest()[:24]
+
+
+def one_year_split(data_path: str) -> tuple:
+    """
+    The one-year training split, as load_and_preprocess_one_year returns it
+    (labels as arrays): (X_train, X_test, y_train, y_test, feature_names,
+    preprocessor).
+    """
+    entry = _entry("one_year", data_path)
+    with _lock:
+        if os.path.isdir(entry):
+            logger.info(f"Using cached one-year split {os.path.basename(entry)}")
+            arrays = [np.load(os.path.join(entry, f"{name}.npy")) for name in _ONE_YEAR_ARRAYS]
+            meta = joblib.load(os.path.join(entry, "meta.joblib"))
+            return (*arrays, meta["feature_names"], meta["preprocessor"])
+
+        X_train, X_test, y_train, y_test, feature_names, preprocessor = \
+            preprocessing.load_and_preprocess_one_year(pd.read_csv(data_path))
+        arrays = [np.ascontiguousarray(a) for a in (X_train, X_test, np.asarray(y_train), np.asarray(y_test))]
+
+        def write(tmp):
+            for name, values in zip(_ONE_YEAR_ARRAYS, arrays):
+                np.save(os.path.join(tmp, f"{name}.npy"), values)
+            joblib.dump({"feature_names": feature_names, "preprocessor": preprocessor},
+                        os.path.join(tmp, "meta.joblib"))
+
+        _publish(entry, write)
+        return (*arrays, feature_names, preprocessor)
+
+
+def five_year_frame(data_path: str) -> pd.DataFrame:
+    """The cohort aggregate the five-year model trains on (aggregate_data_for_5year)."""
+    entry = _entry("five_year", data_path)
+    path = os.path.join(entry, "aggregate.parquet")
+    with _lock:
+        if os.path.isdir(entry):
+            logger.info(f"Using cached five-year aggregate {os.path.basename(entry)}")
+            return pd.read_parquet(path)
+
+        frame = preprocessing.aggregate_data_for_5year(pd.read_csv(data_path))
+        _publish(entry, lambda tmp: frame.to_parquet(os.path.join(tmp, "aggregate.parquet")))
+        return frame
+
+
+def _entry(stage: str, data_path: str) -> str:
+    return os.path.join(CACHE_DIR, f"{stage}-{cache_key(data_path)}")
+
+
+def _publish(entry: str, write):
+    """
+    Writes an entry into a scratch directory and renames it into place, so
+    readers (including other training processes) never see a partial one.
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = os.path.join(CACHE_DIR, f".tmp-{uuid.uuid4().hex}")
+    os.makedirs(tmp)
+    try:
+        write(tmp)
+        os.rename(tmp, entry)
+    except OSError:
+        # Another process published the same entry first
+        if not os.path.isdir(entry):
+            raise
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    _prune(os.path.basename(entry).split("-")[0])
+
+
+def _prune(stage: str):
+    entries = [os.path.join(CACHE_DIR, name) for name in os.listdir(CACHE_DIR)
+               if name.startswith(f"{stage}-")]
+    entries.sort(key=os.path.getmtime, reverse=True)
+    for stale in entries[MAX_ENTRIES:]:
+        shutil.rmtree(stale, ignore_errors=True)
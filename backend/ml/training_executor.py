@@ -0,0 +1,67 @@
+"""
+Training Executor - CPU budgeting for the XGBoost trainers.
+
+Hyperparameter searches fan their (candidate x fold) fits out to a joblib
+process pool; every XGBoost fit inside a worker gets an equal share of the
+CPU budget as threads, so workers x threads never exceeds it. Single fits
+(feature selection, the final refit) get the whole budget. Fitted models
+are reset to one thread before they are saved, since the API scores one
+request per thread.
+
+Training jobs run outside the API process (see TrainingRunner), which calls
+`isolate_process` to pin them to TRAINING_CPU_SET and lower their priority
+by TRAINING_NICE; the budget then defaults to the pinned cores.
+"""
+
+import os
+
+
+def cpu_budget() -> int:
+    """CPUs training may use: TRAINING_CPUS if set, else every core this process may run on."""
+    cpus = int(os.getenv("TRAINING_CPUS", "0")) or _available_cpus()
+    return max(1, cpus)
+
+
+def isolate_process():
+    """
+    Pins the calling process to TRAINING_CPU_SET (e.g. "2-7", unset: no
+    pinning) and lowers its priority by TRAINING_NICE (default 10). Processes
+    it starts inherit both; call it once per training job.
+    """
+    cpu_set = parse_cpu_set(os.getenv("TRAINING_CPU_SET", ""))
+    if cpu_set and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cpu_set)
+    nice = int(os.getenv("TRAINING_NICE", "10"))
+    if nice > 0 and hasattr(os, "nice"):
+        os.nice(nice)
+
+
+def parse_cpu_set(spec: str) -> set:
+    """CPU ids of a list like "0-3,6"."""
+    cpus = set()
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        first, _, last = part.partition("-")
+        cpus.update(range(int(first), int(last or first) + 1))
+    return cpus
+
+
+def _available_cpus() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def search_plan(n_fits: int, cpus: int = None) -> tuple:
+    """
+    (search workers, XGBoost threads per fit) for `n_fits` independent
+    fits: one worker per fit up to the budget, leftover cores as threads.
+    """
+    cpus = cpus or cpu_budget()
+    workers = max(1, min(cpus, n_fits))
+    return workers, max(1, cpus // workers)
+
+
+def serving_threads(estimator):
+    """Sets a fitted XGBoost estimator back to single-threaded prediction."""
+    estimator.set_params(n_jobs=1)
+    return estimator
@@ -0,0 +1,158 @@
+"""
+Training Pipeline - trains the one-year, five-year and Bayesian models concurrently.
+
+The stages only share their input data, so the pipeline prepares the cached
+training inputs once (see training_data), then runs every stage in its own
+worker process with an equal share of the CPU budget. Workers report
+progress over a queue and write their artifacts as staged files; once every
+stage has succeeded the staged artifacts are published together, so the API
+never serves a new one-year model next to a stale five-year one. If any
+stage fails, the others are stopped and nothing is published.
+"""
+
+import importlib
+import logging
+import multiprocessing
+import os
+import queue
+
+from backend.ml import training_data
+from backend.ml.model_registry import model_registry, stage_artifacts, staged_paths, discard_staged
+from backend.ml.training_executor import cpu_budget
+
+logger = logging.getLogger(__name__)
+
+# Stage name -> (module, training function)
+STAGES = {
+    "one_year": ("backend.ml.one_year_model", "train_one_year_model"),
+    "five_year": ("backend.ml.five_year_model", "train_five_year_model"),
+    "bayesian": ("backend.ml.bayesian_turnover_model", "train_bayesian_model"),
+}
+# Where the trainers write their artifacts
+ARTIFACT_DIR = os.path.dirname(__file__)
+# Seconds between liveness checks of the workers
+POLL_INTERVAL = 1.0
+
+
+def run_pipeline(stages: dict, data_path: str = "synthetic_turnover_data.csv", progress_callback=None,
+                 publish_with=()):
+    """
+    Trains `stages` concurrently and publishes their artifacts.
+
+    Args:
+        stages: Stage name -> keyword arguments for its training function
+        data_path: CSV every stage trains on
+        progress_callback: Optional callback(stage, progress, message)
+        publish_with: Live paths of files the caller already staged (e.g.
+            the new training data), published together with the artifacts
+
+    Returns:
+        Paths of the published artifacts
+
+    Raises:
+        RuntimeError: If any stage failed (nothing is published)
+    """
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        raise ValueError(f"Unknown training stages: {sorted(unknown)}")
+
+    # Warm the shared input cache once instead of racing in every worker
+    if {"one_year", "bayesian"} & set(stages):
+        training_data.one_year_split(data_path)
+    if "five_year" in stages:
+        training_data.five_year_frame(data_path)
+
+    discard_staged(ARTIFACT_DIR)
+    cpus = max(1, cpu_budget() // len(stages))
+    logger.info(f"Training {', '.join(stages)} concurrently, {cpus} CPUs each")
+
+    ctx = multiprocessing.get_context("spawn")
+    events = ctx.Queue()
+    workers = {
+        name: ctx.Process(
+            target=_run_stage,
+            args=(name, STAGES[name], {**kwargs, "data_path": data_path}, cpus, events),
+            name=f"train-{name}"
+        )
+        for name, kwargs in stages.items()
+    }
+    for worker in workers.values():
+        worker.start()
+
+    staged, errors = _collect(workers, events, progress_callback)
+
+    for worker in workers.values():
+        worker.join()
+
+    if errors:
+        discard_staged(ARTIFACT_DIR)
+        raise RuntimeError("; ".join(f"{name}: {error}" for name, error in errors.items()))
+
+    # The registry only knows artifacts whose module was imported here
+    for module, _ in (STAGES[name] for name in stages):
+        importlib.import_module(module)
+    staged += list(publish_with)
+    model_registry.publish_staged(staged)
+    logger.info(f"Published {', '.join(os.path.basename(p) for p in staged)}")
+    return staged
+
+
+def _collect(workers: dict, events, progress_callback) -> dict:
+    """
+    Relays worker events until every stage finished.
+
+    Returns:
+        (staged artifact paths, stage -> error)
+    """
+    pending = set(workers)
+    staged = []
+    errors = {}
+    while pending:
+        try:
+            name, kind, progress, message = events.get(timeout=POLL_INTERVAL)
+        except queue.Empty:
+            kind = None
+
+        if kind == "progress":
+            if progress_callback:
+                progress_callback(name, progress, message)
+        elif kind == "error":
+            pending.discard(name)
+            errors[name] = message
+        elif kind == "done":
+            pending.discard(name)
+            staged.extend(message)
+            if progress_callback:
+                progress_callback(name, 100, "Complete")
+
+        # A clean exit flushes its last event first; only a crash loses it
+        for name in list(pending):
+            exitcode = workers[name].exitcode
+            if exitcode is not None and exitcode != 0:
+                pending.discard(name)
+                errors[name] = f"worker exited with code {exitcode}"
+
+        if errors:
+            _stop(workers, pending)
+            break
+    return staged, errors
+
+
+def _stop(workers: dict, names):
+    for name in names:
+        logger.warning(f"Stopping training stage {name}")
+        workers[name].terminate()
+
+
+def _run_stage(name: str, target: tuple, kwargs: dict, cpus: int, events):
+    """Worker process entry point."""
+    os.environ["TRAINING_CPUS"] = str(cpus)
+    stage_artifacts()
+    try:
+        module, function = target
+        train = getattr(importlib.import_module(module), function)
+        train(progress_callback=lambda p, msg: events.put((name, "progress", p, msg)), **kwargs)
+        events.put((name, "done", 100, staged_paths()))
+    except Exception as e:
+        logger.error(f"Training stage {name} failed", exc_info=True)
+        events.put((name, "error", 0, str(e)))
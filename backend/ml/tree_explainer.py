@@ -0,0 +1,50 @@
+"""
+Native TreeSHAP contributions for the XGBoost models.
+
+Calls the booster directly with `pred_contribs=True` on the selected-feature
+matrix, so request paths get numeric SHAP values without going through a
+Shapash SmartPredictor (no add_input state, dtype patching or formatted
+strings to parse back).
+"""
+
+import numpy as np
+import xgboost as xgb
+from backend.ml import shapash_config
+
+
+class TreeContributionExplainer:
+    """
+    Exact TreeSHAP contributions from an XGBoost booster.
+
+    Contributions are in the model's margin space (log-odds for the
+    one-year classifier, counts for the five-year regressor); the bias
+    column is returned separately as the base value.
+    """
+
+    def __init__(self, model, feature_names: list):
+        # FrankWolfeMulticlass wraps the XGBoost estimator
+        estimator = getattr(model, 'base_estimator', model)
+        self.booster = estimator.get_booster()
+        self.feature_names = list(feature_names)
+        # Business-friendly names, mapped once per loaded model
+        self.display_names = [shapash_config.FEATURES_DICT.get(f, f) for f in self.feature_names]
+
+    def contributions(self, X) -> tuple:
+        """
+        Returns (contributions (n, n_features), base_values (n,)).
+        The margin of row i is contributions[i].sum() + base_values[i].
+        """
+        dmatrix = xgb.DMatrix(
+            np.asarray(X, dtype=np.float32),
+            feature_names=self.booster.feature_names
+        )
+        # float64 so per-row sums and group totals agree across callers
+        contribs = self.booster.predict(dmatrix, pred_contribs=True).astype(np.float64)
+        return contribs[:, :-1], contribs[:, -1]
+
+
+def attach_explainer(artifact: dict) -> dict:
+    """Adds a TreeContributionExplainer to a loaded model artifact."""
+    if artifact and 'model' in artifact:
+        artifact['explainer'] = TreeContributionExplainer(artifact['model'], artifact['feature_names'])
+    return artifact
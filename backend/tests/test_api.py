@@ -65,6 +65,14 @@ class TestPredictionEndpoints:
         # Protected endpoints should return 401 without authentication
         assert response.status_code == 401
 
+    def test_batch_prediction_requires_auth(self, client):
+        """Test batch individual prediction endpoint requires authentication."""
+        response = client.post(
+            "/api/predict/individual/batch",
+            json={"employee_ids": ["EMP001", "EMP002"]}
+        )
+        assert response.status_code == 401
+
 
 class TestBayesianEndpoints:
     """Tests for Bayesian prediction endpoints."""
@@ -77,6 +85,26 @@ class TestBayesianEndpoints:
         assert "is_training" in data
         assert "status" in data
 
+    @pytest.fixture
+    def anonymous(self, client):
+        from backend.app.auth.dependencies import get_mode_user
+
+        client.app.dependency_overrides[get_mode_user] = lambda: None
+        yield client
+        client.app.dependency_overrides.pop(get_mode_user)
+
+    def test_unknown_employee_is_not_found(self, anonymous):
+        """Client errors raised inside the Bayesian endpoints keep their status."""
+        with patch('backend.app.routers.predictions.resolve_data_path', return_value="data.csv"), \
+             patch('backend.app.routers.predictions.get_employee_features', return_value=None):
+            response = anonymous.post("/api/demo/predict/individual/bayesian", json={"employee_id": "EMP999"})
+        assert response.status_code == 404
+
+    def test_aggregate_without_data(self, anonymous):
+        with patch('backend.app.routers.predictions.get_cohort_frame', return_value=None):
+            response = anonymous.post("/api/demo/predict/aggregate/bayesian", json={})
+        assert response.status_code == 400
+
 
 class TestDashboardEndpoint:
     """Tests for dashboard data endpoint."""
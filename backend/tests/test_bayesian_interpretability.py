@@ -0,0 +1,156 @@
+"""
+Bayesian Interpretability Tests
+
+Tests the posterior predictive output, checks and uncertainty decomposition
+of BayesianInterpreter.
+"""
+import numpy as np
+import pytest
+
+from backend.ml.bayesian_turnover_model import BayesianTurnoverModel
+from backend.ml.bayesian_interpretability import BayesianInterpreter
+
+
+def _interpreter(n_draws=200, n_features=3, seed=0):
+    rng = np.random.default_rng(seed)
+    model = BayesianTurnoverModel(feature_names=[f"f{i}" for i in range(n_features)])
+    model.n_features = n_features
+    model.posterior_samples = {
+        "intercept": rng.normal(scale=0.1, size=n_draws).astype(np.float32),
+        "tau": np.abs(rng.normal(size=n_draws)).astype(np.float32),
+        "coeffs": rng.normal(scale=0.5, size=(n_draws, n_features)).astype(np.float32),
+    }
+    model.is_fitted = True
+    return BayesianInterpreter(model)
+
+
+def _max_run(y):
+    best = run = 0
+    for value in y:
+        run = run + 1 if value == 1 else 0
+        best = max(best, run)
+    return best
+
+
+class TestDiscrepancyMeasures:
+    """Tests for the row-wise PPC test statistics."""
+
+    def test_statistics_per_row(self):
+        y = np.array([
+            [1, 1, 0, 1, 1, 1, 0],
+            [0, 0, 0, 0, 0, 0, 0],
+            [1, 1, 1, 1, 1, 1, 1],
+        ])
+
+        stats = _interpreter()._compute_discrepancy_measures(y)
+
+        assert stats["sum"].tolist() == [5, 0, 7]
+        assert stats["max_consecutive_turnovers"].tolist() == [3, 0, 7]
+        assert np.allclose(stats["mean"], [5 / 7, 0.0, 1.0])
+        assert np.allclose(stats["retention_rate"], [2 / 7, 1.0, 0.0])
+        assert np.allclose(stats["variance"], y.var(axis=1))
+
+    def test_max_run_matches_scan(self):
+        y = np.random.default_rng(1).integers(0, 2, size=(100, 40))
+
+        stats = _interpreter()._compute_discrepancy_measures(y)
+
+        assert stats["max_consecutive_turnovers"].tolist() == [_max_run(row) for row in y]
+
+
+class TestPosteriorPredictiveCheck:
+    """Tests for the vectorized posterior predictive check."""
+
+    def test_replicates_follow_posterior_draws(self):
+        interpreter = _interpreter()
+        X = np.random.default_rng(2).normal(size=(25, 3))
+
+        y_rep, p_rep = interpreter._replicate(X, n_samples=50)
+
+        posterior = interpreter.model.posterior_samples
+        logits = posterior["intercept"][:50, None] + posterior["coeffs"][:50] @ X.T
+        assert y_rep.shape == p_rep.shape == (50, 25)
+        assert np.allclose(p_rep, 1 / (1 + np.exp(-logits)), atol=1e-6)
+        assert set(np.unique(y_rep)) <= {0, 1}
+
+    def test_replications_capped_by_posterior_size(self):
+        interpreter = _interpreter(n_draws=40)
+        X = np.random.default_rng(3).normal(size=(30, 3))
+        y = np.random.default_rng(4).integers(0, 2, size=30)
+
+        result = interpreter.posterior_predictive_check(X, y, n_replications=100)
+
+        assert result["n_replications"] == 40
+        assert set(result["ppc_p_values"]) == {
+            "mean", "variance", "sum", "retention_rate", "max_consecutive_turnovers"
+        }
+        assert result["discrepancy_measures"]["sum"]["observed"] == float(y.sum())
+        assert all(0.0 <= p <= 1.0 for p in result["ppc_p_values"].values())
+
+
+class TestPosteriorPredictive:
+    """Tests for the posterior predictive output."""
+
+    def test_arrays_and_column_summary(self):
+        interpreter = _interpreter()
+        X = np.random.default_rng(5).normal(size=(12, 3))
+
+        result = interpreter.generate_posterior_predictive(X, n_samples=60)
+
+        assert result["y_rep"].dtype == np.int8 and result["y_rep"].shape == (60, 12)
+        assert result["p_rep"].dtype == np.float32 and result["p_rep"].shape == (60, 12)
+        assert len(result["summary"]) == 12
+        last = result["summary"][-1]
+        assert last["obs_index"] == 11
+        assert np.isclose(last["prob_mean"], result["p_rep"][:, 11].mean(), atol=1e-6)
+        assert np.isclose(last["expected_turnover_rate"], result["y_rep"][:, 11].mean())
+
+    def test_windows_match_full_replicates(self):
+        interpreter = _interpreter()
+        X = np.random.default_rng(8).normal(size=(12, 3))
+        full = interpreter.generate_posterior_predictive(X, n_samples=60)
+
+        page = interpreter.replicate_window(X, n_samples=60, offset=20, limit=15)
+        last = interpreter.replicate_window(X, n_samples=60, offset=50, limit=15)
+
+        assert np.array_equal(page["y_rep"], full["y_rep"][20:35])
+        assert np.array_equal(page["p_rep"], full["p_rep"][20:35])
+        assert page["next_offset"] == 35
+        assert np.array_equal(last["y_rep"], full["y_rep"][50:])
+        assert last["next_offset"] is None
+        assert interpreter.replicate_window(X, n_samples=60, offset=80)["y_rep"].shape == (0, 12)
+
+
+class TestUncertaintyDecomposition:
+    """Tests for the column-wise uncertainty decomposition."""
+
+    def test_arrays_match_per_observation_formulas(self):
+        interpreter = _interpreter()
+        X = np.random.default_rng(6).normal(size=(15, 3))
+
+        result = interpreter.compute_uncertainty_decomposition(X, output="arrays")
+
+        posterior = interpreter.model.posterior_samples
+        probs = 1 / (1 + np.exp(-(posterior["intercept"][:, None] + posterior["coeffs"] @ X.T)))
+        metrics = result["observations"]
+        for j in range(X.shape[0]):
+            p = probs[:, j]
+            assert metrics["mean_probability"][j] == pytest.approx(p.mean(), abs=1e-5)
+            assert metrics["epistemic_uncertainty"][j] == pytest.approx(p.var(), abs=1e-5)
+            assert metrics["aleatoric_uncertainty"][j] == pytest.approx(np.mean(p * (1 - p)), abs=1e-5)
+        assert result["aggregate"]["mean_confidence"] == pytest.approx(metrics["confidence"].mean())
+
+    def test_records_and_aggregate_outputs(self):
+        interpreter = _interpreter()
+        X = np.random.default_rng(7).normal(size=(4, 3))
+
+        records = interpreter.compute_uncertainty_decomposition(X)
+        aggregate = interpreter.compute_uncertainty_decomposition(X, output="aggregate")
+
+        assert [r["obs_index"] for r in records["observations"]] == [0, 1, 2, 3]
+        first = records["observations"][0]
+        assert first["total_uncertainty"] == pytest.approx(
+            first["epistemic_uncertainty"] + first["aleatoric_uncertainty"]
+        )
+        assert "observations" not in aggregate
+        assert aggregate["aggregate"] == pytest.approx(records["aggregate"])
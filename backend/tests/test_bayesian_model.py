@@ -0,0 +1,278 @@
+"""
+Bayesian Model Tests
+
+Tests posterior summaries, fitting modes and persistence of BayesianTurnoverModel.
+"""
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from backend.ml.bayesian_turnover_model import BayesianTurnoverModel, _QUANTILE_LEVELS
+
+
+def _fitted_model(n_draws=300, n_features=4, seed=0):
+    rng = np.random.default_rng(seed)
+    model = BayesianTurnoverModel()
+    model.n_features = n_features
+    model.posterior_samples = {
+        "intercept": rng.normal(size=n_draws).astype(np.float32),
+        "coeffs": rng.normal(scale=0.5, size=(n_draws, n_features)).astype(np.float32),
+    }
+    model.is_fitted = True
+    return model
+
+
+def _posterior_matrix(model, X):
+    logits = model.posterior_samples["intercept"][:, None] + model.posterior_samples["coeffs"] @ X.T
+    return 1.0 / (1.0 + np.exp(-logits))
+
+
+def _summary(probs):
+    quantiles = dict(zip(_QUANTILE_LEVELS, np.quantile(probs, _QUANTILE_LEVELS, axis=0)))
+    return BayesianTurnoverModel._summary_from_stats(probs.mean(axis=0), probs.std(axis=0), quantiles)
+
+
+class TestPosteriorSummary:
+    """Tests for the vectorized posterior summary."""
+
+    def test_matches_per_observation_statistics(self):
+        model = _fitted_model(n_draws=400)
+        X = np.random.default_rng(0).normal(size=(7, 4))
+
+        result = model.predict(X)
+
+        probs = _posterior_matrix(model, X)
+        for i, prediction in enumerate(result["predictions"]):
+            column = probs[:, i]
+            assert np.isclose(prediction["mean"], column.mean(), atol=1e-5)
+            assert np.isclose(prediction["std"], column.std(), atol=1e-5)
+            lower, upper = prediction["credible_intervals"]["ci_95"]
+            assert np.isclose(lower, np.percentile(column, 2.5), atol=1e-5)
+            assert np.isclose(upper, np.percentile(column, 97.5), atol=1e-5)
+
+    def test_risk_bands(self):
+        # Narrow posteriors around 0.9, 0.5 and 0.1, then a wide one
+        probs = np.column_stack([
+            np.full(100, 0.9), np.full(100, 0.5), np.full(100, 0.1),
+            np.linspace(0.0, 1.0, 100)
+        ])
+
+        summary = _summary(probs)
+
+        assert summary["risk_band"].tolist() == ["High", "Medium", "Low", "Uncertain"]
+
+    def test_formatted_predictions(self):
+        model = _fitted_model(n_draws=80, n_features=2)
+        X = np.random.default_rng(1).normal(size=(3, 2))
+
+        result = model.predict(X)
+
+        assert len(result["predictions"]) == 3
+        first = result["predictions"][0]
+        assert set(first["credible_intervals"]) == {"ci_50", "ci_80", "ci_95"}
+        assert len(first["samples"]) == 50
+        assert np.allclose(first["samples"], _posterior_matrix(model, X)[:50, 0], atol=1e-6)
+
+
+class TestChunkedPredict:
+    """Tests for the compiled, chunked prediction kernel."""
+
+    def _assert_matches_full_matrix(self, model, X):
+        result = model.predict(X)
+        probs = _posterior_matrix(model, X)
+        expected = model._format_summary(_summary(probs), probs[:50], elapsed=0.0)
+
+        assert len(result["predictions"]) == len(X)
+        for got, want in zip(result["predictions"], expected["predictions"]):
+            assert np.isclose(got["mean"], want["mean"], atol=1e-5)
+            assert np.isclose(got["std"], want["std"], atol=1e-5)
+            for name, bounds in want["credible_intervals"].items():
+                assert np.allclose(got["credible_intervals"][name], bounds, atol=1e-5)
+            assert np.allclose(got["samples"], want["samples"], atol=1e-5)
+
+    def test_single_chunk(self):
+        model = _fitted_model()
+        X = np.random.default_rng(1).normal(size=(7, 4))
+        self._assert_matches_full_matrix(model, X)
+
+    def test_several_chunks_with_padded_tail(self, monkeypatch):
+        from backend.ml import bayesian_turnover_model
+
+        monkeypatch.setattr(bayesian_turnover_model, "PREDICT_CHUNK_SIZE", 16)
+        model = _fitted_model()
+        X = np.random.default_rng(2).normal(size=(37, 4))
+        self._assert_matches_full_matrix(model, X)
+
+    def test_posterior_copied_to_device_once(self):
+        model = _fitted_model()
+        first = model._device_posterior()
+        assert model._device_posterior()[1] is first[1]
+
+        # A refit replaces the posterior, and with it the device copies
+        model.posterior_samples = dict(model.posterior_samples, coeffs=model.posterior_samples["coeffs"] * 2)
+        assert np.allclose(model._device_posterior()[1], np.asarray(first[1]) * 2)
+
+    def test_empty_input(self):
+        result = _fitted_model().predict(np.zeros((0, 4)))
+        assert result["predictions"] == []
+
+
+class TestPredictTotals:
+    """Tests for the per-draw cohort totals."""
+
+    def test_expected_total_is_per_draw_column_sum(self, monkeypatch):
+        from backend.ml import bayesian_turnover_model
+
+        monkeypatch.setattr(bayesian_turnover_model, "PREDICT_CHUNK_SIZE", 16)
+        model = _fitted_model()
+        X = np.random.default_rng(3).normal(size=(37, 4))
+
+        result = model.predict_totals(X)
+
+        # Padding rows of the last chunk must not leak into the sums
+        expected = _posterior_matrix(model, X).sum(axis=1)
+        assert np.allclose(result["expected"], expected, atol=1e-4)
+
+    def test_counts_are_bounded_draws_around_expected_total(self):
+        model = _fitted_model(n_draws=2000)
+        X = np.random.default_rng(4).normal(size=(50, 4))
+
+        result = model.predict_totals(X, seed=1)
+
+        counts = result["counts"]
+        assert counts.shape == (2000,)
+        assert counts.min() >= 0 and counts.max() <= 50
+        assert abs(counts.mean() - result["expected"].mean()) < 1.0
+
+    def test_counts_are_optional(self):
+        result = _fitted_model().predict_totals(np.zeros((3, 4)), with_counts=False)
+        assert result["counts"] is None
+
+
+class TestConvergenceDiagnostics:
+    """Tests for the multi-chain R-hat/ESS summary in fit_info."""
+
+    def _samples(self, offsets):
+        rng = np.random.default_rng(5)
+        shift = np.asarray(offsets)[:, None]
+        return {
+            "intercept": rng.normal(size=(len(offsets), 500)) + shift,
+            "tau": np.abs(rng.normal(size=(len(offsets), 500))),
+            "coeffs": rng.normal(size=(len(offsets), 500, 3)),
+        }
+
+    def test_mixed_chains_converge(self):
+        from backend.ml.bayesian_turnover_model import _convergence_diagnostics
+
+        diagnostics = _convergence_diagnostics(self._samples([0, 0, 0, 0]), np.zeros((4, 500), dtype=bool))
+
+        assert diagnostics["converged"]
+        assert diagnostics["num_divergences"] == 0
+        assert len(diagnostics["sites"]["coeffs"]["r_hat"]) == 3
+        assert diagnostics["min_ess"] > 100
+
+    def test_separated_chains_are_flagged(self):
+        from backend.ml.bayesian_turnover_model import _convergence_diagnostics
+
+        diverging = np.zeros((4, 500), dtype=bool)
+        diverging[0, :3] = True
+        diagnostics = _convergence_diagnostics(self._samples([0, 0, 0, 3]), diverging)
+
+        assert not diagnostics["converged"]
+        assert diagnostics["max_r_hat"] > 1.1
+        assert diagnostics["num_divergences"] == 3
+
+
+class TestSVIFit:
+    """Tests for the fast variational training mode."""
+
+    def test_posterior_layout_matches_nuts(self, tmp_path):
+        rng = np.random.default_rng(6)
+        X = rng.normal(size=(300, 3)).astype(np.float32)
+        y = (rng.uniform(size=300) < 1 / (1 + np.exp(-(2.0 * X[:, 0] - 1.0)))).astype(np.float32)
+
+        model = BayesianTurnoverModel(feature_names=["a", "b", "c"])
+        info = model.fit_svi(X, y, num_steps=500, n_samples=200)
+
+        assert info["method"] == "svi"
+        assert set(model.posterior_samples) == {"intercept", "tau", "coeffs"}
+        assert model.posterior_samples["coeffs"].shape == (200, 3)
+        # The strong feature is recovered with the right sign
+        assert float(np.mean(model.posterior_samples["coeffs"][:, 0])) > 1.0
+
+        path = str(tmp_path / "bayesian_model.pkl")
+        model.save(path)
+        loaded = BayesianTurnoverModel.load(path)
+        assert loaded.predict(X[:5])["method"] == "svi"
+
+
+class TestWarmStart:
+    """Tests for the persisted NUTS adaptation used by warm-started refits."""
+
+    def test_adaptation_is_averaged_over_chains(self):
+        from types import SimpleNamespace
+        from backend.ml.bayesian_turnover_model import _adaptation_state
+
+        adapt_state = SimpleNamespace(
+            step_size=np.array([0.2, 0.4]),
+            inverse_mass_matrix={("coeffs", "intercept", "tau"): np.array([[1.0, 2.0], [3.0, 4.0]])}
+        )
+
+        adaptation = _adaptation_state(adapt_state)
+
+        assert np.isclose(adaptation["step_size"], 0.3)
+        assert adaptation["inverse_mass_matrix"][("coeffs", "intercept", "tau")].tolist() == [2.0, 3.0]
+
+    def test_state_starts_at_posterior_medians(self, tmp_path):
+        model = _fitted_model()
+        model.adaptation = {"step_size": 0.3, "inverse_mass_matrix": {("coeffs", "intercept", "tau"): np.ones(6)}}
+        model.posterior_samples["tau"] = np.abs(model.posterior_samples["intercept"])
+
+        path = str(tmp_path / "bayesian_model.pkl")
+        model.save(path)
+        state = BayesianTurnoverModel.load(path).warm_start_state()
+
+        assert state["step_size"] == 0.3
+        assert np.allclose(state["init_values"]["coeffs"], np.median(model.posterior_samples["coeffs"], axis=0))
+        assert state["init_values"]["intercept"].shape == ()
+
+    def test_no_state_without_nuts_adaptation(self):
+        assert _fitted_model().warm_start_state() is None
+
+
+class TestHostDevices:
+    """Tests for the XLA host devices NUTS chains run on."""
+
+    def test_import_leaves_xla_devices_alone(self):
+        # Only NUTS training may split the host into several XLA devices
+        env = {k: v for k, v in os.environ.items() if k != "XLA_FLAGS"}
+        code = "import os, backend.ml.bayesian_turnover_model; print(os.environ.get('XLA_FLAGS', ''))"
+        out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+        assert "device_count" not in out.stdout
+
+
+class TestArtifact:
+    """Tests for the compact, memory-mapped posterior artifact."""
+
+    def test_round_trip_drops_prob_and_memory_maps_sites(self, tmp_path):
+        model = _fitted_model()
+        model.posterior_samples["tau"] = np.abs(model.posterior_samples["intercept"]).astype(np.float64)
+        model.posterior_samples["prob"] = np.full((300, 1000), 0.5)
+
+        path = str(tmp_path / "bayesian_model.pkl")
+        model.save(path)
+        loaded = BayesianTurnoverModel.load(path)
+
+        assert set(loaded.posterior_samples) == {"intercept", "tau", "coeffs"}
+        for name, values in loaded.posterior_samples.items():
+            assert isinstance(values, np.memmap)
+            assert values.dtype == np.float32
+            assert np.allclose(values, model.posterior_samples[name])
+
+        X = np.random.default_rng(7).normal(size=(5, 4))
+        assert loaded.predict(X)["predictions"][0]["mean"] == pytest.approx(
+            model.predict(X)["predictions"][0]["mean"], abs=1e-6
+        )
@@ -0,0 +1,140 @@
+"""
+Cohort Engine Tests
+
+Tests the cohort masks, cohort summaries and the cohort cube used by the
+aggregate endpoints.
+"""
+import pandas as pd
+
+from backend.app.services.cohort_engine import CohortIndex
+
+
+def _frame():
+    return pd.DataFrame({
+        'a6_education_level': ['Bachelor', 'Master', 'Bachelor', 'PhD'],
+        'a1_gender': ['Female', 'Male', 'Male', 'Female'],
+        'a2_age': [24, 25, 40, 60],
+        'B10_Tenure_in_month': [0, 12, 70, 200],
+        'B15_Sector': ['IT', 'HR', 'IT', 'Sales'],
+        'B16_Headquarters': ['Remote', 'Curitiba', 'Remote', 'Remote'],
+        'B14_Cargo': ['Analyst', 'Manager', 'Analyst', 'Director'],
+    })
+
+
+class TestCohortIndex:
+    """Tests for CohortIndex filtering."""
+
+    def test_no_filters_selects_everyone(self):
+        index = CohortIndex(_frame())
+        assert index.positions({}).tolist() == [0, 1, 2, 3]
+        assert index.positions({'gender': 'All', 'sector': None}).tolist() == [0, 1, 2, 3]
+
+    def test_single_value_filters_are_intersected(self):
+        index = CohortIndex(_frame())
+        assert index.positions({'education_level': 'Bachelor', 'gender': 'Male'}).tolist() == [2]
+
+    def test_multi_value_filter_is_any_of(self):
+        index = CohortIndex(_frame())
+        assert index.positions({'sector': ['HR', 'Sales']}).tolist() == [1, 3]
+        assert index.positions({'sector': ['IT'], 'cargo': ['Analyst', 'Director']}).tolist() == [0, 2]
+
+    def test_bins_match_five_year_model(self):
+        index = CohortIndex(_frame())
+        # Right-closed bins: 25 is lt_25, 12 months is lt_1yr; 0 stays in the first bin
+        assert index.positions({'age_group': 'lt_25'}).tolist() == [0, 1]
+        assert index.positions({'tenure_group': 'lt_1yr'}).tolist() == [0, 1]
+        assert index.positions({'tenure_group': 'plus_10yr'}).tolist() == [3]
+
+    def test_unknown_label_matches_nothing(self):
+        index = CohortIndex(_frame())
+        assert index.positions({'gender': 'Unknown'}).tolist() == []
+
+
+class TestSummarizeCohort:
+    """Tests for the vectorized five-year cohort input."""
+
+    def test_means_modes_and_onboarding_score(self):
+        from backend.app.services.prediction_service import summarize_cohort
+
+        df = _frame()
+        df['B11_salary_today_brl'] = [1000.0, 2000.0, 3000.0, 4000.0]
+        df['B2_Public_service_status_ger'] = [0, 0, 1, 0]
+        df['M_Onb_3d_Integration'] = [4.0, 4.0, 4.0, 4.0]
+        for col in ['M_Onb_15d_Pride', 'M_Onb_30d_Pride']:
+            df[col] = [2.0, 2.0, 2.0, 2.0]
+
+        summary = summarize_cohort(df, {'gender': 'Female', 'tenure_group': 'lt_1yr'})
+
+        assert summary['TotalEmployees'] == 4
+        assert summary['B11_salary_today_brl'] == 2500.0
+        assert summary['a1_gender'] == 'Female'
+        assert summary['a6_education_level'] == 'Bachelor'
+        assert summary['B2_Public_service_status_ger'] == 0
+        assert summary['AgeGroup'] == '25_to_35'
+        assert summary['TenureGroup'] == 'lt_1yr'
+        # (5 * 4 + 25 * 2 + 70 * 2) / 100
+        assert summary['M_Onboarding_Final_Score'] == 2.1
+        # Columns missing from the cohort default to 0
+        assert summary['M_eNPS'] == 0.0
+
+
+class TestCohortCubeKey:
+    """Tests for mapping aggregate filters onto cube cells."""
+
+    def test_cube_dimensions_map_to_key(self):
+        from backend.app.services.cohort_cube import CohortCube
+
+        key = CohortCube.key({'education_level': 'Bachelor', 'gender': None,
+                              'age_group': 'lt_25', 'tenure_group': None, 'sector': None})
+        assert key == ('Bachelor', None, 'lt_25', None)
+        assert CohortCube.key({'gender': 'All'}) == (None, None, None, None)
+
+    def test_queries_outside_the_cube(self):
+        from backend.app.services.cohort_cube import CohortCube
+
+        assert CohortCube.key({'sector': ['IT']}) is None
+        assert CohortCube.key({'age_group': 'All'}) is None
+
+
+def _cube():
+    import numpy as np
+    from backend.app.services.cohort_cube import CubeTable
+
+    keys = [(None, None, None, None), ('Bachelor', None, None, None)]
+    return CubeTable(keys, np.array([4, 2]), np.array([0.3, 0.4]), np.array([[0.1], [0.2]]),
+                     np.array([0.25, 0.25]), ['Salary'], (1, 10), (2, 20))
+
+
+class TestCohortCubePersistence:
+    """Tests for the stored cube the training job writes."""
+
+    def test_round_trip(self, tmp_path):
+        from backend.app.services.cohort_cube import CohortCube
+
+        cube = CohortCube()
+        original_path = cube.path
+        cube.path = str(tmp_path / "cube.joblib")
+        try:
+            cube._write(_cube())
+
+            loaded = cube._read((1, 10), (2, 20))
+            assert loaded is not None
+            assert len(loaded) == 2
+            assert loaded.cell(('Bachelor', None, None, None)) == (2, 0.4, loaded.contributions[1], 0.25)
+            assert loaded.feature_names == ['Salary']
+        finally:
+            cube.path = original_path
+
+    def test_stale_file_is_ignored(self, tmp_path):
+        from backend.app.services.cohort_cube import CohortCube
+
+        cube = CohortCube()
+        original_path = cube.path
+        cube.path = str(tmp_path / "cube.joblib")
+        try:
+            cube._write(_cube())
+            # A newer model or dataset must not reuse the stored cube
+            assert cube._read((1, 11), (2, 20)) is None
+            assert cube._read((1, 10), (3, 20)) is None
+        finally:
+            cube.path = original_path
@@ -0,0 +1,112 @@
+"""
+Dataset Cache Tests
+
+Tests for the process-wide employee dataset cache.
+"""
+import contextlib
+import os
+import pandas as pd
+
+from backend.app.services.dataset_cache import dataset_cache
+
+
+def _write_csv(path, n_rows):
+    pd.DataFrame({
+        "id": [f"EMP-{i}" for i in range(n_rows)],
+        "a1_gender": ["Male", "Female"] * (n_rows // 2),
+        "B10_Tenure_in_month": list(range(n_rows)),
+    }).to_csv(path, index=False)
+
+
+class TestDatasetCache:
+    """Tests for DatasetCache reuse and invalidation."""
+
+    def test_reuses_parsed_frame(self, tmp_path):
+        path = str(tmp_path / "data.csv")
+        _write_csv(path, 4)
+        dataset_cache.invalidate()
+
+        dataset_cache.get_frame(path)
+        version = dataset_cache.version
+        df = dataset_cache.get_frame(path)
+
+        assert dataset_cache.version == version
+        assert len(df) == 4
+        assert str(df['a1_gender'].dtype) == 'category'
+
+    def test_reloads_when_file_changes(self, tmp_path):
+        path = str(tmp_path / "data.csv")
+        _write_csv(path, 4)
+        dataset_cache.invalidate()
+        dataset_cache.get_frame(path)
+
+        _write_csv(path, 6)
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert len(dataset_cache.get_frame(path)) == 6
+
+    def test_views_do_not_leak_column_changes(self, tmp_path):
+        path = str(tmp_path / "data.csv")
+        _write_csv(path, 4)
+        dataset_cache.invalidate()
+
+        df = dataset_cache.get_frame(path)
+        df['risk'] = 1.0
+        df.drop(columns=['B10_Tenure_in_month'], inplace=True)
+
+        fresh = dataset_cache.get_frame(path)
+        assert 'risk' not in fresh.columns
+        assert 'B10_Tenure_in_month' in fresh.columns
+
+    def test_in_place_writes_do_not_reach_the_cache(self, tmp_path):
+        path = str(tmp_path / "data.csv")
+        _write_csv(path, 4)
+        dataset_cache.invalidate()
+
+        df = dataset_cache.get_frame(path)
+        # Either rejected (read-only buffers) or applied to a private copy
+        with contextlib.suppress(ValueError):
+            df.loc[0, 'B10_Tenure_in_month'] = 99
+        with contextlib.suppress(ValueError):
+            df['B10_Tenure_in_month'].values[:] = -1
+        with contextlib.suppress(ValueError):
+            df.loc[1, 'a1_gender'] = 'Male'
+
+        fresh = dataset_cache.get_frame(path)
+        assert fresh['B10_Tenure_in_month'].tolist() == [0, 1, 2, 3]
+        assert fresh['a1_gender'].tolist() == ["Male", "Female", "Male", "Female"]
+
+    def test_missing_file_returns_none(self, tmp_path):
+        assert dataset_cache.get_frame(str(tmp_path / "missing.csv")) is None
+
+
+class TestEmployeeIndex:
+    """Tests for id-indexed row and feature lookups."""
+
+    def test_get_row_by_id(self, tmp_path):
+        path = str(tmp_path / "data.csv")
+        _write_csv(path, 4)
+        dataset_cache.invalidate()
+
+        row = dataset_cache.get_row(path, "EMP-2")
+        assert row['B10_Tenure_in_month'] == 2
+        assert dataset_cache.get_row(path, "EMP-99") is None
+
+    def test_get_features_is_enriched_and_isolated(self, tmp_path):
+        path = str(tmp_path / "data.csv")
+        pd.DataFrame({
+            "id": ["EMP-0"],
+            "a5_age_youngest_children": [float("nan")],
+            "M_Onb_3d_Integration": [4.0],
+            **{f"M_Onb_15d_{k}": [5.0] for k in ["Credibility", "Respect"]},
+            **{f"M_Onb_30d_{k}": [3.0] for k in ["Credibility", "Respect"]},
+        }).to_csv(path, index=False)
+        dataset_cache.invalidate()
+
+        features = dataset_cache.get_features(path, "EMP-0")
+        assert features['a5_age_youngest_children'] == 0
+        assert features['M_Onboarding_Final_Score'] == (5 * 4 + 25 * 5 + 70 * 3) / 100
+
+        features['M_Onb_3d_Integration'] = -1
+        assert dataset_cache.get_features(path, "EMP-0")['M_Onb_3d_Integration'] == 4.0
@@ -0,0 +1,72 @@
+"""
+Hyperparameter Search Tests
+
+Tests the random and successive-halving search modes of the trainers.
+"""
+import numpy as np
+import pytest
+import xgboost as xgb
+from sklearn.model_selection import KFold
+
+from backend.ml.hyperparameter_search import early_stopped_n_estimators, run_search
+
+
+@pytest.fixture(autouse=True)
+def single_cpu(monkeypatch):
+    monkeypatch.setenv("TRAINING_CPUS", "1")
+
+
+def _data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(240, 4))
+    y = 2.0 * X[:, 0] - X[:, 1] + rng.normal(scale=0.3, size=240)
+    return X, y
+
+
+PARAMS = {
+    'learning_rate': [0.1, 0.3],
+    'max_depth': [2, 3],
+    'n_estimators': [30, 90],
+}
+
+
+class TestRunSearch:
+    """Tests for the search modes."""
+
+    def test_random_search(self):
+        X, y = _data()
+        model, score, params = run_search(
+            xgb.XGBRegressor(n_jobs=1, random_state=42), PARAMS, X, y, KFold(3),
+            scoring='neg_mean_absolute_error', mode="random", n_iter=3
+        )
+        assert params["n_estimators"] in (30, 90)
+        assert model.get_params()["n_estimators"] == params["n_estimators"]
+        assert score < 0
+
+    def test_halving_search_returns_early_stopped_refit(self):
+        X, y = _data()
+        model, score, params = run_search(
+            xgb.XGBRegressor(n_jobs=1, random_state=42), PARAMS, X, y, KFold(3),
+            scoring='neg_mean_absolute_error', mode="halving"
+        )
+        assert 1 <= params["n_estimators"] <= 90
+        assert model.get_params()["n_estimators"] == params["n_estimators"]
+        # Refitted on every training row, without early stopping
+        assert model.get_params()["early_stopping_rounds"] is None
+        assert model.predict(X[:5]).shape == (5,)
+
+    def test_unknown_mode(self):
+        X, y = _data()
+        with pytest.raises(ValueError):
+            run_search(xgb.XGBRegressor(), PARAMS, X, y, KFold(3), scoring='r2', mode="grid")
+
+
+class TestEarlyStopping:
+    """Tests for choosing the tree count on a validation split."""
+
+    def test_stops_before_budget_when_validation_loss_plateaus(self):
+        X, y = _data()
+        n_estimators = early_stopped_n_estimators(
+            xgb.XGBRegressor(learning_rate=0.5, max_depth=3, random_state=42), X, y, max_estimators=400
+        )
+        assert 1 <= n_estimators < 400
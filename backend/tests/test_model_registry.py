@@ -0,0 +1,73 @@
+"""
+Model Registry Tests
+
+Tests that artifacts stay resident and are swapped when republished.
+"""
+import os
+
+from backend.ml.model_registry import ModelRegistry, atomic_dump
+
+
+class TestModelRegistry:
+    """Tests for ModelRegistry loading and swapping."""
+
+    def test_missing_artifact_returns_none(self, tmp_path):
+        registry = ModelRegistry()
+        registry.register("model", str(tmp_path / "missing.pkl"))
+        assert registry.get("model") is None
+
+    def test_artifact_loaded_once(self, tmp_path):
+        path = str(tmp_path / "model.pkl")
+        atomic_dump({"metrics": {"auc": 0.8}}, path)
+
+        calls = []
+
+        def loader(p):
+            calls.append(p)
+            import joblib
+            return joblib.load(p)
+
+        registry = ModelRegistry()
+        registry.register("model", path, loader)
+
+        first = registry.get("model")
+        second = registry.get("model")
+        assert first is second
+        assert len(calls) == 1
+
+    def test_republished_artifact_is_swapped(self, tmp_path):
+        path = str(tmp_path / "model.pkl")
+        atomic_dump({"version": 1}, path)
+
+        registry = ModelRegistry()
+        registry.register("model", path)
+        old = registry.get("model")
+
+        atomic_dump({"version": 2}, path)
+        new = registry.reload("model")
+
+        assert old == {"version": 1}
+        assert new == {"version": 2}
+        assert registry.get("model") is new
+        assert registry.version("model") == 2
+        assert not os.path.exists(f"{path}.tmp")
+
+    def test_staged_artifact_published_on_demand(self, tmp_path, monkeypatch):
+        from backend.ml import model_registry as registry_module
+
+        path = str(tmp_path / "model.pkl")
+        atomic_dump({"version": 1}, path)
+        registry = ModelRegistry()
+        registry.register("model", path)
+        registry.get("model")
+
+        monkeypatch.setattr(registry_module, "_staging", True)
+        monkeypatch.setattr(registry_module, "_staged_paths", [])
+        atomic_dump({"version": 2}, path)
+        assert registry.reload("model") is None
+        monkeypatch.setattr(registry_module, "_staging", False)
+
+        assert registry.get("model") == {"version": 1}
+        assert registry_module.staged_paths() == [path]
+        assert registry.publish_staged([path]) == ["model"]
+        assert registry.get("model") == {"version": 2}
@@ -0,0 +1,100 @@
+"""
+Population Scores Tests
+
+Tests the precomputed score table: id lookups, the parquet round trip and
+the dashboard metrics read from it.
+"""
+import pandas as pd
+import pytest
+
+from backend.app.services.population_scores import PopulationScores, ScoreTable
+
+
+def _table(model_signature=(1, 10), data_signature=(2, 20)):
+    frame = pd.DataFrame({
+        'id': ['EMP-0', 'EMP-1', 'EMP-0'],
+        'turnover_probability': [0.9, 0.2, 0.4],
+        'predicted_class': [1, 0, 0],
+        'base_value': [-0.05, -0.05, -0.05],
+        'Satisfaction Score': [0.8, -0.3, 0.1],
+        'Tenure (Months)': [0.2, 0.1, -0.4],
+    })
+    return ScoreTable(frame, ['Satisfaction Score', 'Tenure (Months)'], model_signature, data_signature)
+
+
+class TestScoreTable:
+    """Tests for ScoreTable lookups."""
+
+    def test_positions_in_request_order(self):
+        table = _table()
+        positions, missing = table.positions(['EMP-1', 'nope', 'EMP-0'])
+        assert positions.tolist() == [1, 0]
+        assert missing == ['nope']
+
+    def test_all_positions(self):
+        table = _table()
+        positions, missing = table.positions()
+        assert positions.tolist() == [0, 1, 2]
+        assert missing == []
+
+    def test_contribution_matrix(self):
+        table = _table()
+        assert table.contributions.shape == (3, 2)
+        assert table.contributions[1, 0] == -0.3
+
+    def test_global_drivers_cover_full_population(self):
+        table = _table()
+        assert table.mean_abs_contributions.tolist() == pytest.approx([0.4, 0.7 / 3])
+
+
+class TestPersistence:
+    """Tests for the parquet store."""
+
+    def test_round_trip(self, tmp_path):
+        scores = PopulationScores()
+        original_path = scores.path
+        scores.path = str(tmp_path / "scores.parquet")
+        try:
+            table = _table()
+            scores._write(table)
+
+            loaded = scores._read((1, 10), (2, 20))
+            assert loaded is not None
+            assert loaded.feature_names == table.feature_names
+            assert loaded.ids.tolist() == table.ids.tolist()
+            assert loaded.probabilities.tolist() == table.probabilities.tolist()
+        finally:
+            scores.path = original_path
+
+    def test_stale_file_is_ignored(self, tmp_path):
+        scores = PopulationScores()
+        original_path = scores.path
+        scores.path = str(tmp_path / "scores.parquet")
+        try:
+            scores._write(_table())
+            # A newer model or dataset must not reuse the stored scores
+            assert scores._read((1, 11), (2, 20)) is None
+            assert scores._read((1, 10), (3, 20)) is None
+        finally:
+            scores.path = original_path
+
+
+class TestDashboardMetrics:
+    """Tests for the dashboard metrics read from the score table."""
+
+    def test_top_names_joined_on_employee_id(self, monkeypatch):
+        from backend.app.services import prediction_service
+
+        frame = _table().frame.assign(id=['EMP-0', 'EMP-1', 'EMP-2'])
+        table = ScoreTable(frame, ['Satisfaction Score', 'Tenure (Months)'], (1, 10), (2, 20))
+        monkeypatch.setattr(prediction_service.one_year_model, "load_one_year_model",
+                            lambda: {"model": object(), "feature_names": []})
+        monkeypatch.setattr(prediction_service, "get_population_scores", lambda: table)
+        # Same length as the table, different row order
+        df = pd.DataFrame({'id': ['EMP-2', 'EMP-0', 'EMP-1'], 'name': ['Cy', 'Ana', 'Bo']})
+
+        metrics = prediction_service.get_dashboard_metrics(df)
+
+        assert [(p["id"], p["name"]) for p in metrics["predictions"]] == [
+            ('EMP-0', 'Ana'), ('EMP-2', 'Cy'), ('EMP-1', 'Bo')
+        ]
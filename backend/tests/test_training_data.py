@@ -0,0 +1,91 @@
+"""
+Training Data Tests
+
+Tests the persistent preprocessed-input cache shared by the trainers.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.ml import preprocessing, training_data
+
+DATA_PATH = "synthetic_turnover_data.csv"
+
+
+@pytest.fixture
+def data_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(training_data, "CACHE_DIR", str(tmp_path / "cache"))
+    path = tmp_path / "data.csv"
+    path.write_bytes(open(DATA_PATH, "rb").read())
+    return str(path)
+
+
+class TestOneYearSplit:
+    """Tests for the cached one-year split."""
+
+    def test_cached_split_matches_preprocessing(self, data_path):
+        expected = preprocessing.load_and_preprocess_one_year(pd.read_csv(data_path))
+
+        first = training_data.one_year_split(data_path)
+        cached = training_data.one_year_split(data_path)
+
+        assert len(os.listdir(training_data.CACHE_DIR)) == 1
+        for got in (first, cached):
+            for i in range(4):
+                assert np.array_equal(got[i], np.asarray(expected[i]))
+            assert got[4] == expected[4]
+        X = preprocessing.feature_engineering(pd.read_csv(data_path).head(3))
+        assert np.allclose(cached[5].transform(X), expected[5].transform(X))
+
+    def test_reads_cache_without_preprocessing(self, data_path, monkeypatch):
+        training_data.one_year_split(data_path)
+
+        def fail(df):
+            raise AssertionError("preprocessed again")
+
+        monkeypatch.setattr(preprocessing, "load_and_preprocess_one_year", fail)
+        assert training_data.one_year_split(data_path)[0].ndim == 2
+
+    def test_new_data_gets_new_entry(self, data_path):
+        first = training_data.cache_key(data_path)
+        with open(data_path, "a") as f:
+            f.write("\n")
+        assert training_data.cache_key(data_path) != first
+
+
+class TestFiveYearFrame:
+    """Tests for the cached cohort aggregate."""
+
+    def test_round_trip_matches_aggregate(self, data_path):
+        expected = preprocessing.aggregate_data_for_5year(pd.read_csv(data_path))
+
+        training_data.five_year_frame(data_path)
+        cached = training_data.five_year_frame(data_path)
+
+        pd.testing.assert_frame_equal(cached.reset_index(drop=True), expected.reset_index(drop=True),
+                                      check_categorical=False)
+
+
+class TestPublish:
+    """Tests for atomic publishing and pruning of cache entries."""
+
+    def test_losing_a_publish_race_keeps_the_first_entry(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(training_data, "CACHE_DIR", str(tmp_path))
+        entry = str(tmp_path / "stage-a")
+
+        training_data._publish(entry, lambda tmp: open(os.path.join(tmp, "v"), "w").write("first"))
+        training_data._publish(entry, lambda tmp: open(os.path.join(tmp, "v"), "w").write("second"))
+
+        assert open(os.path.join(entry, "v")).read() == "first"
+        assert os.listdir(tmp_path) == ["stage-a"]
+
+    def test_old_entries_are_pruned(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(training_data, "CACHE_DIR", str(tmp_path))
+        for i in range(training_data.MAX_ENTRIES + 2):
+            entry = str(tmp_path / f"stage-{i}")
+            training_data._publish(entry, lambda tmp: None)
+            os.utime(entry, (i, i))
+
+        assert len(os.listdir(tmp_path)) == training_data.MAX_ENTRIES
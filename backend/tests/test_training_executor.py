@@ -0,0 +1,45 @@
+"""
+Training Executor Tests
+
+Tests the CPU budgeting of the hyperparameter searches.
+"""
+import xgboost as xgb
+
+from backend.ml.training_executor import cpu_budget, parse_cpu_set, search_plan, serving_threads
+
+
+class TestSearchPlan:
+    """Tests for splitting the CPU budget between workers and threads."""
+
+    def test_one_worker_per_fit_up_to_budget(self):
+        assert search_plan(100, cpus=8) == (8, 1)
+        assert search_plan(100, cpus=1) == (1, 1)
+
+    def test_leftover_cores_become_threads(self):
+        assert search_plan(4, cpus=16) == (4, 4)
+        assert search_plan(3, cpus=8) == (3, 2)
+
+    def test_never_oversubscribes(self):
+        for cpus in range(1, 33):
+            for n_fits in (1, 5, 100):
+                workers, threads = search_plan(n_fits, cpus=cpus)
+                assert workers * threads <= cpus
+
+    def test_budget_from_environment(self, monkeypatch):
+        monkeypatch.setenv("TRAINING_CPUS", "3")
+        assert cpu_budget() == 3
+        assert search_plan(100) == (3, 1)
+
+    def test_cpu_set_ranges(self):
+        assert parse_cpu_set("0-3,6") == {0, 1, 2, 3, 6}
+        assert parse_cpu_set(" 2 ") == {2}
+        assert parse_cpu_set("") == set()
+
+
+class TestServingThreads:
+    """Tests for resetting fitted models to single-threaded prediction."""
+
+    def test_resets_n_jobs(self):
+        model = xgb.XGBClassifier(n_estimators=2, n_jobs=4)
+        model.fit([[0.0], [1.0], [0.0], [1.0]], [0, 1, 0, 1])
+        assert serving_threads(model).get_params()["n_jobs"] == 1
@@ -0,0 +1,96 @@
+"""
+Training Pipeline Tests
+
+Tests concurrent stage execution, progress relay and the all-or-nothing
+artifact publishing of the training pipeline.
+"""
+import os
+
+import joblib
+import pytest
+
+from backend.ml import training_pipeline
+from backend.ml.model_registry import STAGED_SUFFIX, atomic_dump
+
+
+def _write_stage(data_path, progress_callback, path, value):
+    progress_callback(50, "half way")
+    atomic_dump({"value": value}, path)
+
+
+def _failing_stage(data_path, progress_callback, path):
+    atomic_dump({"value": "partial"}, path)
+    raise ValueError("bad fit")
+
+
+def _crashing_stage(data_path, progress_callback):
+    os._exit(3)
+
+
+@pytest.fixture
+def stages(tmp_path, monkeypatch):
+    monkeypatch.setattr(training_pipeline, "ARTIFACT_DIR", str(tmp_path))
+    monkeypatch.setattr(training_pipeline, "STAGES", {
+        "write": (__name__, "_write_stage"),
+        "fail": (__name__, "_failing_stage"),
+        "crash": (__name__, "_crashing_stage"),
+    })
+    monkeypatch.setattr(training_pipeline, "POLL_INTERVAL", 0.1)
+    return tmp_path
+
+
+class TestRunPipeline:
+    """Tests for running stages in worker processes."""
+
+    def test_artifacts_published_after_all_stages(self, stages):
+        first = str(stages / "first.pkl")
+        events = []
+
+        published = training_pipeline.run_pipeline(
+            {"write": {"path": first, "value": 1}},
+            progress_callback=lambda *event: events.append(event)
+        )
+
+        assert published == [first]
+        assert joblib.load(first) == {"value": 1}
+        assert ("write", 50, "half way") in events
+        assert events[-1] == ("write", 100, "Complete")
+        assert not os.path.exists(first + STAGED_SUFFIX)
+
+    def test_failed_stage_publishes_nothing(self, stages):
+        live = str(stages / "live.pkl")
+        atomic_dump({"value": "old"}, live)
+
+        with pytest.raises(RuntimeError, match="fail: bad fit"):
+            training_pipeline.run_pipeline({
+                "write": {"path": live, "value": "new"},
+                "fail": {"path": str(stages / "other.pkl")},
+            })
+
+        assert joblib.load(live) == {"value": "old"}
+        assert not [name for name in os.listdir(stages) if name.endswith(STAGED_SUFFIX)]
+
+    def test_caller_staged_files_published_together(self, stages, tmp_path_factory):
+        model = str(stages / "model.pkl")
+        data = str(tmp_path_factory.mktemp("data") / "data.csv")
+        with open(data + STAGED_SUFFIX, "w") as f:
+            f.write("id\n1\n")
+
+        published = training_pipeline.run_pipeline(
+            {"write": {"path": model, "value": 1}},
+            data_path=data + STAGED_SUFFIX,
+            publish_with=[data]
+        )
+
+        assert sorted(published) == sorted([model, data])
+        with open(data) as f:
+            assert f.read() == "id\n1\n"
+        assert not os.path.exists(data + STAGED_SUFFIX)
+
+    def test_crashed_worker_is_reported(self, stages):
+        with pytest.raises(RuntimeError, match="crash: worker exited with code 3"):
+            training_pipeline.run_pipeline({"crash": {}})
+
+    def test_unknown_stage(self):
+        with pytest.raises(ValueError):
+            training_pipeline.run_pipeline({"ten_year": {}})
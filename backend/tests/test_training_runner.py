@@ -0,0 +1,118 @@
+"""
+Training Runner Tests
+
+Tests running training jobs in a separate process: progress relay,
+completion, failures and cancellation.
+"""
+import os
+import time
+
+import pytest
+
+from backend.app.services import training_runner
+from backend.app.services.training_runner import TrainingRunner
+
+
+def _reporting_job(manager, steps):
+    for i in range(steps):
+        manager.update_stage("one_year", i, f"step {i}")
+        manager.update_progress(i, f"step {i}")
+
+
+def _failing_job(manager):
+    raise ValueError("no data")
+
+
+def _slow_job(manager):
+    manager.update_progress(1, "sleeping")
+    time.sleep(60)
+
+
+def _process_id_job(manager):
+    manager.update_progress(os.getpid(), "pid")
+
+
+class _Manager:
+    def __init__(self):
+        self.calls = []
+        self.status = "running"
+
+    def update_progress(self, progress, message):
+        self.calls.append(("progress", progress, message))
+
+    def update_stage(self, stage, progress, message):
+        self.calls.append(("stage", stage, progress, message))
+
+    def complete_training(self):
+        self.status = "success"
+
+    def fail_training(self, error):
+        self.status = f"error: {error}"
+
+
+def _wait(manager, timeout=60):
+    deadline = time.monotonic() + timeout
+    while manager.status == "running" and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return manager.status
+
+
+@pytest.fixture(autouse=True)
+def fast_polling(monkeypatch):
+    monkeypatch.setattr(training_runner, "POLL_INTERVAL", 0.1)
+    monkeypatch.setenv("TRAINING_NICE", "0")
+
+
+class TestTrainingRunner:
+    """Tests for process-isolated training jobs."""
+
+    def test_progress_relayed_then_completed(self):
+        manager = _Manager()
+        refreshed = []
+
+        TrainingRunner(manager).start(_reporting_job, {"steps": 3}, on_success=lambda: refreshed.append(True))
+
+        assert _wait(manager) == "success"
+        assert refreshed == [True]
+        assert ("stage", "one_year", 2, "step 2") in manager.calls
+        assert [c[1] for c in manager.calls if c[0] == "progress"] == [0, 1, 2]
+
+    def test_job_runs_in_another_process(self):
+        manager = _Manager()
+        TrainingRunner(manager).start(_process_id_job)
+
+        assert _wait(manager) == "success"
+        assert manager.calls[0][1] != os.getpid()
+
+    def test_failure_is_reported(self):
+        manager = _Manager()
+        TrainingRunner(manager).start(_failing_job, on_success=lambda: pytest.fail("refreshed"))
+
+        assert _wait(manager) == "error: no data"
+
+    def test_cancel_stops_the_job(self):
+        manager = _Manager()
+        runner = TrainingRunner(manager)
+        runner.start(_slow_job)
+        with pytest.raises(RuntimeError):
+            runner.start(_slow_job)
+
+        while not manager.calls:
+            time.sleep(0.05)
+        assert runner.cancel()
+
+        assert _wait(manager, timeout=10) == "error: Cancelled"
+        assert not runner.running
+        assert not runner.cancel()
+
+
+class TestModelStages:
+    """Tests for the stages of a /train request."""
+
+    def test_bayesian_stage_is_optional(self):
+        from backend.app.services.training_jobs import model_stages
+
+        assert set(model_stages()) == {"one_year", "five_year"}
+        stages = model_stages("halving", "svi")
+        assert stages["bayesian"] == {"method": "svi"}
+        assert stages["one_year"]["search"] == "halving"
@@ -0,0 +1,48 @@
+"""
+Tree Explainer Tests
+
+Tests that native TreeSHAP contributions add up to the model margin.
+"""
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+from backend.ml.tree_explainer import TreeContributionExplainer, attach_explainer
+
+
+def _fit_classifier():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(200, 3)), columns=["a7_age", "B10_Salary", "custom_feat"])
+    y = (X["a7_age"] + 0.5 * X["B10_Salary"] > 0).astype(int)
+    model = xgb.XGBClassifier(n_estimators=20, max_depth=2, n_jobs=1, random_state=0)
+    model.fit(X, y)
+    return model, X
+
+
+class TestTreeContributionExplainer:
+    """Tests for TreeContributionExplainer."""
+
+    def test_contributions_sum_to_margin(self):
+        model, X = _fit_classifier()
+        explainer = TreeContributionExplainer(model, list(X.columns))
+
+        contribs, base_values = explainer.contributions(X.to_numpy())
+        margin = model.predict(X, output_margin=True)
+
+        assert contribs.shape == X.shape
+        np.testing.assert_allclose(contribs.sum(axis=1) + base_values, margin, atol=1e-5)
+
+    def test_unwraps_base_estimator(self):
+        model, X = _fit_classifier()
+
+        class Wrapper:
+            base_estimator = model
+
+        explainer = TreeContributionExplainer(Wrapper(), list(X.columns))
+        contribs, _ = explainer.contributions(X.head(5).to_numpy())
+        assert contribs.shape == (5, 3)
+
+    def test_display_names_fall_back_to_technical(self):
+        model, X = _fit_classifier()
+        artifact = attach_explainer({"model": model, "feature_names": list(X.columns)})
+        assert artifact["explainer"].display_names[-1] == "custom_feat"